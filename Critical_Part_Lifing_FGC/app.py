@@ -4,7 +4,15 @@ from tkinter import filedialog
 from inputs import DimensionsInputTab, SpectrumInputTab, WalkerEquationInputTab
 from results import ResultTab
 import json
-from calculations import calculate_crack_growth  # Ensure this import is present
+import numpy as np
+import queue
+import sqlite3
+import threading
+from calculations import (CalculationCancelled, calculate_crack_growth, closed_form_applies, closed_form_curve,
+                          convert_params)
+from results_store import ResultsStore
+
+POLL_INTERVAL_MS = 100  # How often the main loop checks on a running calculation
 
 class CrackGrowthApp(ctk.CTk):
     def __init__(self):
@@ -24,6 +32,13 @@ class CrackGrowthApp(ctk.CTk):
         self.tabs["Walker Equation Data"] = WalkerEquationInputTab(self.tab_view.add("Walker Equation Data"), self, self.calculate)
         self.tabs["Results"] = ResultTab(self.tab_view.add("Results"), self)
 
+        # State of the calculation running on the worker thread
+        self.worker = None
+        self.cancel_event = threading.Event()
+        self.messages = queue.Queue()
+        self.partial_results = ([], [], [], [])
+        self.running_params = None
+
     def create_menu(self):
         menu_bar = tk.Menu(self)
         file_menu = tk.Menu(menu_bar, tearoff=0)
@@ -50,16 +65,116 @@ class CrackGrowthApp(ctk.CTk):
                 params.update(tab.get_params())
 
         # Convert only numerical parameters to float
-        for key in params:
-            if key != "material_name":  # assuming material_name should remain a string
-                try:
-                    params[key] = float(params[key])
-                except ValueError:
-                    pass
+        params = convert_params(params)
+
+        if self.worker is not None and self.worker.is_alive():
+            return  # Only one calculation at a time
 
-        cycle_counts, crack_lengths_A, crack_lengths_C, crack_areas = calculate_crack_growth(params)
-        self.tabs["Results"].display_results(cycle_counts, crack_lengths_A, crack_lengths_C, crack_areas)
+        # The calculation runs on a worker thread so the window stays responsive; Tk may only
+        # be used from the main thread, so the results come back through a queue polled with after()
+        self.cancel_event = threading.Event()
+        self.messages = queue.Queue()
+        self.partial_results = ([], [], [], [])
+        self.running_params = params
+        self.worker = threading.Thread(target=self.run_calculation, args=(params, self.cancel_event, self.messages), daemon=True)
+        self.tabs["Walker Equation Data"].calculate_button.configure(state="disabled")
+        self.tabs["Results"].start_run()
         self.show_tab("Results")
+        self.worker.start()
+        self.after(POLL_INTERVAL_MS, self.poll_calculation)
+
+    # Runs on the worker thread
+    def run_calculation(self, params, cancel_event, messages):
+        reported = 0
+
+        # Passes on the history points added since the last report, or stops the run if cancelled.
+        # Spectrum runs also call it before any growth while the spectrum is read, to check for cancelling
+        def progress(cycle_counts, crack_lengths_A, crack_lengths_C, crack_areas):
+            nonlocal reported
+            if cancel_event.is_set():
+                raise CalculationCancelled()
+            if len(cycle_counts) > reported:
+                messages.put(("progress", tuple(np.array(history[reported:], dtype=float) for history in
+                                                (cycle_counts, crack_lengths_A, crack_lengths_C, crack_areas))))
+                reported = len(cycle_counts)
+
+        # Finished runs are kept on disk, so a repeated run is read from the store instead of recomputed.
+        # The lookup hashes the spectrum file, so it runs here rather than on the main thread, and
+        # SQLite connections stay on the thread that opened them
+        store = None
+        try:
+            store = ResultsStore()
+            stored = store.get(params)
+        except (OSError, sqlite3.Error):  # e.g. a missing spectrum file; the calculation reports it
+            stored = None
+
+        try:
+            if stored is not None:
+                messages.put(("done", stored))
+                return
+            history = calculate_crack_growth(params, progress=progress)
+            if store is not None:
+                try:
+                    store.put(params, history)
+                except (OSError, sqlite3.Error):
+                    pass  # The result is still shown; it is only not kept
+            messages.put(("done", history))
+        except CalculationCancelled:
+            messages.put(("cancelled", None))
+        except Exception as error:  # Reported on the Results tab instead of lost with the thread
+            messages.put(("error", error))
+        finally:
+            if store is not None:
+                store.close()
+
+    def poll_calculation(self):
+        updated = False
+        finished = None
+        while finished is None:
+            try:
+                kind, payload = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                for chunks, points in zip(self.partial_results, payload):
+                    chunks.append(points)
+                updated = True
+            else:
+                finished = kind, payload
+
+        results_tab = self.tabs["Results"]
+        if finished is None:
+            if updated:
+                results_tab.display_results(*self.partial_histories(), running=True)
+            self.after(POLL_INTERVAL_MS, self.poll_calculation)
+            return
+
+        self.tabs["Walker Equation Data"].calculate_button.configure(state="normal")
+        kind, payload = finished
+        if kind == "done":
+            results_tab.display_results(*payload, curve=self.analytic_curve(self.running_params))
+            results_tab.finish_run()
+        elif kind == "cancelled":
+            cycle_counts = self.partial_histories()[0]
+            if cycle_counts.size:
+                results_tab.display_results(*self.partial_histories(), running=True)
+            results_tab.finish_run(f"Calculation cancelled after {cycle_counts[-1]:.0f} cycles."
+                                   if cycle_counts.size else "Calculation cancelled.")
+        else:
+            results_tab.finish_run(f"Calculation failed: {payload}")
+
+    # Analytic history of runs the engine solves in closed form, so zooming in on them shows the exact curve; else None
+    def analytic_curve(self, params):
+        if params.get("spectrum_file") or not closed_form_applies(params):
+            return None
+        return closed_form_curve(params)
+
+    # Histories reported so far by the running calculation, kept as chunks of arrays so a poll never copies lists
+    def partial_histories(self):
+        return [np.concatenate(chunks) if chunks else np.empty(0) for chunks in self.partial_results]
+
+    def cancel_calculation(self):
+        self.cancel_event.set()
 
     def import_data(self):
         file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
@@ -0,0 +1,168 @@
+"""Headless batch runner for crack growth analyses.
+
+Runs ``calculate_crack_growth`` for every input file in the format written by
+``CrackGrowthApp.export_data`` and writes one summary row per run::
+
+    python -m Critical_Part_Lifing_FGC.batch inputs/ -o results.csv
+    python batch.py runs.jsonl -o results.npz
+    cat runs.jsonl | python batch.py - -o results.parquet
+
+Inputs may be JSON files, directories of JSON files or JSONL streams (``-`` for stdin).
+The histories kept for NPZ output can be thinned with ``--every N``, ``--growth DA`` or
+``--endpoints``. With ``--store`` runs already in the results store (results_store.py) are
+read from it and new runs are added to it, with their histories for NPZ output and as
+summaries otherwise. Only NumPy and the calculation modules are imported; pandas is needed
+for Parquet output, and sympy while the kernel cache is empty (see kernels.py).
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+if __package__:
+    # Run as ``python -m Critical_Part_Lifing_FGC.batch``; the project modules import each other by name
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from calculations import STOP_REASON_NAMES, calculate_crack_growth, convert_params
+from history import HISTORY_DTYPE
+from results_store import STORE_PATH, ResultsStore
+
+SUMMARY_FIELDS = ["source", "cycles", "crack_length_A", "crack_length_C", "crack_area", "stop_reason", "error"]
+
+
+# Function to yield (source, JSON text) for every run found in the given inputs; the text is parsed by run_one,
+# so a malformed input fails its own run only
+def iter_inputs(inputs):
+    for path in inputs:
+        if path == "-":
+            yield from _iter_jsonl(sys.stdin, "stdin")
+        elif os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith((".json", ".jsonl")):
+                    yield from iter_inputs([os.path.join(path, name)])
+        elif path.endswith(".jsonl"):
+            with open(path, 'r') as file:
+                yield from _iter_jsonl(file, path)
+        else:
+            with open(path, 'r') as file:
+                yield path, file.read()
+
+
+def _iter_jsonl(file, name):
+    for line_number, line in enumerate(file, start=1):
+        if line.strip():
+            yield f"{name}:{line_number}", line
+
+
+# Function to run one analysis and summarise it; failures are reported instead of stopping the batch
+# With a store, keep_history says whether the run's history is needed or its final state is enough
+def run_one(source, params, method="auto", output=None, store=None, keep_history=True):
+    summary = {"source": source, "error": ""}
+    text, params = (params, {}) if isinstance(params, str) else (None, params)
+    try:
+        if text is not None:
+            params = json.loads(text)
+        if store is not None:
+            history, _ = store.run(params, method=method, output=output, keep_history=keep_history)
+        else:
+            history = calculate_crack_growth(convert_params(params), method=method, output=output)
+    except Exception as error:
+        summary["error"] = f"{type(error).__name__}: {error}"
+        return summary, params, None
+    final = history.records[-1]
+    summary.update(cycles=final["cycles"].item(), crack_length_A=final["crack_length_A"].item(),
+                   crack_length_C=final["crack_length_C"].item(), crack_area=final["crack_area"].item(),
+                   stop_reason=STOP_REASON_NAMES.get(history.stop_reason, ""))
+    return summary, params, history
+
+
+def _rows(results):
+    # Summary columns first, then every input parameter seen in the batch
+    param_keys = []
+    for _, params, _ in results:
+        if not isinstance(params, dict):
+            continue  # Input that parsed to something other than a JSON object
+        param_keys.extend(key for key in params if key not in param_keys and key not in SUMMARY_FIELDS)
+    columns = SUMMARY_FIELDS + param_keys
+    rows = [{**{key: params.get(key, "") for key in param_keys if isinstance(params, dict)}, **summary}
+            for summary, params, _ in results]
+    return columns, rows
+
+
+def write_csv(results, path):
+    columns, rows = _rows(results)
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=columns, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_parquet(results, path):
+    import pandas as pd  # Only needed for Parquet output
+    columns, rows = _rows(results)
+    pd.DataFrame(rows, columns=columns).to_parquet(path, index=False)
+
+
+def write_npz(results, path):
+    # Summary columns plus all histories concatenated, with run i at history_offsets[i]:history_offsets[i + 1]
+    columns, rows = _rows(results)
+    arrays = {}
+    for column in columns:
+        values = [row.get(column, "") for row in rows]
+        try:
+            arrays[column] = np.array([np.nan if value == "" else value for value in values], dtype=float)
+        except (TypeError, ValueError):
+            arrays[column] = np.array([str(value) for value in values])
+
+    histories = [history.records if history is not None else np.empty(0, dtype=HISTORY_DTYPE) for _, _, history in results]
+    lengths = [history.size for history in histories]
+    arrays["history_offsets"] = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+    records = np.concatenate(histories)
+    for name in HISTORY_DTYPE.names:
+        arrays[f"history_{name}"] = records[name]
+    np.savez_compressed(path, **arrays)
+
+
+WRITERS = {".csv": write_csv, ".parquet": write_parquet, ".npz": write_npz}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run crack growth analyses without the GUI")
+    parser.add_argument("inputs", nargs="+", help="JSON files, directories of JSON files, JSONL files, or - for JSONL on stdin")
+    parser.add_argument("-o", "--output", required=True, help="Results file (.csv, .parquet or .npz)")
+    parser.add_argument("--method", default="auto", choices=["auto", "fixed", "adaptive", "closed_form"],
+                        help="Integration method for constant amplitude loading")
+    policy = parser.add_mutually_exclusive_group()
+    policy.add_argument("--every", type=int, help="Keep every Nth history point")
+    policy.add_argument("--growth", type=float, help="Keep a history point per this much crack growth (inches)")
+    policy.add_argument("--endpoints", action="store_true", help="Keep only the first and last history points")
+    parser.add_argument("--store", nargs="?", const=STORE_PATH, default=None, metavar="PATH",
+                        help="Serve repeat runs from and add new runs to a results store (default location if no PATH)")
+    args = parser.parse_args(argv)
+
+    extension = os.path.splitext(args.output)[1].lower()
+    if extension not in WRITERS:
+        parser.error(f"Unsupported output format '{extension}', use one of {', '.join(WRITERS)}")
+
+    if extension == ".npz":
+        output = {"every": args.every} if args.every else {"growth": args.growth} if args.growth else {"endpoints": args.endpoints}
+    else:
+        output = {"endpoints": True}  # CSV and Parquet only hold the final state
+    store = ResultsStore(args.store) if args.store else None
+    # Only NPZ output holds the histories; the other formats are served by stored summaries
+    results = [run_one(source, params, method=args.method, output=output, store=store, keep_history=extension == ".npz")
+               for source, params in iter_inputs(args.inputs)]
+    if store is not None:
+        store.close()
+    WRITERS[extension](results, args.output)
+
+    failed = sum(1 for summary, _, _ in results if summary["error"])
+    print(f"{len(results)} runs written to {args.output} ({failed} failed)", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""Benchmarks of the crack growth engines.
+
+    python benchmark.py                        # batch engine throughput, checked against the scalar path
+    python benchmark.py --integrators          # adaptive vs fixed-block integration on long lives
+    python benchmark.py --regression           # performance vs the local baseline
+    python benchmark.py --regression --save-baseline
+    python benchmark.py --update-golden        # after an intended change of results
+
+The regression run exits with status 1 if a performance metric is worse than the saved
+baseline by more than --threshold. The baseline is specific to the machine, so it is saved
+locally and not shipped. The results themselves are checked by tests/test_regression.py
+against the golden cases written by --update-golden and the analytic a(N).
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from calculations import (STOP_REASON_NAMES, TERMINATION_PARAMS, calculate_crack_growth, calculate_crack_growth_adaptive,
+                          calculate_crack_growth_batch, failure_crack_length)
+from closed_form import C2
+from kernels import cycles_to_crack_length
+
+TEST_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_data.json")
+GOLDEN_CASES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden_cases.json")
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+REGRESSION_THRESHOLD = 0.25  # Relative slowdown (or memory growth) over the baseline that fails the run
+
+# Reference runs: name, overrides of the test data, method, cycle limit and a generated spectrum (seed, cycles)
+GOLDEN_DEFINITIONS = [
+    ("closed_form", {}, "closed_form", 1e7, None),
+    ("fixed", {}, "fixed", 1e7, None),
+    ("adaptive", {}, "adaptive", None, None),
+    ("crack_area_limit", {"plane_stress_fracture_toughness": 0.0, "plane_strain_fracture_toughness": 0.0}, "fixed", 1e6, None),
+    ("threshold", {"SMF": 20.0}, "fixed", None, None),
+    ("max_cycles", {"SMF": 60.0}, "fixed", 20000, None),
+    ("residual_strength", {"Pxx": 60.0}, "adaptive", None, None),
+    ("walker_segments", {"walker_segments": [[1e-10, 3.5, 0.5, 6.0], [5.28e-11, 3.87, 0.5, 1e9]]}, "fixed", 1e7, None),
+    ("nasgro", {"rate_law": "nasgro", "nasgro_p": 0.25, "nasgro_q": 0.5}, "adaptive", None, None),
+    ("closure", {"constraint_factor": 2.0, "flow_stress": 100.0}, "fixed", 1e7, None),
+    ("corner_crack", {"geometry": "corner_crack_at_hole", "thickness": 0.25, "SMF": 20.0}, "fixed", 1e7, None),
+    ("through_crack", {"geometry": "through_crack_at_hole", "thickness": 0.25, "SMF": 20.0}, "fixed", 1e7, None),
+    ("spectrum", {"SMF": 40.0}, "auto", 1e8, (0, 20000)),
+    ("spectrum_willenborg", {"SMF": 40.0, "retardation": "generalized_willenborg"}, "auto", 1e8, (0, 20000)),
+]
+
+# Long-life cases (SMF, initial crack length) with lives of roughly 1e6, 1e7 and 1e8 cycles
+LONG_LIFE_CASES = [(41.1, 0.001), (22.7, 0.001), (8.6, 0.005)]
+
+
+# Function to load the reference inputs shipped with the project
+def load_test_params(path=TEST_DATA):
+    with open(path, 'r') as file:
+        params = json.load(file)
+    return {key: value for key, value in params.items() if key != "material_name"}
+
+
+# Exact closed-form life of one scenario to the critical crack size, for equal initial A and C
+def closed_form_cycles(params):
+    a_i = float(params["initial_crack_length_A"])
+    beta = 1 + 0.5 * float(params["hole_diameter"]) / float(params["width"])
+    C2_value = C2(float(params["C"]) / 2, beta, float(params["SMF"]), float(params["n"]))
+    a_final, _ = failure_crack_length(float(params["SMF"]), float(params["width"]), float(params["hole_diameter"]),
+                                      a_i, a_i, **{key: float(params[key]) for key in TERMINATION_PARAMS})
+    return cycles_to_crack_length(a_final, C2_value, a_i, float(params["n"]))
+
+
+# Function to spread the reference inputs into a family of geometry/material variants
+def sample_scenarios(base_params, count, seed=0):
+    rng = np.random.default_rng(seed)
+    params = {key: float(value) for key, value in base_params.items()}
+    params["SMF"] = float(params["SMF"]) * rng.uniform(0.8, 1.6, count)
+    params["C"] = float(params["C"]) * rng.uniform(0.5, 2.0, count)
+    params["hole_diameter"] = float(params["hole_diameter"]) * rng.uniform(0.5, 1.5, count)
+    params["initial_crack_length_A"] = float(params["initial_crack_length_A"]) * rng.uniform(1.0, 5.0, count)
+    params["initial_crack_length_C"] = float(params["initial_crack_length_C"]) * rng.uniform(1.0, 5.0, count)
+    return params
+
+
+# Function to compare the batch engine against the scalar engine, scenario by scenario
+def compare_with_scalar(params, count, method, rtol=1e-9):
+    batch = calculate_crack_growth_batch(params, method=method)
+    worst = 0.0
+    for i in range(count):
+        scenario = {key: (value[i] if np.ndim(value) else value) for key, value in params.items()}
+        cycle_counts, crack_lengths_A, crack_lengths_C, crack_areas = calculate_crack_growth(scenario, method=method, output={"endpoints": True})
+        if abs(cycle_counts[-1] - batch["cycles"][i]) > rtol * max(cycle_counts[-1], 1):
+            raise AssertionError(f"Scenario {i}: {batch['cycles'][i]} cycles in batch, {cycle_counts[-1]} in scalar path")
+        for key, scalar in (("crack_length_A", crack_lengths_A[-1]), ("crack_length_C", crack_lengths_C[-1]), ("crack_area", crack_areas[-1])):
+            worst = max(worst, abs(batch[key][i] - scalar) / abs(scalar))
+    return worst
+
+
+# Function to time the batch engine at several scenario counts
+def run_benchmark(sizes, repeats=3, check=20, rtol=1e-9):
+    base_params = load_test_params()
+
+    print(f"{'method':>8} {'scenarios':>10} {'seconds':>10} {'scenarios/s':>14}")
+    for method in ("fixed", "auto"):
+        worst = compare_with_scalar(sample_scenarios(base_params, check, seed=1), check, method, rtol)
+        if worst > rtol:
+            raise AssertionError(f"Batch results ({method}) differ from the scalar path by {worst:.3e} (tolerance {rtol:.1e})")
+
+        for size in sizes:
+            params = sample_scenarios(base_params, size)
+            best = float('inf')
+            for _ in range(repeats):
+                start = time.perf_counter()
+                calculate_crack_growth_batch(params, method=method)
+                best = min(best, time.perf_counter() - start)
+            print(f"{method:>8} {size:>10} {best:>10.3f} {size / best:>14.1f}")
+    print(f"Batch vs scalar on {check} scenarios: max relative difference below {rtol:.1e}")
+
+
+# Function to compare the adaptive integrator against the fixed-block reference on long lives,
+# both measured against the exact closed-form life
+def compare_integrators(cases=LONG_LIFE_CASES):
+    base_params = load_test_params()
+    base_params["delta_K_threshold_value"] = 0.0
+
+    print(f"{'exact life':>12} {'blocks':>10} {'seconds':>9} {'rel. error':>10} "
+          f"{'evaluations':>12} {'seconds':>9} {'rel. error':>10}")
+    for SMF, initial_crack_length in cases:
+        params = dict(base_params, SMF=SMF, initial_crack_length_A=initial_crack_length, initial_crack_length_C=initial_crack_length)
+        exact_life = closed_form_cycles(params)
+
+        start = time.perf_counter()
+        cycle_counts = calculate_crack_growth(params, method="fixed", max_cycles=1e9).cycle_counts
+        fixed_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        adaptive, evaluations = calculate_crack_growth_adaptive(params, max_cycles=1e9)
+        adaptive_counts = adaptive.cycle_counts
+        adaptive_time = time.perf_counter() - start
+
+        print(f"{exact_life:>12.4g} {len(cycle_counts) - 1:>10} {fixed_time:>9.3f} {abs(cycle_counts[-1] - exact_life) / exact_life:>10.2e} "
+              f"{evaluations:>12} {adaptive_time:>9.3f} {abs(adaptive_counts[-1] - exact_life) / exact_life:>10.2e}")
+
+
+# Function to write a reproducible spectrum of peaks and valleys for the golden spectrum cases
+def golden_spectrum(seed, cycles):
+    path = os.path.join(tempfile.gettempdir(), f"fgc_golden_spectrum_{seed}_{cycles}.txt")
+    if not os.path.exists(path):
+        levels = np.abs(np.random.default_rng(seed).normal(0.6, 0.25, 2 * cycles))
+        levels[::2] = 0.0  # Valleys at zero load
+        np.savetxt(path, levels)
+    return path
+
+
+# Function to run one golden case and return its final state
+def run_golden_case(name):
+    overrides, method, max_cycles, spectrum = next(definition[1:] for definition in GOLDEN_DEFINITIONS if definition[0] == name)
+    params = dict(load_test_params(), **overrides)
+    if spectrum:
+        params["spectrum_file"] = golden_spectrum(*spectrum)
+    history = calculate_crack_growth(params, method=method, max_cycles=max_cycles, output={"endpoints": True})
+    final = history.records[-1]
+    return {"cycles": float(final["cycles"]), "crack_length_A": float(final["crack_length_A"]),
+            "crack_length_C": float(final["crack_length_C"]), "stop_reason": STOP_REASON_NAMES[history.stop_reason]}
+
+
+# Function to time a call (best of repeats) and record its peak traced memory
+def _measure(function, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, result
+
+
+# Function to measure throughput and memory of the engines
+def measure_performance(repeats=3, scenarios=10000):
+    base_params = load_test_params()
+    metrics = {}
+
+    params = sample_scenarios(base_params, scenarios)
+    for method in ("auto", "fixed"):
+        seconds, peak, _ = _measure(lambda: calculate_crack_growth_batch(params, method=method), repeats)
+        metrics[f"batch_{method}_scenarios_per_second"] = scenarios / seconds
+        metrics[f"batch_{method}_peak_memory_mb"] = peak / 2 ** 20
+
+    spectrum_params = dict(base_params, SMF=40.0, spectrum_file=golden_spectrum(0, 20000))
+    for name, params, method in (("fixed", base_params, "fixed"), ("adaptive", base_params, "adaptive"),
+                                 ("spectrum", spectrum_params, "auto")):
+        seconds, peak, history = _measure(lambda: calculate_crack_growth(params, method=method, max_cycles=1e8), repeats)
+        metrics[f"{name}_seconds_per_million_cycles"] = seconds / history.cycle_counts[-1] * 1e6
+        metrics[f"{name}_peak_memory_mb"] = peak / 2 ** 20
+    return metrics
+
+
+# Function to compare metrics with a baseline: rates must not drop and times and memory must not grow beyond the threshold
+def compare_with_baseline(metrics, baseline, threshold=REGRESSION_THRESHOLD):
+    failures = []
+    for name, value in metrics.items():
+        reference = baseline.get(name)
+        change = "" if reference is None else f"{value / reference - 1:+.1%}"
+        print(f"{name:>40} {value:>14.4g} {'' if reference is None else f'{reference:>14.4g}':>14} {change:>8}")
+        if reference is None:
+            continue
+        higher_is_better = name.endswith("per_second")
+        if (value < reference / (1 + threshold)) if higher_is_better else (value > reference * (1 + threshold)):
+            failures.append(f"{name} regressed from {reference:.4g} to {value:.4g}")
+    return failures
+
+
+# Function to compare the performance with the local baseline; returns the process exit status
+def run_regression(baseline_path=BASELINE, threshold=REGRESSION_THRESHOLD, save_baseline=False, repeats=3):
+    metrics = measure_performance(repeats=repeats)
+    baseline = {}
+    if os.path.exists(baseline_path) and not save_baseline:
+        with open(baseline_path, 'r') as file:
+            baseline = json.load(file)
+    print(f"{'metric':>40} {'value':>14} {'baseline':>14} {'change':>8}")
+    failures = compare_with_baseline(metrics, baseline, threshold)
+    if save_baseline:
+        with open(baseline_path, 'w') as file:
+            json.dump(metrics, file, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the batch crack growth engine")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 1000, 100000], help="Scenario counts to time")
+    parser.add_argument("--repeats", type=int, default=3, help="Timing repeats per size (best is reported)")
+    parser.add_argument("--integrators", action="store_true", help="Compare adaptive and fixed-block integration on long lives")
+    parser.add_argument("--regression", action="store_true", help="Compare the performance with the saved baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="Save the measured performance as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE, help="Performance baseline file")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="Allowed relative regression")
+    parser.add_argument("--update-golden", action="store_true", help="Store the current results of the golden cases")
+    args = parser.parse_args()
+    if args.update_golden:
+        with open(GOLDEN_CASES, 'w') as file:
+            json.dump({name: run_golden_case(name) for name, *_ in GOLDEN_DEFINITIONS}, file, indent=2)
+        print(f"Golden results written to {GOLDEN_CASES}")
+    elif args.regression:
+        sys.exit(run_regression(args.baseline, args.threshold, args.save_baseline, args.repeats))
+    elif args.integrators:
+        compare_integrators()
+    else:
+        run_benchmark(args.sizes, repeats=args.repeats)
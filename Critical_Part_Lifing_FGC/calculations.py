@@ -1,6 +1,255 @@
+import math
+
 import numpy as np
 
-def calculate_crack_growth(params):
+from closed_form import C2
+from closure import closure_factor
+from geometry import geometry_from_params, geometry_table, legacy_beta
+from history import CrackHistory
+from kernels import crack_length, cycles_to_crack_length
+from rate_laws import rate_law_from_params, rate_table, single_walker
+from retardation import retardation_from_params
+from spectrum import CHUNK_SIZE, cycle_stresses, iter_spectrum_cycles
+from spectrum_cache import load_cycle_stresses
+from termination import critical_crack_length, fracture_toughness
+
+BLOCK_SIZE = 10  # Number of cycles after which crack growth is recalculated
+MAX_CYCLES = 50000  # Maximum number of cycles for the simulation
+MIN_CRACK_GROWTH = 1e-9  # Growth per block below which the simulation stops
+MAX_CRACK_AREA = 1.0  # Crack area at which the simulation stops when no fracture toughness is given
+ADAPTIVE_MAX_CYCLES = 1e8  # Maximum number of cycles for the adaptive integration mode
+ADAPTIVE_RTOL = 1e-6  # Relative local error tolerance of the adaptive integration mode
+SPECTRUM_SEGMENT_GROWTH = 0.01  # Relative crack growth between growth-rate updates in spectrum runs
+CHUNK_WINDOW_LIMIT = 1 << 16  # Most spectrum cycles evaluated at once for one growth-rate update
+PROGRESS_INTERVAL = 1000  # Blocks between progress reports of the fixed-block loop
+
+# Reasons a scenario stopped growing, as reported by calculate_crack_growth_batch and CrackHistory.stop_reason
+STOP_MAX_CYCLES = 0
+STOP_THRESHOLD = 1
+STOP_GROWTH_RATE = 2
+STOP_CRACK_AREA = 3
+STOP_FRACTURE = 4  # Critical crack size from fracture toughness, residual strength or the ligament
+FAILURE_REASONS = (STOP_CRACK_AREA, STOP_FRACTURE)
+STOP_REASON_NAMES = {STOP_MAX_CYCLES: "max_cycles", STOP_THRESHOLD: "threshold", STOP_GROWTH_RATE: "growth_rate",
+                     STOP_CRACK_AREA: "crack_area", STOP_FRACTURE: "fracture"}
+
+
+class CalculationCancelled(Exception):
+    """Raised from a progress callback to stop a running calculation."""
+
+
+# Parameters kept as text; all others are converted to float where possible
+TEXT_PARAMS = ("material_name", "spectrum_file", "rate_law", "geometry", "retardation")
+
+# Parameters which may vary between scenarios in calculate_crack_growth_batch
+BATCH_PARAMS = ("C", "n", "m", "SMF", "width", "hole_diameter",
+                "initial_crack_length_A", "initial_crack_length_C", "delta_K_threshold_value",
+                "thickness", "yield_strength", "plane_stress_fracture_toughness", "plane_strain_fracture_toughness", "Pxx",
+                "constraint_factor", "flow_stress")
+
+# Inputs of the critical crack size; without them the crack grows to MAX_CRACK_AREA
+TERMINATION_PARAMS = ("thickness", "yield_strength", "plane_stress_fracture_toughness", "plane_strain_fracture_toughness", "Pxx")
+
+# Inputs of Newman's crack closure model (constraint factor alpha, flow stress sigma_0); without them
+# there is no closure correction
+CLOSURE_PARAMS = ("constraint_factor", "flow_stress")
+
+
+# Function to convert parameters collected from the input tabs or a JSON file to numbers
+def convert_params(params):
+    converted = {}
+    for key, value in params.items():
+        if key not in TEXT_PARAMS:
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                pass
+        converted[key] = value
+    return converted
+
+
+def walker_equation(delta_K, R, C, n, m):
+    try:
+        return C * (delta_K * (1 - R) ** (m - 1)) ** n
+    except OverflowError:
+        return float('inf')
+
+
+def calculate_delta_K(SMF, crack_length_A, crack_length_C, width, hole_diameter):
+    a = (crack_length_A + crack_length_C) / 2  # Average crack length
+    beta = legacy_beta(width, hole_diameter)
+    K_max = SMF * np.sqrt(np.pi * a) * beta  # Adjusted with geometry factor
+    return K_max  # Delta K in ksi√in
+
+
+# Mean crack length at which the part fails and the stop reason that goes with it, for scalars or scenario arrays
+def failure_crack_length(max_stress, width, hole_diameter, initial_crack_length_A, initial_crack_length_C,
+                         thickness=0.0, yield_strength=0.0, plane_stress_fracture_toughness=0.0,
+                         plane_strain_fracture_toughness=0.0, Pxx=0.0):
+    toughness = fracture_toughness(thickness, yield_strength, plane_stress_fracture_toughness, plane_strain_fracture_toughness)
+    beta = legacy_beta(width, hole_diameter)
+    # Mean crack length at which the crack area reaches MAX_CRACK_AREA
+    half_difference = (initial_crack_length_A - initial_crack_length_C) / 2
+    area_limit = np.sqrt(MAX_CRACK_AREA + half_difference ** 2)
+    # Mean crack length at which the C tip runs out of ligament between the hole and the plate edge
+    ligament_limit = (width - hole_diameter) / 2 + half_difference
+    # The crack must carry both the highest applied stress and the residual strength requirement,
+    # and cannot grow past the ligament
+    critical = critical_crack_length(toughness, np.maximum(max_stress, Pxx), beta, ligament_limit)
+
+    toughness_given = toughness > 0
+    ligament_governs = ~toughness_given & (ligament_limit < area_limit)
+    return (np.where(toughness_given, critical, np.minimum(area_limit, ligament_limit)),
+            np.where(toughness_given | ligament_governs, STOP_FRACTURE, STOP_CRACK_AREA))
+
+
+# Termination inputs of a scalar run; missing ones count as not given
+def _failure_params(params):
+    return {key: float(params.get(key) or 0) for key in TERMINATION_PARAMS}
+
+
+# The analytic life integral holds for the single Walker law under constant-amplitude loading at R = 0
+# with a constant geometry factor
+def closed_form_applies(params):
+    return (single_walker(params) and geometry_from_params(params) == "legacy" and float(params["n"]) != 2 and float(params["C"]) > 0
+            and float(params["SMF"]) > 0)
+
+
+# Closure inputs (alpha, flow stress) if crack closure is modelled, else None. The rates are then
+# evaluated at delta_K_eff and R = 0; the NASGRO law applies closure through its own f instead
+def _closure(params):
+    alpha, flow_stress = (float(params.get(key) or 0) for key in CLOSURE_PARAMS)
+    if alpha > 0 and flow_stress > 0 and params.get("rate_law") != "nasgro":
+        return alpha, flow_stress
+    return None
+
+
+# delta_K_eff / delta_K of constant amplitude loading at R = 0 with peak stress SMF; 1 without closure
+def _constant_amplitude_closure(params, SMF):
+    closure = _closure(params)
+    if closure is None:
+        return 1.0
+    alpha, flow_stress = closure
+    return float(closure_factor(0.0, SMF / flow_stress, alpha))
+
+
+# Growth rate function of the rate law for R in [R_min, R_max] (a lookup table), or None for the
+# single Walker law, which is evaluated directly with walker_equation
+def _table_rate(params, R_min=0.0, R_max=None):
+    if single_walker(params):
+        return None
+    return rate_table(rate_law_from_params(params), R_min, R_max).rate
+
+
+# Final cycle count and stop reason of the closed-form solution, for scalars or scenario arrays
+def closed_form_life(C, n, SMF, width, hole_diameter, initial_crack_length_A, initial_crack_length_C,
+                     delta_K_threshold_value, max_cycles, a_final, failure_reason):
+    stress_ratio = 0  # R
+    beta = legacy_beta(width, hole_diameter)
+    # A and C each grow by half of da/dN, so their mean grows at half the Walker rate
+    C2_value = C2(C / 2, beta, SMF, n)
+    a_i = (initial_crack_length_A + initial_crack_length_C) / 2
+    life = cycles_to_crack_length(a_final, C2_value, a_i, n)
+
+    # Same stopping criteria as the fixed-block loop: failure at the exact cycle the mean crack
+    # reaches a_final, the cycle limit on whole blocks
+    failed = a_i >= a_final
+    delta_K = calculate_delta_K(SMF, initial_crack_length_A, initial_crack_length_C, width, hole_diameter)
+    below_threshold = ~failed & (delta_K < delta_K_threshold_value)
+    too_slow = ~failed & ~below_threshold & (walker_equation(delta_K, stress_ratio, C, n, 1) * BLOCK_SIZE < MIN_CRACK_GROWTH)
+    reaches_limit = life >= max_cycles
+    cycles = np.where(reaches_limit, np.floor(max_cycles / BLOCK_SIZE) * BLOCK_SIZE, life)
+    cycles = np.where(failed | below_threshold | too_slow, 0, cycles)
+    stop_reason = np.select([failed, below_threshold, too_slow, reaches_limit],
+                            [failure_reason, STOP_THRESHOLD, STOP_GROWTH_RATE, STOP_MAX_CYCLES], failure_reason)
+    return cycles, stop_reason, C2_value, a_i
+
+
+def calculate_crack_growth_closed_form(params, max_cycles=None, output=None):
+    """Evaluate the analytic a(N) at the block points of the fixed-block integration.
+
+    Returns the same history as calculate_crack_growth in one vectorized evaluation
+    instead of one loop iteration per block.
+    """
+    C = float(params["C"])
+    n = float(params["n"])
+    SMF = float(params["SMF"])
+    width = float(params["width"])
+    hole_diameter = float(params["hole_diameter"])
+    initial_crack_length_A = float(params["initial_crack_length_A"])
+    initial_crack_length_C = float(params["initial_crack_length_C"])
+    max_cycles = MAX_CYCLES if max_cycles is None else max_cycles
+
+    a_final, failure_reason = failure_crack_length(SMF, width, hole_diameter, initial_crack_length_A,
+                                                   initial_crack_length_C, **_failure_params(params))
+    # At R = 0 closure scales delta_K by a constant, i.e. C by its n-th power
+    C *= _constant_amplitude_closure(params, SMF) ** n
+    final_cycles, stop_reason, C2_value, a_i = closed_form_life(
+        C, n, SMF, width, hole_diameter, initial_crack_length_A, initial_crack_length_C,
+        float(params["delta_K_threshold_value"]), max_cycles, a_final, failure_reason)
+
+    # Block points, plus the failure point where it falls between blocks
+    final_cycles = float(final_cycles)
+    cycle_counts = np.arange(0, np.floor(final_cycles / BLOCK_SIZE) * BLOCK_SIZE + 1, BLOCK_SIZE, dtype=float)
+    if cycle_counts[-1] < final_cycles:
+        cycle_counts = np.append(cycle_counts, final_cycles)
+    growth = crack_length(cycle_counts, C2_value, a_i, n) - a_i
+    if stop_reason in FAILURE_REASONS and final_cycles > 0:
+        growth[-1] = a_final - a_i  # Exactly the critical size, without the round-off of a(N)
+    crack_lengths_A = initial_crack_length_A + growth
+    crack_lengths_C = initial_crack_length_C + growth
+    crack_areas = crack_lengths_A * crack_lengths_C
+    history = CrackHistory(**(output or {}))
+    history.extend(cycle_counts, crack_lengths_A, crack_lengths_C, crack_areas)
+    history.stop_reason = int(stop_reason)
+    return history.finish()
+
+
+def closed_form_curve(params):
+    """Return the analytic history of a closed-form run as a function of cycles.
+
+    The function maps an array of cycle counts to (crack_lengths_A, crack_lengths_C,
+    crack_areas) with the a(N) kernel, so plots can draw the run at any resolution.
+    Only valid where closed_form_applies(params).
+    """
+    n = float(params["n"])
+    SMF = float(params["SMF"])
+    initial_crack_length_A = float(params["initial_crack_length_A"])
+    initial_crack_length_C = float(params["initial_crack_length_C"])
+    C = float(params["C"]) * _constant_amplitude_closure(params, SMF) ** n
+    C2_value = C2(C / 2, legacy_beta(float(params["width"]), float(params["hole_diameter"])), SMF, n)
+    a_i = (initial_crack_length_A + initial_crack_length_C) / 2
+
+    def curve(cycle_counts):
+        growth = crack_length(np.asarray(cycle_counts, dtype=float), C2_value, a_i, n) - a_i
+        crack_lengths_A = initial_crack_length_A + growth
+        crack_lengths_C = initial_crack_length_C + growth
+        return crack_lengths_A, crack_lengths_C, crack_lengths_A * crack_lengths_C
+    return curve
+
+
+def calculate_crack_growth(params, method="auto", max_cycles=None, progress=None, output=None):
+    # Returns a CrackHistory; output holds its policy arguments, e.g. {"every": 10} or {"endpoints": True}.
+    # progress(cycle_counts, crack_lengths_A, crack_lengths_C, crack_areas) is called with the
+    # stored history so far during long runs; it may raise CalculationCancelled to stop the run
+    # A spectrum file replaces the constant amplitude loading
+    if params.get("spectrum_file"):
+        return calculate_spectrum_crack_growth(params, max_cycles=max_cycles, progress=progress, output=output)
+    # Corner and through cracks grow their two tips independently, in fixed blocks
+    if geometry_from_params(params) != "legacy":
+        if method not in ("auto", "fixed"):
+            raise ValueError(f"The {geometry_from_params(params)} geometry supports fixed-block integration only")
+        return calculate_crack_growth_two_tip(params, max_cycles=max_cycles, progress=progress, output=output)
+    # "auto" uses the closed-form solution whenever its assumptions hold
+    if method == "auto":
+        method = "closed_form" if closed_form_applies(params) else "fixed"
+    if method == "closed_form":
+        return calculate_crack_growth_closed_form(params, max_cycles=max_cycles, output=output)
+    if method == "adaptive":
+        return calculate_crack_growth_adaptive(params, max_cycles=max_cycles, progress=progress, output=output)[0]
+    if method != "fixed":
+        raise ValueError(f"Unknown integration method: {method}")
+
     # Ensure all parameters are converted to appropriate numeric types
     C = float(params["C"])
     n = float(params["n"])
@@ -9,8 +258,8 @@ def calculate_crack_growth(params):
     initial_crack_length_C = float(params["initial_crack_length_C"])
     SMF = float(params["SMF"])
     stress_ratio = 0  # R
-    block_size = 10  # Number of cycles after which crack growth is recalculated
-    max_cycles = 50000  # Maximum number of cycles for the simulation
+    block_size = BLOCK_SIZE
+    max_cycles = MAX_CYCLES if max_cycles is None else max_cycles
 
     width = float(params["width"])
     thickness = float(params["thickness"])
@@ -20,45 +269,557 @@ def calculate_crack_growth(params):
     plane_strain_fracture_toughness = float(params["plane_strain_fracture_toughness"])
     delta_K_threshold_value = float(params["delta_K_threshold_value"])
 
-    def walker_equation(delta_K, R, C, n, m):
-        try:
-            return C * (delta_K * (1 - R) ** (m - 1)) ** n
-        except OverflowError:
-            return float('inf')
-
-    def calculate_delta_K(SMF, crack_length_A, crack_length_C, width, hole_diameter):
-        a = (crack_length_A + crack_length_C) / 2  # Average crack length
-        beta = 1 + 0.5 * (hole_diameter / width)
-        K_max = SMF * np.sqrt(np.pi * a) * beta  # Adjusted with geometry factor
-        return K_max  # Delta K in ksi√in
+    # Crack length sum (A + C) at which the part fails, computed once before the integration
+    a_final, failure_reason = failure_crack_length(
+        SMF, width, hole_diameter, initial_crack_length_A, initial_crack_length_C, thickness,
+        float(params.get("yield_strength") or 0), plane_stress_fracture_toughness,
+        plane_strain_fracture_toughness, float(params.get("Pxx") or 0))
+    final_sum = 2 * float(a_final)
+    table_rate = _table_rate(params, stress_ratio)
+    closure = _constant_amplitude_closure(params, SMF)
 
     crack_length_A = initial_crack_length_A
     crack_length_C = initial_crack_length_C
     crack_area = crack_length_A * crack_length_C
     cycles = 0
-    crack_areas = [crack_area]
-    crack_lengths_A = [crack_length_A]
-    crack_lengths_C = [crack_length_C]
-    cycle_counts = [cycles]
+    history = CrackHistory(**(output or {}))
+    history.append(cycles, crack_length_A, crack_length_C, crack_area)
+    history.stop_reason = STOP_MAX_CYCLES
+    if crack_length_A + crack_length_C >= final_sum:  # The initial crack is already critical
+        history.stop_reason = int(failure_reason)
+        return history.finish()
 
     while cycles < max_cycles:
         delta_K = calculate_delta_K(SMF, crack_length_A, crack_length_C, width, hole_diameter)
         if delta_K < delta_K_threshold_value:  # If delta_K is below threshold, no crack growth
+            history.stop_reason = STOP_THRESHOLD
             break
-        da_dN = walker_equation(delta_K, stress_ratio, C, n, m)
+        if table_rate is None:
+            da_dN = walker_equation(closure * delta_K, stress_ratio, C, n, m)
+        else:
+            da_dN = float(table_rate(closure * delta_K, stress_ratio))
         crack_growth = da_dN * block_size
-        if crack_growth < 1e-9:  # If crack growth rate is very small, stop the simulation
+        if crack_growth < MIN_CRACK_GROWTH:  # If crack growth rate is very small, stop the simulation
+            history.stop_reason = STOP_GROWTH_RATE
+            break
+        remaining = final_sum - crack_length_A - crack_length_C
+        if crack_growth >= remaining:
+            # The crack reaches the critical size during this block; stop at the cycle it does
+            cycles += block_size * remaining / crack_growth
+            crack_length_A += remaining / 2
+            crack_length_C += remaining / 2
+            history.append(cycles, crack_length_A, crack_length_C, crack_length_A * crack_length_C)
+            history.stop_reason = int(failure_reason)
             break
         crack_length_A += crack_growth / 2
         crack_length_C += crack_growth / 2
         crack_area = crack_length_A * crack_length_C
-        if crack_area > 1.0:  # Stop if the crack area becomes unreasonably large
+
+        cycles += block_size
+        history.append(cycles, crack_length_A, crack_length_C, crack_area)
+        if progress and history.offered % PROGRESS_INTERVAL == 0:
+            progress(*history)
+
+    return history.finish()
+
+
+def calculate_crack_growth_two_tip(params, max_cycles=None, progress=None, output=None):
+    """Grow the A and C tips of a corner or through crack independently, in blocks of BLOCK_SIZE cycles.
+
+    Each tip grows at the rate of its own delta_K = SMF * beta * sqrt(pi * length), with
+    the betas of the geometry in params["geometry"] (geometry.py); a tip below the
+    threshold does not grow. A corner crack whose A tip reaches the thickness continues
+    as a through crack. The run stops when neither tip grows, at max_cycles, or in the
+    block in which either tip reaches the fracture toughness under max(SMF, Pxx), the C
+    tip reaches the ligament, or (without toughness values) the crack area reaches
+    MAX_CRACK_AREA; the stop within the block is interpolated linearly. Returns a
+    CrackHistory, with progress reported as in calculate_crack_growth.
+    """
+    C = float(params["C"])
+    n = float(params["n"])
+    m = float(params["m"])
+    SMF = float(params["SMF"])
+    stress_ratio = 0  # R
+    block_size = BLOCK_SIZE
+    max_cycles = MAX_CYCLES if max_cycles is None else max_cycles
+
+    width = float(params["width"])
+    thickness = float(params["thickness"])
+    hole_diameter = float(params["hole_diameter"])
+    delta_K_threshold_value = float(params["delta_K_threshold_value"])
+    failure_params = _failure_params(params)
+    toughness = float(fracture_toughness(thickness, failure_params["yield_strength"],
+                                         failure_params["plane_stress_fracture_toughness"],
+                                         failure_params["plane_strain_fracture_toughness"]))
+    failure_stress = max(SMF, failure_params["Pxx"])
+    ligament = (width - hole_diameter) / 2
+    table_rate = _table_rate(params, stress_ratio)
+    closure = _constant_amplitude_closure(params, SMF)
+
+    geometry = geometry_from_params(params)
+    table = geometry_table(geometry, width, hole_diameter, thickness)
+    crack_length_A = thickness if geometry == "through_crack_at_hole" else float(params["initial_crack_length_A"])
+    crack_length_C = float(params["initial_crack_length_C"])
+
+    # Crack growth rate of one tip at its delta_K
+    def tip_rate(delta_K):
+        if delta_K < delta_K_threshold_value:
+            return 0.0
+        if table_rate is None:
+            return walker_equation(closure * delta_K, stress_ratio, C, n, m)
+        return float(table_rate(closure * delta_K, stress_ratio))
+
+    # How far the crack is from failing (failure at >= 0) and the reason it would fail;
+    # running out of ligament counts as fracture
+    def failure_margin(beta_A, beta_C, crack_length_A, crack_length_C):
+        ligament_margin = crack_length_C / ligament - 1
+        if toughness > 0:
+            K_max = failure_stress * max(beta_A * math.sqrt(math.pi * crack_length_A),
+                                         beta_C * math.sqrt(math.pi * crack_length_C))
+            return max(ligament_margin, K_max / toughness - 1), STOP_FRACTURE
+        area_margin = crack_length_A * crack_length_C / MAX_CRACK_AREA - 1
+        if ligament_margin >= area_margin:
+            return ligament_margin, STOP_FRACTURE
+        return area_margin, STOP_CRACK_AREA
+
+    cycles = 0
+    history = CrackHistory(**(output or {}))
+    history.append(cycles, crack_length_A, crack_length_C, crack_length_A * crack_length_C)
+    history.stop_reason = STOP_MAX_CYCLES
+    beta_A, beta_C = table.beta(crack_length_A, crack_length_C)
+    margin, failure_reason = failure_margin(beta_A, beta_C, crack_length_A, crack_length_C)
+    if margin >= 0:  # The initial crack is already critical
+        history.stop_reason = failure_reason
+        return history.finish()
+
+    while cycles < max_cycles:
+        growth_A = tip_rate(SMF * beta_A * math.sqrt(math.pi * crack_length_A)) * block_size
+        growth_C = tip_rate(SMF * beta_C * math.sqrt(math.pi * crack_length_C)) * block_size
+        if growth_A == 0 and growth_C == 0:  # Both tips are below the threshold
+            history.stop_reason = STOP_THRESHOLD
+            break
+        if growth_A + growth_C < MIN_CRACK_GROWTH:  # If crack growth rate is very small, stop the simulation
+            history.stop_reason = STOP_GROWTH_RATE
             break
 
+        new_A = min(crack_length_A + growth_A, thickness) if geometry == "corner_crack_at_hole" else crack_length_A
+        new_C = crack_length_C + growth_C
+        if geometry == "corner_crack_at_hole" and new_A >= thickness:
+            # The corner crack has broken through the thickness
+            geometry = "through_crack_at_hole"
+            table = geometry_table(geometry, width, hole_diameter, thickness)
+        beta_A, beta_C = table.beta(new_A, new_C)
+        new_margin, failure_reason = failure_margin(beta_A, beta_C, new_A, new_C)
+        if new_margin >= 0:
+            # The crack fails during this block; stop where the margin crosses zero
+            fraction = margin / (margin - new_margin)
+            cycles += block_size * fraction
+            crack_length_A += (new_A - crack_length_A) * fraction
+            crack_length_C += (new_C - crack_length_C) * fraction
+            history.append(cycles, crack_length_A, crack_length_C, crack_length_A * crack_length_C)
+            history.stop_reason = failure_reason
+            break
+        crack_length_A, crack_length_C, margin = new_A, new_C, new_margin
+
         cycles += block_size
-        crack_areas.append(crack_area)
-        crack_lengths_A.append(crack_length_A)
-        crack_lengths_C.append(crack_length_C)
-        cycle_counts.append(cycles)
+        history.append(cycles, crack_length_A, crack_length_C, crack_length_A * crack_length_C)
+        if progress and history.offered % PROGRESS_INTERVAL == 0:
+            progress(*history)
+
+    return history.finish()
+
+
+def calculate_crack_growth_adaptive(params, rtol=ADAPTIVE_RTOL, max_cycles=None, progress=None, output=None):
+    """Integrate crack growth with an error-controlled, variable cycle step.
+
+    Uses the embedded Bogacki-Shampine 3(2) Runge-Kutta pair on the sum of the crack
+    lengths, which is all delta_K depends on. The step grows while da/dN is small and
+    shrinks as the crack approaches the critical crack size, on which the last step lands.
+    Returns the same history as calculate_crack_growth and the number of
+    growth-rate (function) evaluations. ``progress`` is called as in calculate_crack_growth
+    after every tenth accepted step.
+    """
+    C = float(params["C"])
+    n = float(params["n"])
+    m = float(params["m"])
+    initial_crack_length_A = float(params["initial_crack_length_A"])
+    initial_crack_length_C = float(params["initial_crack_length_C"])
+    SMF = float(params["SMF"])
+    stress_ratio = 0  # R
+    max_cycles = ADAPTIVE_MAX_CYCLES if max_cycles is None else max_cycles
+
+    width = float(params["width"])
+    hole_diameter = float(params["hole_diameter"])
+    delta_K_threshold_value = float(params["delta_K_threshold_value"])
+
+    evaluations = 0
+    table_rate = _table_rate(params, stress_ratio)
+    closure = _constant_amplitude_closure(params, SMF)
+
+    # Growth rate of the crack length sum; A and C each grow by half of it
+    def growth_rate(crack_length_sum):
+        nonlocal evaluations
+        evaluations += 1
+        delta_K = closure * calculate_delta_K(SMF, crack_length_sum / 2, crack_length_sum / 2, width, hole_diameter)
+        if table_rate is None:
+            return walker_equation(delta_K, stress_ratio, C, n, m)
+        return float(table_rate(delta_K, stress_ratio))
+
+    # Crack length sum at which the part fails
+    a_final, failure_reason = failure_crack_length(SMF, width, hole_diameter, initial_crack_length_A,
+                                                   initial_crack_length_C, **_failure_params(params))
+    final_sum = 2 * float(a_final)
+
+    crack_length_sum = initial_crack_length_A + initial_crack_length_C
+    cycles = 0.0
+    history = CrackHistory(**(output or {}))
+    history.append(cycles, initial_crack_length_A, initial_crack_length_C, initial_crack_length_A * initial_crack_length_C)
+    if crack_length_sum >= final_sum:  # The initial crack is already critical
+        history.stop_reason = int(failure_reason)
+        return history.finish(), evaluations
+
+    delta_K = calculate_delta_K(SMF, initial_crack_length_A, initial_crack_length_C, width, hole_diameter)
+    if delta_K < delta_K_threshold_value:  # If delta_K is below threshold, no crack growth
+        history.stop_reason = STOP_THRESHOLD
+        return history.finish(), evaluations
+
+    k1 = growth_rate(crack_length_sum)
+    # Same cut-off as the fixed-block mode; da/dN only increases as the crack grows
+    if k1 * BLOCK_SIZE < MIN_CRACK_GROWTH:
+        history.stop_reason = STOP_GROWTH_RATE
+        return history.finish(), evaluations
+
+    step = min(0.01 * crack_length_sum / k1, max_cycles)
+    while cycles < max_cycles and final_sum - crack_length_sum > rtol * final_sum:
+        step = min(step, max_cycles - cycles)
+        k2 = growth_rate(crack_length_sum + step * k1 / 2)
+        k3 = growth_rate(crack_length_sum + 3 * step * k2 / 4)
+        new_sum = crack_length_sum + step * (2 * k1 / 9 + k2 / 3 + 4 * k3 / 9)
+        k4 = growth_rate(new_sum)
+        error = step * (-5 * k1 / 72 + k2 / 12 + k3 / 9 - k4 / 8)
+        error_ratio = abs(error) / (rtol * new_sum) if np.isfinite(new_sum) else float('inf')
+
+        if error_ratio > 1:
+            step *= max(0.2, 0.9 * error_ratio ** (-1 / 3))
+            continue
+        if new_sum > final_sum:
+            # Shorten the step so it ends at the critical size; y(N) is convex, so the
+            # secant estimate lands just short of it and the next step closes the gap
+            step *= (final_sum - crack_length_sum) / (new_sum - crack_length_sum)
+            continue
+
+        cycles += step
+        crack_length_sum = new_sum
+        k1 = k4
+        crack_length_A = initial_crack_length_A + (crack_length_sum - initial_crack_length_A - initial_crack_length_C) / 2
+        crack_length_C = crack_length_sum - crack_length_A
+        history.append(cycles, crack_length_A, crack_length_C, crack_length_A * crack_length_C)
+        if progress and history.offered % 10 == 0:
+            progress(*history)
+
+        step *= min(5.0, 0.9 * error_ratio ** (-1 / 3)) if error_ratio > 0 else 5.0
+
+    history.stop_reason = STOP_MAX_CYCLES
+    if final_sum - crack_length_sum <= rtol * final_sum:
+        # Within tolerance of the critical size; the last sliver is crossed at the current rate
+        cycles += (final_sum - crack_length_sum) / k1
+        crack_length_A = initial_crack_length_A + (final_sum - initial_crack_length_A - initial_crack_length_C) / 2
+        crack_length_C = final_sum - crack_length_A
+        history.append(cycles, crack_length_A, crack_length_C, crack_length_A * crack_length_C)
+        history.stop_reason = int(failure_reason)
+    return history.finish(), evaluations
+
+
+# Function to stream the max stress, stress ratio and count of every spectrum cycle in chunks;
+# check() is called while the spectrum file is read and may raise to stop
+def iter_spectrum_stresses(path, SMF, SPL, counting="rainflow", use_cache=True, check=None):
+    if use_cache:
+        cycles = load_cycle_stresses(path, SMF, SPL, counting=counting, check=check)
+        for start in range(0, cycles.size, CHUNK_SIZE):
+            chunk = cycles[start:start + CHUNK_SIZE]
+            yield chunk["max_stress"], chunk["stress_ratio"], chunk["count"]
+    else:
+        for chunk in iter_spectrum_cycles(path, counting=counting):
+            if check:
+                check()
+            max_stress, _, stress_ratio = cycle_stresses(chunk, SMF, SPL)
+            yield max_stress, stress_ratio, chunk["count"]
+
+
+def calculate_spectrum_crack_growth(params, counting="rainflow", max_cycles=None, use_cache=True, progress=None,
+                                    output=None):
+    """Grow the crack cycle by cycle through the load spectrum in params["spectrum_file"].
+
+    The spectrum is streamed in chunks, reduced to turning points and counted, then
+    scaled with SMF and SPL into the max stress and R of every cycle; with use_cache
+    this pre-processing is read back from the spectrum cache. R is limited to
+    the Walker R-shift limits and delta_K = K_max * (1 - R). The crack is updated each
+    time it has grown by SPECTRUM_SEGMENT_GROWTH of its size, using midpoint growth
+    rates for the cycles in between. The spectrum is repeated until the crack reaches
+    its critical size in some cycle (set by the highest stress of the spectrum and Pxx),
+    max_cycles is reached, or a whole pass produces no growth. ``progress`` is
+    called as in calculate_crack_growth after every tenth crack update, and with the
+    initial point while the spectrum is first read and counted, so it can cancel that too.
+
+    params["retardation"] selects a load interaction model (retardation.py), which
+    carries its overload zone from cycle to cycle in spectrum order (rainflow cycles
+    in the order they close) and replaces delta_K and R by their effective values.
+    """
+    C = float(params["C"])
+    n = float(params["n"])
+    m = float(params["m"])
+    SMF = float(params["SMF"])
+    SPL = float(params.get("SPL") or 0)
+    lower_limit_R_shift = float(params["lower_limit_R_shift"])
+    upper_limit_R_shift = float(params["upper_limit_R_shift"])
+    max_cycles = ADAPTIVE_MAX_CYCLES if max_cycles is None else max_cycles
+    if geometry_from_params(params) != "legacy":
+        raise ValueError("Spectrum loading supports the legacy crack geometry only")
+
+    width = float(params["width"])
+    hole_diameter = float(params["hole_diameter"])
+    delta_K_threshold_value = float(params["delta_K_threshold_value"])
+    # With closure every cycle grows at its delta_K_eff and R = 0
+    closure = _closure(params)
+    retardation = retardation_from_params(params)
+    if closure is not None and retardation is not None:
+        raise ValueError("Crack closure and retardation cannot be combined")
+    # Other rate laws are tabulated once over the R-shift range and interpolated for every cycle
+    table_rate = _table_rate(params, lower_limit_R_shift, upper_limit_R_shift) if closure is None else _table_rate(params)
+
+    # Growth of the crack length sum in each cycle, for a crack held at crack_length_sum;
+    # U holds delta_K_eff / delta_K of the cycles, or None without closure
+    def cycle_growth(max_stress, stress_ratio, count, crack_length_sum, U=None):
+        K_max = calculate_delta_K(max_stress, crack_length_sum / 2, crack_length_sum / 2, width, hole_diameter)
+        delta_K = K_max * (1 - stress_ratio)
+        if retardation is not None:
+            # Effective values inside the overload zone; the model's state is committed once the segment is taken
+            delta_K, stress_ratio = retardation.window(K_max, K_max * stress_ratio, crack_length_sum / 2)
+            stress_ratio = np.clip(stress_ratio, lower_limit_R_shift, upper_limit_R_shift)
+        rate_delta_K, rate_R = (delta_K, stress_ratio) if U is None else (U * delta_K, 0.0)
+        if table_rate is None:
+            da_dN = walker_equation(rate_delta_K, rate_R, C, n, m)
+        else:
+            da_dN = table_rate(rate_delta_K, rate_R)
+        # The threshold is given at R = 0, so it is compared with the Walker equivalent delta_K
+        growing = (max_stress > 0) & (delta_K * (1 - stress_ratio) ** (m - 1) >= delta_K_threshold_value)
+        return np.where(growing, da_dN * count, 0.0)
+
+    crack_length_A = float(params["initial_crack_length_A"])
+    crack_length_C = float(params["initial_crack_length_C"])
+    cycles = 0.0
+    history = CrackHistory(**(output or {}))
+    history.append(cycles, crack_length_A, crack_length_C, crack_length_A * crack_length_C)
+
+    # Critical crack length sum for the highest stress in the spectrum; this first pass also builds the cache entry
+    check = (lambda: progress(*history)) if progress else None
+    peak_stress = max((float(max_stress.max()) for max_stress, _, _ in iter_spectrum_stresses(
+        params["spectrum_file"], SMF, SPL, counting=counting, use_cache=use_cache, check=check) if max_stress.size),
+        default=0.0)
+    a_final, failure_reason = failure_crack_length(peak_stress, width, hole_diameter, crack_length_A,
+                                                   crack_length_C, **_failure_params(params))
+    final_sum = 2 * float(a_final)
+    history.stop_reason = STOP_MAX_CYCLES
+    if crack_length_A + crack_length_C >= final_sum:  # The initial crack is already critical
+        history.stop_reason = int(failure_reason)
+        return history.finish()
+
+    stop = False
+    with np.errstate(over="ignore", invalid="ignore"):
+        while not stop and cycles < max_cycles:
+            pass_growth = 0.0
+            for max_stress, stress_ratio, count in iter_spectrum_stresses(
+                    params["spectrum_file"], SMF, SPL, counting=counting, use_cache=use_cache):
+                stress_ratio = np.clip(stress_ratio, lower_limit_R_shift, upper_limit_R_shift)
+                # Closure of the whole chunk in one call; it does not depend on the crack length
+                U = None if closure is None else closure_factor(stress_ratio, max_stress / closure[1], closure[0])
+
+                start = 0
+                window = 1024
+                while start < max_stress.size:
+                    crack_length_sum = crack_length_A + crack_length_C
+                    end = min(start + window, max_stress.size)
+                    growth = np.cumsum(cycle_growth(max_stress[start:end], stress_ratio[start:end], count[start:end],
+                                                    crack_length_sum, None if U is None else U[start:end]))
+                    # Cycles until the crack has grown by SPECTRUM_SEGMENT_GROWTH (at least one), then
+                    # the same cycles again with the rates at the midpoint of that growth
+                    k = min(int(np.searchsorted(growth, SPECTRUM_SEGMENT_GROWTH * crack_length_sum)) + 1, end - start)
+                    growth = np.cumsum(cycle_growth(max_stress[start:start + k], stress_ratio[start:start + k],
+                                                    count[start:start + k], crack_length_sum + growth[k - 1] / 2,
+                                                    None if U is None else U[start:start + k]))
+                    segment_cycles = cycles + np.cumsum(count[start:start + k])
+                    new_A = crack_length_A + growth / 2
+                    new_C = crack_length_C + growth / 2
+
+                    # Stop in the cycle in which the crack becomes critical, or after the last cycle within max_cycles
+                    failed = np.flatnonzero(new_A + new_C >= final_sum)
+                    over = np.flatnonzero(segment_cycles > max_cycles)
+                    if failed.size and (not over.size or failed[0] < over[0]):
+                        stop = True
+                        k = failed[0] + 1
+                        growth[k - 1] = final_sum - crack_length_sum
+                        new_A[k - 1] = crack_length_A + growth[k - 1] / 2
+                        new_C[k - 1] = crack_length_C + growth[k - 1] / 2
+                        history.stop_reason = int(failure_reason)
+                    elif over.size:
+                        stop = True
+                        history.stop_reason = STOP_MAX_CYCLES
+                        if over[0] == 0:  # Not even the first cycle of the segment fits
+                            break
+                        k = over[0]
+
+                    if retardation is not None:
+                        retardation.advance(k)
+                    crack_length_A = float(new_A[k - 1])
+                    crack_length_C = float(new_C[k - 1])
+                    cycles = float(segment_cycles[k - 1])
+                    pass_growth += float(growth[k - 1])
+                    history.append(cycles, crack_length_A, crack_length_C, crack_length_A * crack_length_C)
+                    if progress and history.offered % 10 == 0:
+                        progress(*history)
+
+                    if stop:
+                        break
+                    window = min(2 * window, CHUNK_WINDOW_LIMIT) if start + k == end else max(2 * k, 64)
+                    start += k
+                if stop:
+                    break
+            # Nothing in the spectrum grows the crack any more; a pass cut short by a stop says nothing about that
+            if not stop and pass_growth < MIN_CRACK_GROWTH:
+                history.stop_reason = STOP_GROWTH_RATE
+                break
+
+    return history.finish()
+
+
+def calculate_crack_growth_batch(params, method="auto", max_cycles=None):
+    """Advance many crack growth scenarios together as NumPy arrays.
+
+    Each entry of BATCH_PARAMS in ``params`` may be a scalar or an array; they are
+    broadcast against each other and every element is one scenario; the
+    TERMINATION_PARAMS and CLOSURE_PARAMS may be left out. The scenarios
+    follow the same block integration and stopping criteria as calculate_crack_growth,
+    but each one drops out of the active set on its own. Returns a dict of arrays with
+    the broadcast shape holding the final state and the reason each scenario stopped.
+    With method="auto" every scenario is evaluated with the closed-form solution.
+    Only the single Walker law and the legacy crack geometry are supported.
+    """
+    if not single_walker(params):
+        raise ValueError("The batch engine supports the single Walker rate law only")
+    if geometry_from_params(params) != "legacy":
+        raise ValueError("The batch engine supports the legacy crack geometry only")
+    max_cycles = MAX_CYCLES if max_cycles is None else max_cycles
+    stress_ratio = 0  # R
+    arrays = np.broadcast_arrays(*(np.asarray(params.get(key, 0.0) if key in TERMINATION_PARAMS + CLOSURE_PARAMS
+                                              else params[key], dtype=float) for key in BATCH_PARAMS))
+    shape = arrays[0].shape
+    (C, n, m, SMF, width, hole_diameter, crack_length_A, crack_length_C, threshold,
+     thickness, yield_strength, plane_stress_fracture_toughness, plane_strain_fracture_toughness, Pxx,
+     alpha, flow_stress) = (array.ravel().copy() for array in arrays)
+    # Closure of all scenarios in one call; at R = 0 it scales delta_K by a constant, i.e. C by its n-th power
+    closed = (alpha > 0) & (flow_stress > 0)
+    if closed.any():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            U = closure_factor(0.0, np.where(closed, SMF / flow_stress, 0.0), np.where(closed, alpha, 1.0))
+        C = np.where(closed, C * U ** n, C)
+    a_final, failure_reason = failure_crack_length(
+        SMF, width, hole_diameter, crack_length_A, crack_length_C, thickness, yield_strength,
+        plane_stress_fracture_toughness, plane_strain_fracture_toughness, Pxx)
+
+    if method == "auto" and np.all(n != 2) and np.all(C > 0) and np.all(SMF > 0):
+        with np.errstate(over="ignore", invalid="ignore"):
+            cycles, stop_reason, C2_value, a_i = closed_form_life(
+                C, n, SMF, width, hole_diameter, crack_length_A, crack_length_C, threshold, max_cycles,
+                a_final, failure_reason)
+            growth = crack_length(cycles, C2_value, a_i, n) - a_i
+        growth = np.where(np.isin(stop_reason, FAILURE_REASONS) & (cycles > 0), a_final - a_i, growth)
+        final_A = crack_length_A + growth
+        final_C = crack_length_C + growth
+        return {
+            "cycles": cycles.reshape(shape),
+            "crack_length_A": final_A.reshape(shape),
+            "crack_length_C": final_C.reshape(shape),
+            "crack_area": (final_A * final_C).reshape(shape),
+            "stop_reason": stop_reason.astype(np.int8).reshape(shape),
+        }
+    if method not in ("auto", "fixed"):
+        raise ValueError(f"Unknown integration method: {method}")
+
+    final_A = crack_length_A.copy()
+    final_C = crack_length_C.copy()
+    final_area = crack_length_A * crack_length_C
+    cycles = np.zeros(C.size)
+    stop_reason = np.full(C.size, STOP_MAX_CYCLES, dtype=np.int8)
+
+    # The working arrays only hold the scenarios that are still growing, all of which have
+    # run the same number of blocks; they are compacted whenever some scenarios stop.
+    # With s = A + C, delta_K = K_factor * sqrt(s) and the block growth is
+    # exp(log_growth_factor + n/2 * log(s)), which avoids two powers per step.
+    final_sum = 2 * a_final
+    # Scenarios whose initial crack is already critical fail at zero cycles
+    failed = crack_length_A + crack_length_C >= final_sum
+    stop_reason[failed] = failure_reason[failed]
+    active = np.flatnonzero(~failed)
+    crack_length_A, crack_length_C, final_sum, failure_reason = (
+        crack_length_A[active], crack_length_C[active], final_sum[active], failure_reason[active])
+    C, n, m, SMF, width, hole_diameter, threshold = (
+        C[active], n[active], m[active], SMF[active], width[active], hole_diameter[active], threshold[active])
+
+    beta = legacy_beta(width, hole_diameter)
+    K_factor = SMF * beta * np.sqrt(np.pi / 2)
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        log_growth_factor = np.log(C * BLOCK_SIZE) + n * np.log(K_factor * (1 - stress_ratio) ** (m - 1))
+        threshold_sum = (threshold / K_factor) ** 2  # delta_K < threshold  <=>  s < threshold_sum
+        half_n = n / 2
+        block_cycles = 0
+        while active.size and block_cycles < max_cycles:
+            crack_length_sum = crack_length_A + crack_length_C
+            crack_growth = np.exp(log_growth_factor + half_n * np.log(crack_length_sum))
+            new_A = crack_length_A + crack_growth / 2
+            new_C = crack_length_C + crack_growth / 2
+            remaining = final_sum - crack_length_sum
+
+            below_threshold = crack_length_sum < threshold_sum
+            too_slow = ~below_threshold & (crack_growth < MIN_CRACK_GROWTH)
+            reaches_critical = ~below_threshold & ~too_slow & (crack_growth >= remaining)
+            stopped = below_threshold | too_slow | reaches_critical
+
+            if stopped.any():
+                stop_reason[active[below_threshold]] = STOP_THRESHOLD
+                stop_reason[active[too_slow]] = STOP_GROWTH_RATE
+                stop_reason[active[reaches_critical]] = failure_reason[reaches_critical]
+                # Record the last accepted state of the scenarios that stopped, then compact
+                final_A[active[stopped]] = crack_length_A[stopped]
+                final_C[active[stopped]] = crack_length_C[stopped]
+                cycles[active[stopped]] = block_cycles
+                # Scenarios reaching the critical size stop at the cycle they do so within the block
+                critical = active[reaches_critical]
+                final_A[critical] += remaining[reaches_critical] / 2
+                final_C[critical] += remaining[reaches_critical] / 2
+                cycles[critical] += BLOCK_SIZE * remaining[reaches_critical] / crack_growth[reaches_critical]
+                final_area[active[stopped]] = final_A[active[stopped]] * final_C[active[stopped]]
+
+                growing = ~stopped
+                active = active[growing]
+                log_growth_factor, half_n, threshold_sum, final_sum, failure_reason = (
+                    log_growth_factor[growing], half_n[growing], threshold_sum[growing],
+                    final_sum[growing], failure_reason[growing])
+                new_A, new_C = new_A[growing], new_C[growing]
+
+            crack_length_A = new_A
+            crack_length_C = new_C
+            block_cycles += BLOCK_SIZE
+
+    # Scenarios still growing when the cycle limit was reached
+    final_A[active] = crack_length_A
+    final_C[active] = crack_length_C
+    final_area[active] = crack_length_A * crack_length_C
+    cycles[active] = block_cycles
 
-    return cycle_counts, crack_lengths_A, crack_lengths_C, crack_areas
+    return {
+        "cycles": cycles.reshape(shape),
+        "crack_length_A": final_A.reshape(shape),
+        "crack_length_C": final_C.reshape(shape),
+        "crack_area": final_area.reshape(shape),
+        "stop_reason": stop_reason.reshape(shape),
+    }
@@ -0,0 +1,18 @@
+import numpy as np
+
+from kernels import crack_growth_rate, crack_length, cycles_to_crack_length  # a(N), da/dN and N(a)
+
+# Closed-form life integral of the Paris/Walker law under constant amplitude loading at R = 0,
+#   da/dN = C * (beta * delta_S * sqrt(pi * a)) ** n
+# with a constant geometry factor beta, as derived in
+# "Airframe Lifing Methodologies Mathematical Analyses/Crack_Growth_Rate_Curve_And_Factors_1.ipynb".
+# All functions accept NumPy arrays and broadcast their arguments. n = 2 is excluded, where the
+# solution is exponential rather than a power law. a(N), da/dN and their inverse are the kernels
+# generated from the symbolic solution in kernels.py.
+
+
+# Function to calculate the integration constant of a ** ((2 - n) / 2)
+def C2(C, beta, delta_S, n):
+    # Separating a ** (-n / 2) da = C * (beta * delta_S * sqrt(pi)) ** n dN gives the factor
+    # (2 - n) / 2; the notebook's (2 - m) / m coincides with it only for m = 4
+    return C * (beta * delta_S * np.sqrt(np.pi)) ** n * (2 - n) / 2
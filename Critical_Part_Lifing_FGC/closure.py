@@ -0,0 +1,93 @@
+"""Crack closure from Newman's crack opening stress under constant amplitude loading.
+
+The crack opening stress So is given relative to the maximum stress as a polynomial in
+R whose coefficients A0..A3 depend on the constraint factor alpha (1 for plane stress,
+3 for plane strain) and on Smax / sigma_0, the maximum stress over the flow stress:
+
+    So / Smax = max(R, A0 + A1 R + A2 R^2 + A3 R^3)    for R >= 0
+    So / Smax = A0 + A1 R                              for R < 0
+
+Only the part of the cycle above So drives growth, so the effective range is
+delta_K_eff = U delta_K with U = (1 - So / Smax) / (1 - R).
+
+All functions take scalars or arrays, so a whole spectrum or a batch of scenarios is
+handled in one call. The coefficients are memoized per (alpha, Smax / sigma_0) pair.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+COEFFICIENT_CACHE_SIZE = 4096  # Most (alpha, Smax / sigma_0) pairs looked up in the memo at once
+
+
+# Define the coefficients functions
+def calculate_A0(Smax_sigma_0, alpha):
+    return (0.825 - 0.34 * alpha + 0.05 * alpha**2) * (np.cos(np.pi * Smax_sigma_0 / 2))**(1 / alpha)
+
+
+def calculate_A1(Smax_sigma_0, alpha):
+    return (0.415 - 0.071 * alpha) * (Smax_sigma_0)
+
+
+def calculate_A2(A0, A1, A3):
+    return 1 - A0 - A1 - A3
+
+
+def calculate_A3(A0, A1):
+    return 2 * A0 + A1 - 1
+
+
+# Function to compute A0..A3 for arrays of Smax / sigma_0 and alpha
+def _coefficients(Smax_sigma_0, alpha):
+    A0 = calculate_A0(Smax_sigma_0, alpha)
+    A1 = calculate_A1(Smax_sigma_0, alpha)
+    A3 = calculate_A3(A0, A1)
+    A2 = calculate_A2(A0, A1, A3)
+    return A0, A1, A2, A3
+
+
+@lru_cache(maxsize=COEFFICIENT_CACHE_SIZE)
+def closure_coefficients(alpha, Smax_sigma_0):
+    """Return (A0, A1, A2, A3) for one constraint factor and Smax / sigma_0 (memoized)."""
+    return tuple(float(A) for A in _coefficients(Smax_sigma_0, alpha))
+
+
+def coefficients(Smax_sigma_0, alpha):
+    """Return A0..A3 as arrays of the broadcast shape of Smax / sigma_0 and alpha.
+
+    Smax / sigma_0 is limited to [0, 1]. Each distinct (alpha, Smax / sigma_0) pair is
+    looked up in the memo; when there are more distinct pairs than the memo holds the
+    coefficients are computed directly instead.
+    """
+    Smax_sigma_0, alpha = np.broadcast_arrays(np.clip(np.asarray(Smax_sigma_0, dtype=float), 0, 1),
+                                              np.asarray(alpha, dtype=float))
+    # Each pair as one complex number, so the distinct pairs are found with a single flat sort
+    pairs, inverse = np.unique(alpha.ravel() + 1j * Smax_sigma_0.ravel(), return_inverse=True)
+    if len(pairs) > COEFFICIENT_CACHE_SIZE:
+        return _coefficients(Smax_sigma_0, alpha)
+    table = np.array([closure_coefficients(pair.real, pair.imag) for pair in pairs.tolist()]).reshape(-1, 4)
+    return tuple(table[inverse.ravel(), i].reshape(alpha.shape) for i in range(4))
+
+
+# Define the normalized crack opening stress function
+def normalized_crack_opening_stress(R, Smax_sigma_0, alpha):
+    A0, A1, A2, A3 = coefficients(Smax_sigma_0, alpha)
+    R = np.asarray(R, dtype=float)
+
+    So_Smax = np.where(
+        R >= 0,
+        np.maximum(R, A0 + A1 * R + A2 * R**2 + A3 * R**3),
+        A0 + A1 * R
+    )
+    return So_Smax
+
+
+# Function to compute U = delta_K_eff / delta_K
+def closure_factor(R, Smax_sigma_0, alpha):
+    R = np.asarray(R, dtype=float)
+    return (1 - normalized_crack_opening_stress(R, Smax_sigma_0, alpha)) / (1 - R)
+
+
+def effective_delta_K(delta_K, R, Smax_sigma_0, alpha):
+    """Return the closure-corrected stress intensity range delta_K_eff = U delta_K."""
+    return closure_factor(R, Smax_sigma_0, alpha) * np.asarray(delta_K, dtype=float)
@@ -0,0 +1,44 @@
+import numpy as np
+
+
+# Function to pick the points of a long series that a line plot of the given width actually shows
+def min_max_indices(x, y, bins):
+    """Return the sorted indices of the points to draw for ``y`` over the sorted ``x`` at ``bins`` pixels wide.
+
+    The x range is split into ``bins`` equal intervals (one per pixel column), and the first,
+    last, lowest and highest point of each non-empty interval are kept, so the line through
+    them covers the same pixels as the line through every point, however unevenly the points
+    are spaced. Short series are returned whole.
+    """
+    size = np.size(y)
+    if size <= 4 * bins:
+        return np.arange(size)
+    x, y = np.asarray(x), np.asarray(y)
+    edges = np.linspace(x[0], x[-1], bins + 1)
+    bounds = np.searchsorted(x, edges[1:-1])
+    starts, stops = np.concatenate(([0], bounds)), np.concatenate((bounds, [size]))
+    filled = stops > starts
+    starts, stops = starts[filled], stops[filled]
+    # Per interval the first point equal to its minimum and to its maximum
+    interval = np.repeat(np.arange(starts.size), stops - starts)
+    lowest = np.flatnonzero(y == np.minimum.reduceat(y, starts)[interval])
+    highest = np.flatnonzero(y == np.maximum.reduceat(y, starts)[interval])
+    lowest = lowest[np.unique(interval[lowest], return_index=True)[1]]
+    highest = highest[np.unique(interval[highest], return_index=True)[1]]
+    return np.unique(np.concatenate((starts, stops - 1, lowest, highest)))
+
+
+def decimate(x, ys, x_min, x_max, bins):
+    """Reduce the series ``ys`` over the sorted ``x`` to the visible range [x_min, x_max].
+
+    One point either side of the range is kept so lines run to the edges of the axes.
+    Returns a list of (x, y) arrays, one per series, of at most about 4 * bins points.
+    """
+    start = max(int(np.searchsorted(x, x_min)) - 1, 0)
+    stop = min(int(np.searchsorted(x, x_max, side="right")) + 1, np.size(x))
+    visible_x = x[start:stop]
+    decimated = []
+    for y in ys:
+        index = min_max_indices(visible_x, y[start:stop], bins)
+        decimated.append((visible_x[index], y[start:stop][index]))
+    return decimated
@@ -0,0 +1,143 @@
+import numpy as np
+
+# One stored point of a crack growth history
+HISTORY_DTYPE = np.dtype([("cycles", "f8"), ("crack_length_A", "f8"), ("crack_length_C", "f8"), ("crack_area", "f8")])
+
+INITIAL_CAPACITY = 1024  # Points allocated before the buffer first grows
+PENDING_POINTS = 1024  # Appended points collected before they are copied into the buffer in one go
+
+
+class CrackHistory:
+    """Crack growth history kept in a growable structured NumPy array (HISTORY_DTYPE).
+
+    Points are offered with ``append`` (or ``extend`` for arrays) as the crack grows and
+    stored according to the output policy: every point by default, every ``every``-th
+    point, the first point after each ``growth`` increment of the mean crack length, or
+    with ``endpoints`` only the first point and the final state. ``finish`` stores the
+    final state whatever the policy. Iterating yields the cycles, crack length A, crack
+    length C and crack area columns, so a history unpacks like four separate histories::
+
+        cycle_counts, crack_lengths_A, crack_lengths_C, crack_areas = history
+    """
+
+    def __init__(self, every=1, growth=None, endpoints=False, capacity=INITIAL_CAPACITY):
+        if sum((every != 1, growth is not None, bool(endpoints))) > 1:
+            raise ValueError("Choose one output policy: every, growth or endpoints")
+        if int(every) < 1 or (growth is not None and not growth > 0):
+            raise ValueError("every must be at least 1 and growth must be positive")
+        self.every = int(every)
+        self.growth = growth
+        self.endpoints = bool(endpoints)
+        self.offered = 0  # Points offered so far, stored or not
+        self.stop_reason = None  # Why the calculation stopped (calculations.STOP_*), set by the engine
+        self._keep_all = self.every == 1 and growth is None and not endpoints
+        self._buffer = np.empty(2 if endpoints else max(int(capacity), 2), dtype=HISTORY_DTYPE)
+        self._size = 0
+        self._pending = []  # Appended points not yet in the buffer; one list append is cheaper than a row assignment
+        self._skipped = None  # Latest point not stored, kept for finish()
+        self._initial_length = 0.0
+        self._growth_level = 0
+
+    @property
+    def records(self):
+        self._flush()
+        return self._buffer[:self._size]
+
+    @property
+    def size(self):
+        return self._size + len(self._pending)
+
+    @property
+    def cycle_counts(self):
+        return self.records["cycles"]
+
+    @property
+    def crack_lengths_A(self):
+        return self.records["crack_length_A"]
+
+    @property
+    def crack_lengths_C(self):
+        return self.records["crack_length_C"]
+
+    @property
+    def crack_areas(self):
+        return self.records["crack_area"]
+
+    def __iter__(self):
+        return iter((self.cycle_counts, self.crack_lengths_A, self.crack_lengths_C, self.crack_areas))
+
+    def append(self, cycles, crack_length_A, crack_length_C, crack_area):
+        point = (cycles, crack_length_A, crack_length_C, crack_area)
+        self.offered += 1
+        if self.offered == 1:
+            self._initial_length = (crack_length_A + crack_length_C) / 2
+        elif not self._keep_all and not self._keep(crack_length_A, crack_length_C):
+            self._skipped = point
+            return
+        self._pending.append(point)
+        self._skipped = None
+        if len(self._pending) >= PENDING_POINTS:
+            self._flush()
+
+    def _keep(self, crack_length_A, crack_length_C):
+        if self.endpoints:
+            return False
+        if self.growth is not None:
+            level = int(((crack_length_A + crack_length_C) / 2 - self._initial_length) // self.growth)
+            if level > self._growth_level:
+                self._growth_level = level
+                return True
+            return False
+        return (self.offered - 1) % self.every == 0
+
+    def extend(self, cycles, crack_lengths_A, crack_lengths_C, crack_areas):
+        # Vectorized append of many points, with the same policy
+        count = np.size(cycles)
+        if not count:
+            return
+        self._flush()
+        index = self.offered + np.arange(count)
+        if self.offered == 0:
+            self._initial_length = (crack_lengths_A[0] + crack_lengths_C[0]) / 2
+        if self.endpoints:
+            keep = index == 0
+        elif self.growth is not None:
+            mean_growth = (np.asarray(crack_lengths_A) + np.asarray(crack_lengths_C)) / 2 - self._initial_length
+            levels = np.floor(mean_growth / self.growth).astype(np.int64)
+            previous = np.maximum.accumulate(np.r_[self._growth_level, levels[:-1]])
+            keep = (levels > previous) | (index == 0)
+            self._growth_level = max(self._growth_level, int(levels.max()))
+        else:
+            keep = index % self.every == 0
+        self.offered += count
+
+        stored = int(keep.sum())
+        self._reserve(stored)
+        block = self._buffer[self._size:self._size + stored]
+        for name, values in zip(HISTORY_DTYPE.names, (cycles, crack_lengths_A, crack_lengths_C, crack_areas)):
+            block[name] = np.asarray(values)[keep]
+        self._size += stored
+        self._skipped = None if keep[-1] else (cycles[-1], crack_lengths_A[-1], crack_lengths_C[-1], crack_areas[-1])
+
+    def finish(self):
+        # Store the final state if the policy skipped it and release the unused capacity; returns the history
+        if self._skipped is not None:
+            self._pending.append(self._skipped)
+            self._skipped = None
+        self._flush()
+        if self._buffer.size > self._size:
+            self._buffer = self._buffer[:self._size].copy()
+        return self
+
+    def _flush(self):
+        if self._pending:
+            self._reserve(len(self._pending))
+            self._buffer[self._size:self._size + len(self._pending)] = self._pending
+            self._size += len(self._pending)
+            self._pending.clear()
+
+    def _reserve(self, count):
+        if self._size + count > self._buffer.size:
+            buffer = np.empty(max(2 * self._buffer.size, self._size + count), dtype=HISTORY_DTYPE)
+            buffer[:self._size] = self._buffer[:self._size]
+            self._buffer = buffer
@@ -1,7 +1,10 @@
 import customtkinter as ctk
 
 import customtkinter as ctk
-from tkinter import LEFT
+from tkinter import LEFT, filedialog
+
+from geometry import GEOMETRIES
+from retardation import RETARDATION_MODELS
 
 class DimensionsInputTab:
     def __init__(self, parent, app):
@@ -31,7 +34,14 @@ class DimensionsInputTab:
             entry.grid(row=i+1, column=1, padx=10, pady=5, sticky="w")
             self.entries[key] = entry
 
-        self.create_navigation_buttons(len(labels) + 1)
+        # Crack geometry; "legacy" keeps the original mean-crack beta
+        geometry_label = ctk.CTkLabel(self.parent, text="Crack Geometry")
+        geometry_label.grid(row=len(labels) + 1, column=0, padx=10, pady=5, sticky="e")
+        self.geometry = ctk.StringVar(value=GEOMETRIES[0])
+        geometry_menu = ctk.CTkOptionMenu(self.parent, variable=self.geometry, values=list(GEOMETRIES), fg_color="#2E3092")
+        geometry_menu.grid(row=len(labels) + 1, column=1, padx=10, pady=5, sticky="w")
+
+        self.create_navigation_buttons(len(labels) + 2)
 
     def create_navigation_buttons(self, row):
         self.clear_button = ctk.CTkButton(self.parent, text="Clear", command=self.clear, fg_color="#2E3092")
@@ -43,15 +53,20 @@ class DimensionsInputTab:
     def clear(self):
         for entry in self.entries.values():
             entry.delete(0, ctk.END)
+        self.geometry.set(GEOMETRIES[0])
 
     def get_params(self):
-        return {key: float(entry.get()) for key, entry in self.entries.items()}
+        params = {key: float(entry.get()) for key, entry in self.entries.items()}
+        params["geometry"] = self.geometry.get()
+        return params
 
     def set_params(self, params):
         for key, entry in self.entries.items():
             if key in params:
                 entry.delete(0, ctk.END)
                 entry.insert(0, float(params[key]))
+        if params.get("geometry") in GEOMETRIES:
+            self.geometry.set(params["geometry"])
 
 
 class SpectrumInputTab:
@@ -87,7 +102,29 @@ class SpectrumInputTab:
             entry.grid(row=i + 1, column=1, padx=10, pady=5, sticky="w")
             self.entries[key] = entry
 
-        self.create_navigation_buttons(len(labels) + 1)
+        # Spectrum file; leave blank for constant amplitude loading at SMF
+        row = len(labels) + 1
+        label = ctk.CTkLabel(self.parent, text="Spectrum File (blank for constant amplitude)")
+        label.grid(row=row, column=0, padx=10, pady=5, sticky="e")
+        self.spectrum_file_entry = ctk.CTkEntry(self.parent)
+        self.spectrum_file_entry.grid(row=row, column=1, padx=10, pady=5, sticky="w")
+        self.browse_button = ctk.CTkButton(self.parent, text="Browse", command=self.browse_spectrum_file, fg_color="#2E3092")
+        self.browse_button.grid(row=row, column=2, padx=10, pady=5, sticky="w")
+
+        # Load interaction model of spectrum runs
+        label = ctk.CTkLabel(self.parent, text="Retardation Model")
+        label.grid(row=row + 1, column=0, padx=10, pady=5, sticky="e")
+        self.retardation = ctk.StringVar(value=RETARDATION_MODELS[0])
+        retardation_menu = ctk.CTkOptionMenu(self.parent, variable=self.retardation, values=list(RETARDATION_MODELS), fg_color="#2E3092")
+        retardation_menu.grid(row=row + 1, column=1, padx=10, pady=5, sticky="w")
+
+        self.create_navigation_buttons(row + 2)
+
+    def browse_spectrum_file(self):
+        file_path = filedialog.askopenfilename(filetypes=[("Spectrum files", "*.txt *.dat *.sp *.npy *.bin"), ("All files", "*.*")])
+        if file_path:
+            self.spectrum_file_entry.delete(0, ctk.END)
+            self.spectrum_file_entry.insert(0, file_path)
 
     def create_navigation_buttons(self, row):
         self.previous_button = ctk.CTkButton(self.parent, text="Previous", command=lambda: self.app.show_tab("Dimensions"), fg_color="#2E3092")
@@ -102,15 +139,25 @@ class SpectrumInputTab:
     def clear(self):
         for entry in self.entries.values():
             entry.delete(0, ctk.END)
+        self.spectrum_file_entry.delete(0, ctk.END)
+        self.retardation.set(RETARDATION_MODELS[0])
 
     def get_params(self):
-        return {key: float(entry.get()) for key, entry in self.entries.items()}
+        params = {key: float(entry.get()) for key, entry in self.entries.items()}
+        params["spectrum_file"] = self.spectrum_file_entry.get()
+        params["retardation"] = self.retardation.get()
+        return params
 
     def set_params(self, params):
         for key, entry in self.entries.items():
             if key in params:
                 entry.delete(0, ctk.END)
                 entry.insert(0, float(params[key]))
+        if "spectrum_file" in params:
+            self.spectrum_file_entry.delete(0, ctk.END)
+            self.spectrum_file_entry.insert(0, params["spectrum_file"])
+        if params.get("retardation") in RETARDATION_MODELS:
+            self.retardation.set(params["retardation"])
 
 
 class WalkerEquationInputTab:
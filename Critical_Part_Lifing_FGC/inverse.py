@@ -0,0 +1,212 @@
+"""Inverse questions on the crack growth engine: which input gives a required life.
+
+``solve_for_life`` finds the value of one input at which the life to failure equals a
+target, by Brent's method (or bisection) on top of calculate_crack_growth. It is the basis
+of ``initial_flaw_for_life`` and ``smf_for_life``. Runs that do not fail (threshold, growth
+rate or cycle limit) count as run-outs at the cycle limit, which keeps life monotonic
+in the input.
+
+Every forward run goes through a ``ForwardCache`` keyed by the parameters rounded to a
+number of significant digits, so repeated and neighbouring queries reuse earlier runs.
+
+``CrackCurve`` holds a precomputed a(N) curve. Inspection intervals (the cycles from a
+detectable crack to the critical crack, divided by a scatter factor of 2 for half-life)
+are then read off it by interpolation in milliseconds.
+
+    python inverse.py input.json --life 200000                  # initial flaw for the life
+    python inverse.py input.json --life 200000 --solve SMF
+    python inverse.py input.json --inspect 0.05 0.1             # inspection intervals
+"""
+import argparse
+import json
+from collections import OrderedDict
+
+import numpy as np
+from scipy.optimize import bisect, brentq
+
+from calculations import (ADAPTIVE_MAX_CYCLES, FAILURE_REASONS, STOP_MAX_CYCLES, STOP_REASON_NAMES, calculate_crack_growth,
+                          convert_params)
+
+CACHE_ENTRIES = 256  # Forward runs kept by a ForwardCache
+KEY_DIGITS = 10  # Significant digits of the parameter values in the cache key
+INSPECTION_FACTOR = 2.0  # Scatter factor of inspection intervals (half the detectable-to-critical life)
+DEFAULT_MAX_CYCLES = ADAPTIVE_MAX_CYCLES  # Cycle limit of forward runs without one; far beyond practical lives
+
+
+# Function to round a parameter value for the cache key
+def _rounded(value, digits):
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(_rounded(item, digits) for item in value)
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+        return float(f"{float(value):.{digits}g}")
+    return value
+
+
+class ForwardCache:
+    """Memoized forward runs of calculate_crack_growth, least recently used first out."""
+
+    def __init__(self, max_entries=CACHE_ENTRIES, digits=KEY_DIGITS):
+        self.max_entries = max_entries
+        self.digits = digits
+        self.hits = 0
+        self.misses = 0
+        self._runs = OrderedDict()
+
+    def key(self, params, method="auto", max_cycles=None, output=None):
+        return (tuple(sorted((name, _rounded(value, self.digits)) for name, value in params.items())),
+                method, max_cycles, tuple(sorted((output or {}).items())))
+
+    def run(self, params, method="auto", max_cycles=None, output=None):
+        key = self.key(params, method, max_cycles, output)
+        if key in self._runs:
+            self.hits += 1
+            self._runs.move_to_end(key)
+            return self._runs[key]
+        self.misses += 1
+        history = calculate_crack_growth(params, method=method, max_cycles=max_cycles, output=output)
+        self._runs[key] = history
+        if len(self._runs) > self.max_entries:
+            self._runs.popitem(last=False)
+        return history
+
+    def clear(self):
+        self._runs.clear()
+        self.hits = self.misses = 0
+
+
+FORWARD_CACHE = ForwardCache()
+
+
+# Function to compute the life to failure, or max_cycles for a run-out
+def life(params, max_cycles=None, cache=None):
+    max_cycles = DEFAULT_MAX_CYCLES if max_cycles is None else max_cycles
+    history = (cache or FORWARD_CACHE).run(params, max_cycles=max_cycles, output={"endpoints": True})
+    return float(history.cycle_counts[-1]) if history.stop_reason in FAILURE_REASONS else float(max_cycles)
+
+
+# Function to set one input; "initial_crack_length" scales A and C together, keeping A / C
+def _with_value(params, key, value):
+    if key == "initial_crack_length":
+        ratio = float(params["initial_crack_length_C"]) / float(params["initial_crack_length_A"])
+        return dict(params, initial_crack_length_A=value, initial_crack_length_C=value * ratio)
+    return dict(params, **{key: value})
+
+
+def solve_for_life(params, key, target_life, bracket, method="brent", rtol=1e-6, max_cycles=None, cache=None):
+    """Return the value of ``key`` in ``bracket`` at which the life equals ``target_life``.
+
+    The search runs on the logarithm of the input (the bracket must be positive), with
+    forward runs capped at twice the target unless max_cycles is given. Returns a dict
+    with the value, the life it gives, the forward runs the search asked for and how
+    many of them the cache answered.
+    """
+    max_cycles = 2 * target_life if max_cycles is None else max_cycles
+    cache = cache or FORWARD_CACHE
+    hits, misses = cache.hits, cache.misses
+
+    def residual(log_value):
+        return np.log(max(life(_with_value(params, key, float(np.exp(log_value))), max_cycles, cache), 1.0)) - np.log(target_life)
+
+    low, high = np.log(bracket[0]), np.log(bracket[1])
+    if residual(low) * residual(high) > 0:
+        raise ValueError(f"The life does not cross {target_life:g} cycles for {key} in [{bracket[0]:g}, {bracket[1]:g}]")
+    if method == "brent":
+        root = brentq(residual, low, high, xtol=rtol, rtol=4 * np.finfo(float).eps)
+    elif method == "bisect":
+        root = bisect(residual, low, high, xtol=rtol)
+    else:
+        raise ValueError(f"Unknown root finding method: {method}")
+
+    value = float(np.exp(root))
+    return {
+        "key": key,
+        "value": value,
+        "life": life(_with_value(params, key, value), max_cycles, cache),
+        "runs": cache.hits + cache.misses - hits - misses,
+        "cached": cache.hits - hits,
+    }
+
+
+# Function to find the initial flaw size (crack length A, with C in proportion) that gives the target life
+def initial_flaw_for_life(params, target_life, bracket=None, **kwargs):
+    ligament = (float(params["width"]) - float(params["hole_diameter"])) / 2
+    return solve_for_life(params, "initial_crack_length", target_life, bracket or (1e-5, ligament), **kwargs)
+
+
+# Function to find the stress multiplication factor that gives the target life
+def smf_for_life(params, target_life, bracket=None, **kwargs):
+    SMF = float(params["SMF"])
+    return solve_for_life(params, "SMF", target_life, bracket or (SMF / 100, SMF * 100), **kwargs)
+
+
+class CrackCurve:
+    """A precomputed a(N) curve: the mean crack length (or one tip) against cycles.
+
+    Built from a CrackHistory or from arrays of cycles and crack lengths. ``failed``
+    tells whether the curve ends at the critical crack size.
+    """
+
+    def __init__(self, cycle_counts, crack_lengths, failed=True):
+        self.cycle_counts = np.asarray(cycle_counts, dtype=float)
+        # Crack lengths never shrink; the running maximum keeps the inverse interpolation well defined
+        self.crack_lengths = np.maximum.accumulate(np.asarray(crack_lengths, dtype=float))
+        self.failed = failed
+
+    @classmethod
+    def from_history(cls, history, tip="mean"):
+        lengths = {"A": history.crack_lengths_A, "C": history.crack_lengths_C,
+                   "mean": (history.crack_lengths_A + history.crack_lengths_C) / 2}[tip]
+        return cls(history.cycle_counts, lengths, failed=history.stop_reason in FAILURE_REASONS)
+
+    @classmethod
+    def from_params(cls, params, tip="mean", max_cycles=None, cache=None):
+        max_cycles = DEFAULT_MAX_CYCLES if max_cycles is None else max_cycles
+        return cls.from_history((cache or FORWARD_CACHE).run(params, max_cycles=max_cycles), tip)
+
+    def crack_length_at(self, cycles):
+        return np.interp(cycles, self.cycle_counts, self.crack_lengths)
+
+    def cycles_at(self, crack_length):
+        return np.interp(crack_length, self.crack_lengths, self.cycle_counts)
+
+    @property
+    def critical_crack_length(self):
+        return float(self.crack_lengths[-1])
+
+    def inspection_interval(self, detectable_crack_length, factor=INSPECTION_FACTOR):
+        """Return the cycles from the detectable crack length(s) to failure, divided by ``factor``."""
+        if not self.failed:
+            raise ValueError("The curve does not reach the critical crack size")
+        return (self.cycle_counts[-1] - self.cycles_at(detectable_crack_length)) / factor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inverse crack growth questions")
+    parser.add_argument("input", help="JSON file saved with Export Data")
+    parser.add_argument("--life", type=float, help="Required life in cycles")
+    parser.add_argument("--solve", default="initial_flaw", choices=["initial_flaw", "SMF"], help="Input to solve for")
+    parser.add_argument("--inspect", type=float, nargs="+", help="Detectable crack lengths for inspection intervals")
+    parser.add_argument("--factor", type=float, default=INSPECTION_FACTOR, help="Scatter factor of the inspection interval")
+    parser.add_argument("--max-cycles", type=float, default=None,
+                        help=f"Cycle limit of the forward runs (default {DEFAULT_MAX_CYCLES:g}, twice --life when solving)")
+    args = parser.parse_args()
+
+    with open(args.input, 'r') as file:
+        params = convert_params({key: value for key, value in json.load(file).items() if key != "material_name"})
+
+    if args.life:
+        solver = initial_flaw_for_life if args.solve == "initial_flaw" else smf_for_life
+        result = solver(params, args.life, max_cycles=args.max_cycles)
+        print(f"{result['key']} = {result['value']:.6g} gives {result['life']:.1f} cycles "
+              f"({result['runs']} forward runs, {result['cached']} from the cache)")
+    if args.inspect:
+        curve = CrackCurve.from_params(params, max_cycles=args.max_cycles)
+        if not curve.failed:
+            history = FORWARD_CACHE.run(params, max_cycles=args.max_cycles or DEFAULT_MAX_CYCLES)
+            if history.stop_reason == STOP_MAX_CYCLES:
+                parser.error(f"The run reached the cycle limit of {history.cycle_counts[-1]:.0f} cycles before failure; "
+                             f"raise --max-cycles")
+            parser.error(f"The run stopped on {STOP_REASON_NAMES[history.stop_reason]} before failure")
+        for length, interval in zip(args.inspect, curve.inspection_interval(args.inspect, args.factor)):
+            print(f"Detectable crack {length:g} in: inspect every {interval:.1f} cycles "
+                  f"(critical crack {curve.critical_crack_length:.4g} in)")
@@ -0,0 +1,114 @@
+"""NumPy kernels of the closed-form crack growth solution, generated with sympy and cached on disk.
+
+The crack length after N cycles is the symbolic expression of
+"Airframe Lifing Methodologies Mathematical Analyses/Crack_Growth_Rate_Curve_And_Factors_2.ipynb",
+
+    a(N) = (a_i^((2 - n) / 2) + C2 N)^(2 / (2 - n))
+
+and da/dN is its derivative with respect to N. Instead of calling sp.lambdify on every
+use, each kernel is printed to NumPy source once and written to the kernel cache
+(``~/.cache/fgc_kernels``, override with ``FGC_KERNEL_CACHE``). The file name holds a hash
+of the expression text, so later imports compile the cached source without importing
+sympy, and a changed expression gets a file of its own. The first line of a cached file
+holds the SHA-256 digest of the source below it; a file that does not match is generated
+again instead of executed. The kernels broadcast their arguments, so whole arrays of N
+(or of scenarios) are evaluated in one call.
+
+A cold cache needs sympy. This module is imported by every engine, including the
+headless batch.py and study.py runners, so on machines without sympy fill the cache
+once where sympy is installed (``python -c "import kernels"``) and point
+``FGC_KERNEL_CACHE`` at it.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+KERNEL_CACHE = os.environ.get("FGC_KERNEL_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "fgc_kernels"))
+KERNEL_VERSION = 1  # Part of every expression hash; raise it when the code generation changes
+
+CRACK_LENGTH = "(a_i**((2 - n)/2) + C2*N)**(2/(2 - n))"
+
+# Kernel name: (arguments, expression, variable to differentiate by or None)
+KERNELS = {
+    "crack_length": (("N", "C2", "a_i", "n"), CRACK_LENGTH, None),
+    "crack_growth_rate": (("N", "C2", "a_i", "n"), CRACK_LENGTH, "N"),
+    "cycles_to_crack_length": (("a_c", "C2", "a_i", "n"), "(a_c**((2 - n)/2) - a_i**((2 - n)/2))/C2", None),
+}
+
+
+def expression_hash(name):
+    arguments, expression, variable = KERNELS[name]
+    text = json.dumps([KERNEL_VERSION, name, arguments, expression, variable])
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+# Function to derive a kernel with sympy and print it as the source of a NumPy function
+def generate_source(name):
+    import sympy as sp
+    from sympy.printing.numpy import NumPyPrinter
+
+    arguments, expression, variable = KERNELS[name]
+    symbols = {argument: sp.Symbol(argument, real=True) for argument in arguments}
+    expr = sp.sympify(expression, locals=symbols)
+    if variable:
+        expr = sp.powsimp(sp.diff(expr, symbols[variable]))
+    return (f"# Generated from {expression!r}{f' (d/d{variable})' if variable else ''}; "
+            f"do not edit\n"
+            f"def {name}({', '.join(arguments)}):\n"
+            f"    return {NumPyPrinter().doprint(expr)}\n")
+
+
+# Function to prefix kernel source with the digest checked before it is compiled
+def _with_digest(source):
+    return f"# sha256: {hashlib.sha256(source.encode()).hexdigest()}\n{source}"
+
+
+# Function to return the source of a cached kernel file, or None if it does not match its digest
+def _verified_source(text):
+    header, _, source = text.partition("\n")
+    return source if header == f"# sha256: {hashlib.sha256(source.encode()).hexdigest()}" else None
+
+
+# Function to compile kernel source into a function
+def _compile(name, source, filename):
+    namespace = {"numpy": np}
+    exec(compile(source, filename, "exec"), namespace)
+    return namespace[name]
+
+
+def load_kernel(name, cache_dir=KERNEL_CACHE):
+    """Return the kernel from the cache, generating and caching its source on the first use.
+
+    A cached file whose digest does not match its source is replaced. If the cache cannot be
+    written the generated source is compiled in memory.
+    """
+    path = os.path.join(cache_dir, f"{name}_{expression_hash(name)}.py")
+    try:
+        with open(path, 'r') as file:
+            source = _verified_source(file.read())
+        if source is not None:
+            return _compile(name, source, path)
+    except OSError:
+        pass
+
+    try:
+        source = generate_source(name)
+    except ImportError as error:
+        raise ImportError(f"sympy is needed to generate the {name} kernel, which is not in the kernel cache "
+                          f"{cache_dir} (set FGC_KERNEL_CACHE to a filled cache)") from error
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w') as file:
+            file.write(_with_digest(source))
+        os.replace(temporary, path)  # Atomic, so another process never reads half a file
+    except OSError:
+        path = f"<kernel {name}>"
+    return _compile(name, source, path)
+
+
+crack_length = load_kernel("crack_length")  # a(N)
+crack_growth_rate = load_kernel("crack_growth_rate")  # da/dN at N cycles
+cycles_to_crack_length = load_kernel("cycles_to_crack_length")  # N at which a(N) = a_c, the inverse of a(N)
@@ -0,0 +1,192 @@
+"""Probabilistic lifing: life distributions from scattered crack growth inputs.
+
+Inputs such as the initial flaw sizes, C, n and SMF are drawn from distributions given as
+``[name, *arguments]``, e.g.::
+
+    {
+        "initial_crack_length_A": ["lognormal", -6.9, 0.4],
+        "initial_crack_length_C": ["lognormal", -6.9, 0.4],
+        "C": ["lognormal", -23.66, 0.2],
+        "n": ["normal", 3.87, 0.05],
+        "SMF": ["uniform", 45, 55]
+    }
+
+``normal`` takes (mean, standard deviation), ``lognormal`` the mean and standard deviation
+of the logarithm (as ``numpy.random.Generator.lognormal``) and ``uniform`` (low, high).
+Samples are drawn in batches ("replicates") of Latin hypercube, scrambled Sobol or plain
+random points. With importance sampling a pilot batch fits log(life) against the standard
+normal inputs, and later batches are shifted along the fitted direction of shorter life
+to the reliability index of the lowest percentile. The B-lives are weighted quantiles of
+all batches; their confidence intervals map the between-batch standard error of the
+CDF estimate back onto life (Woodruff intervals).
+Sampling stops once the lowest percentile is known to the target relative accuracy, from at
+least MIN_REPLICATES batches and MIN_TAIL_SAMPLES samples at or below it.
+
+    python probabilistic.py spec.json          # spec: {"base": {...}, "distributions": {...}}
+    python probabilistic.py spec.json --compare
+"""
+import argparse
+import json
+
+import numpy as np
+from scipy import stats
+from scipy.special import ndtr, ndtri
+from scipy.stats import qmc
+
+from calculations import (ADAPTIVE_MAX_CYCLES, FAILURE_REASONS, calculate_crack_growth_batch,
+                          convert_params)
+
+# Percentiles reported by default: B-x life is the life by which x% of the fleet has failed
+B_LIVES = {"B0.1": 0.001, "B1": 0.01, "B10": 0.1}
+MIN_REPLICATES = 10  # Fewest batches behind a confidence interval; fewer give too noisy a between-batch spread
+MIN_TAIL_SAMPLES = 100  # Fewest samples at or below the lowest percentile before the sampling may stop
+
+
+# Function to map standard normal variables onto an input distribution
+def transform(distribution, z):
+    name, *arguments = distribution
+    if name == "normal":
+        mean, standard_deviation = arguments
+        return mean + standard_deviation * z
+    if name == "lognormal":
+        mean, sigma = arguments
+        return np.exp(mean + sigma * z)
+    if name == "uniform":
+        low, high = arguments
+        return low + (high - low) * ndtr(z)
+    raise ValueError(f"Unknown distribution: {name}")
+
+
+# Function to draw points in the unit hypercube
+def sample_unit(sampling, size, dimensions, rng):
+    if sampling == "random":
+        return rng.random((size, dimensions))
+    if sampling == "lhs":
+        strata = rng.permuted(np.tile(np.arange(size), (dimensions, 1)), axis=1).T
+        return (strata + rng.random((size, dimensions))) / size
+    if sampling == "sobol":
+        return qmc.Sobol(dimensions, scramble=True, seed=rng).random_base2(int(np.ceil(np.log2(size))))
+    raise ValueError(f"Unknown sampling method: {sampling}")
+
+
+# Function to run the crack growth engine for standard normal inputs z (one row per sample)
+def simulate_lives(base, distributions, z, max_cycles=ADAPTIVE_MAX_CYCLES):
+    params = dict(base)
+    for column, (key, distribution) in enumerate(distributions.items()):
+        params[key] = transform(distribution, z[:, column])
+    results = calculate_crack_growth_batch(params, max_cycles=max_cycles)
+    # Only scenarios that reached the critical crack size failed; the others are run-outs
+    return np.where(np.isin(results["stop_reason"], FAILURE_REASONS), results["cycles"], np.inf)
+
+
+# Function to estimate quantiles from importance weighted samples; the CDF at each value is
+# the mean of weight * (life <= value), which is unbiased for the exact likelihood ratio weights
+def weighted_quantiles(values, weights, probabilities):
+    order = np.argsort(values)
+    cumulative = np.cumsum(weights[order]) / values.size
+    index = np.minimum(np.searchsorted(cumulative, probabilities), values.size - 1)
+    return values[order][index]
+
+
+# Function to find the importance sampling shift from a pilot sample
+def design_point_shift(z, lives, probability):
+    finite = np.isfinite(lives) & (lives > 0)
+    if finite.sum() <= z.shape[1] + 1:
+        return np.zeros(z.shape[1])
+    # Linear fit of log(life) in standard normal space; shorter lives lie against its gradient
+    design = np.column_stack((np.ones(finite.sum()), z[finite]))
+    gradient = np.linalg.lstsq(design, np.log(lives[finite]), rcond=None)[0][1:]
+    norm = np.linalg.norm(gradient)
+    if norm == 0:
+        return np.zeros(z.shape[1])
+    return gradient / norm * ndtri(probability)
+
+
+def run_probabilistic(base_params, distributions, probabilities=None, sampling="sobol", importance=True,
+                      batch_size=1024, target_relative_ci=0.05, confidence=0.95, min_replicates=MIN_REPLICATES,
+                      min_tail_samples=MIN_TAIL_SAMPLES, max_samples=1_000_000, max_cycles=ADAPTIVE_MAX_CYCLES, seed=0):
+    """Estimate B-lives with confidence intervals for scattered inputs.
+
+    Returns a dict with "percentiles" ({name: {"life", "lower", "upper"}}), the number of
+    "samples" and "replicates" used (including the importance sampling pilot) and the
+    "importance_shift" applied to each input in standard normal space.
+    """
+    probabilities = probabilities or B_LIVES
+    names = list(probabilities)
+    levels = np.array([probabilities[name] for name in names])
+    tail = int(np.argmin(levels))
+    base = convert_params(base_params)
+    rng = np.random.default_rng(seed)
+    dimensions = len(distributions)
+
+    def draw():
+        return ndtri(np.clip(sample_unit(sampling, batch_size, dimensions, rng), 1e-12, 1 - 1e-12))
+
+    samples = 0
+    shift = np.zeros(dimensions)
+    if importance:
+        z = draw()
+        shift = design_point_shift(z, simulate_lives(base, distributions, z, max_cycles), levels[tail])
+        samples += len(z)
+
+    lives, weights = [], []
+    while True:
+        z = draw() + shift
+        # Likelihood ratio of the standard normal to the shifted normal density
+        weights.append(np.exp(-z @ shift + shift @ shift / 2))
+        lives.append(simulate_lives(base, distributions, z, max_cycles))
+        samples += len(z)
+        if len(lives) < min_replicates and samples < max_samples:
+            continue
+
+        pooled_lives, pooled_weights = np.concatenate(lives), np.concatenate(weights)
+        estimates = weighted_quantiles(pooled_lives, pooled_weights, levels)
+        # Woodruff interval: the CDF estimate at each quantile has a standard error from the spread
+        # between the independent batches, which carries over the variance reduction of the
+        # stratified/quasi-random points and the importance sampling
+        batch_cdf = np.array([(weight[:, None] * (life[:, None] <= estimates)).mean(axis=0)
+                              for life, weight in zip(lives, weights)])
+        t_value = stats.t.ppf(0.5 + confidence / 2, max(len(lives) - 1, 1))
+        standard_error = batch_cdf.std(axis=0, ddof=1) / np.sqrt(len(lives)) if len(lives) > 1 else np.full(len(levels), np.inf)
+        lower = weighted_quantiles(pooled_lives, pooled_weights, np.clip(levels - t_value * standard_error, 0, 1))
+        upper = weighted_quantiles(pooled_lives, pooled_weights, np.clip(levels + t_value * standard_error, 0, 1))
+        with np.errstate(invalid="ignore"):
+            relative = (upper[tail] - lower[tail]) / (2 * estimates[tail])
+        # The interval of a percentile resting on a handful of tail samples is itself unreliable
+        tail_samples = np.count_nonzero(pooled_lives <= estimates[tail])
+        if (relative <= target_relative_ci and tail_samples >= min_tail_samples) or samples >= max_samples:
+            break
+
+    return {
+        "percentiles": {name: {"life": life, "lower": low, "upper": high}
+                        for name, life, low, high in zip(names, estimates, lower, upper)},
+        "samples": samples,
+        "replicates": len(lives) + bool(importance),
+        "importance_shift": dict(zip(distributions, shift)),
+    }
+
+
+def _print_result(label, result):
+    print(f"{label}: {result['samples']} samples in {result['replicates']} batches")
+    for name, percentile in result["percentiles"].items():
+        print(f"  {name:>5} life {percentile['life']:>12.1f}   CI [{percentile['lower']:.1f}, {percentile['upper']:.1f}]")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Probabilistic crack growth life estimate")
+    parser.add_argument("spec", help='JSON file with "base" parameters and input "distributions"')
+    parser.add_argument("--sampling", default="sobol", choices=["sobol", "lhs", "random"])
+    parser.add_argument("--no-importance", action="store_true", help="Disable importance sampling of the low-life tail")
+    parser.add_argument("--target", type=float, default=0.05, help="Relative CI half-width of the lowest percentile")
+    parser.add_argument("--compare", action="store_true", help="Also run plain random sampling to the same target")
+    args = parser.parse_args()
+
+    with open(args.spec, 'r') as file:
+        spec = json.load(file)
+
+    _print_result(f"{args.sampling}{'' if args.no_importance else ' + importance sampling'}",
+                  run_probabilistic(spec["base"], spec["distributions"], sampling=args.sampling,
+                                    importance=not args.no_importance, target_relative_ci=args.target))
+    if args.compare:
+        _print_result("random", run_probabilistic(spec["base"], spec["distributions"], sampling="random",
+                                                  importance=False, target_relative_ci=args.target))
@@ -0,0 +1,133 @@
+"""Crack growth rate laws and their lookup tables.
+
+Three laws are available, all as hashable tuples so their tables can be cached:
+
+* ``Walker(C, n, m)``: da/dN = C (dK (1 - R)^(m - 1))^n, the single power law of the
+  Walker tab.
+* ``PiecewiseWalker(segments)``: Walker segments ``(C, n, m, delta_K_max)``, each used
+  up to its R = 0 equivalent dK, to follow the sigmoidal shape of measured data.
+* ``Nasgro(C, n, p, q, delta_K_threshold, critical_K, alpha, Smax_sigma_0)``: the NASGRO
+  equation da/dN = C ((1 - f) / (1 - R) dK)^n (1 - dK_th / dK)^p / (1 - K_max / K_c)^q
+  with the threshold and toughness asymptotes. f is Newman's crack opening function
+  (closure.py) for constraint factor alpha and Smax / sigma_0, or f = R when alpha is 0.
+
+``rate_table`` tabulates log10(da/dN) of a law on a uniform grid of log10(dK) and R
+once; ``RateTable.rate`` then evaluates any array of (dK, R) by bilinear interpolation.
+
+Laws are read from the input parameters by ``rate_law_from_params``: ``walker_segments``
+(a list of [C, n, m, delta_K_max]) selects the piecewise law, ``rate_law: "nasgro"`` with
+``nasgro_p`` and ``nasgro_q`` the NASGRO equation (with closure from ``constraint_factor``
+and ``nasgro_Smax_sigma_0``, default 0.3), and anything else the single Walker law.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from closure import normalized_crack_opening_stress
+from termination import fracture_toughness
+
+LOG_DELTA_K_RANGE = (-1.0, 3.0)  # Tabulated log10(dK) range, 0.1 to 1000 ksi√in
+DELTA_K_POINTS = 4001  # Table points along log10(dK); 0.001 decades apart
+R_POINTS = 161  # Table points along R when a range of stress ratios is tabulated
+LOG_RATE_LIMITS = (-30.0, 10.0)  # No growth and instant failure are stored as these log10(da/dN)
+NASGRO_SMAX_SIGMA_0 = 0.3  # Default Smax / sigma_0 of the NASGRO closure function
+
+
+class Walker(namedtuple("Walker", "C n m")):
+    def rate(self, delta_K, R):
+        return self.C * (delta_K * (1 - R) ** (self.m - 1)) ** self.n
+
+
+class PiecewiseWalker(namedtuple("PiecewiseWalker", "segments")):
+    def rate(self, delta_K, R):
+        # Each segment covers R = 0 equivalent dK up to its delta_K_max; the last one is open-ended
+        delta_K, R = np.broadcast_arrays(np.asarray(delta_K, dtype=float), np.asarray(R, dtype=float))
+        rates = np.full(delta_K.shape, np.nan)
+        for index, (C, n, m, delta_K_max) in enumerate(self.segments):
+            equivalent = delta_K * (1 - R) ** (m - 1)
+            here = np.isnan(rates) & ((equivalent < delta_K_max) | (index == len(self.segments) - 1))
+            rates = np.where(here, C * equivalent ** n, rates)
+        return rates
+
+
+class Nasgro(namedtuple("Nasgro", "C n p q delta_K_threshold critical_K alpha Smax_sigma_0",
+                        defaults=(0.0, NASGRO_SMAX_SIGMA_0))):
+    def rate(self, delta_K, R):
+        delta_K, R = np.asarray(delta_K, dtype=float), np.asarray(R, dtype=float)
+        f = normalized_crack_opening_stress(R, self.Smax_sigma_0, self.alpha) if self.alpha > 0 else R
+        K_max = delta_K / (1 - R)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            threshold_term = np.clip(1 - self.delta_K_threshold / delta_K, 0, None) ** self.p
+            toughness_term = (1 - K_max / self.critical_K) ** self.q if self.critical_K > 0 else 1.0
+            rates = self.C * ((1 - f) / (1 - R) * delta_K) ** self.n * threshold_term / toughness_term
+        return np.where((self.critical_K > 0) & (K_max >= self.critical_K), np.inf, rates)
+
+
+class RateTable:
+    """ln(da/dN) of a rate law on a uniform grid of ln(dK) and R, stored with the slope of every cell."""
+
+    def __init__(self, law, R_min, R_max, R_points):
+        self.law = law
+        log_delta_K_min, log_delta_K_max = (np.log(10.0) * limit for limit in LOG_DELTA_K_RANGE)
+        self.columns = DELTA_K_POINTS
+        self.rows = R_points
+        self.x_scale = (DELTA_K_POINTS - 1) / (log_delta_K_max - log_delta_K_min)
+        self.x_offset = log_delta_K_min * self.x_scale
+        self.R_min = R_min
+        self.y_scale = (R_points - 1) / (R_max - R_min) if R_points > 1 else 0.0
+        delta_K = np.exp(np.linspace(log_delta_K_min, log_delta_K_max, DELTA_K_POINTS))
+        R = np.linspace(R_min, R_max, R_points)[:, None]
+        with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+            log_rates = np.log(law.rate(delta_K[None, :], R))
+        log_rates = np.clip(np.nan_to_num(log_rates, nan=-np.inf), *(np.log(10.0) * limit for limit in LOG_RATE_LIMITS))
+        # Flattened values and slopes per dK cell, with the last column repeated so every cell has a right edge
+        self.values = log_rates.ravel()
+        self.slopes = np.diff(log_rates, axis=1, append=log_rates[:, -1:]).ravel()
+        self.slopes[self.columns - 1::self.columns] = self.slopes[self.columns - 2::self.columns]
+
+    def rate(self, delta_K, R):
+        # Bilinear interpolation; dK outside the table continues along the end cells (a power law)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = np.log(delta_K) * self.x_scale - self.x_offset
+        column = np.clip(x, 0, self.columns - 1).astype(np.intp)
+        x_fraction = x - column
+        if self.rows == 1:
+            log_rate = self.values[column] + self.slopes[column] * x_fraction
+        else:
+            y = np.clip((np.asarray(R, dtype=float) - self.R_min) * self.y_scale, 0, self.rows - 1)
+            row = np.minimum(y.astype(np.intp), self.rows - 2)
+            index = row * self.columns + column
+            lower = self.values[index] + self.slopes[index] * x_fraction
+            index += self.columns
+            upper = self.values[index] + self.slopes[index] * x_fraction
+            log_rate = lower + (y - row) * (upper - lower)
+        with np.errstate(invalid="ignore"):
+            rates = np.exp(log_rate)
+        return np.where(np.isnan(rates), 0.0, rates)
+
+
+@lru_cache(maxsize=32)
+def rate_table(law, R_min=0.0, R_max=None, R_points=R_POINTS):
+    """Return the (cached) table of ``law`` for R in [R_min, R_max], or for R_min alone."""
+    if R_max is None or R_max == R_min:
+        return RateTable(law, R_min, R_min, 1)
+    return RateTable(law, R_min, R_max, R_points)
+
+
+# Function to check whether the inputs select the single Walker law of the Walker tab
+def single_walker(params):
+    return not params.get("walker_segments") and params.get("rate_law", "walker") == "walker"
+
+
+def rate_law_from_params(params):
+    if params.get("walker_segments"):
+        return PiecewiseWalker(tuple(tuple(float(value) for value in segment) for segment in params["walker_segments"]))
+    if params.get("rate_law") == "nasgro":
+        toughness = fracture_toughness(*(float(params.get(key) or 0) for key in (
+            "thickness", "yield_strength", "plane_stress_fracture_toughness", "plane_strain_fracture_toughness")))
+        return Nasgro(float(params["C"]), float(params["n"]), float(params["nasgro_p"]), float(params["nasgro_q"]),
+                      float(params["delta_K_threshold_value"]), float(toughness),
+                      float(params.get("constraint_factor") or 0),
+                      float(params.get("nasgro_Smax_sigma_0") or NASGRO_SMAX_SIGMA_0))
+    return Walker(float(params["C"]), float(params["n"]), float(params["m"]))
@@ -1,6 +1,8 @@
 import customtkinter as ctk
+import numpy as np
 from calculations import calculate_crack_growth
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from decimation import decimate
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import matplotlib.pyplot as plt
 
 class ResultTab:
@@ -21,11 +23,22 @@ class ResultTab:
         self.canvas2 = FigureCanvasTkAgg(self.fig2, master=self.parent)
         self.canvas2.get_tk_widget().grid(row=1, column=1, pady=10, padx=15, sticky="nsew")
 
+        # Toolbars for zooming and panning; the plots re-decimate the histories to the new view
+        self.toolbar1 = NavigationToolbar2Tk(self.canvas1, self.parent, pack_toolbar=False)
+        self.toolbar1.grid(row=2, column=0, padx=15, sticky="ew")
+        self.toolbar2 = NavigationToolbar2Tk(self.canvas2, self.parent, pack_toolbar=False)
+        self.toolbar2.grid(row=2, column=1, padx=15, sticky="ew")
+
+        self.length_plot = HistoryPlot(self.ax1, self.canvas1, ['Crack Length A', 'Crack Length C'],
+                                       'Cycles', 'Crack Length (inches)', 'Crack Length vs. Cycles')
+        self.area_plot = HistoryPlot(self.ax2, self.canvas2, ['Crack Area'],
+                                     'Cycles', 'Crack Area (square inches)', 'Crack Area vs. Cycles')
+
         self.create_navigation_buttons()
 
     def create_navigation_buttons(self):
         button_frame = ctk.CTkFrame(self.parent)
-        button_frame.grid(row=2, column=0, columnspan=2, pady=10, padx=10, sticky="ew")
+        button_frame.grid(row=3, column=0, columnspan=2, pady=10, padx=10, sticky="ew")
 
         self.previous_button = ctk.CTkButton(button_frame, text="Previous", command=lambda: self.app.show_tab("Walker Equation Data"), fg_color="#2E3092")
         self.previous_button.pack(side=ctk.LEFT, padx=10)
@@ -33,36 +46,144 @@ class ResultTab:
         self.clear_button = ctk.CTkButton(button_frame, text="Clear", command=self.clear, fg_color="#2E3092")
         self.clear_button.pack(side=ctk.LEFT, padx=10)
 
-    def display_results(self, cycle_counts, crack_lengths_A, crack_lengths_C, crack_areas):
-        self.ax1.clear()
-        self.ax2.clear()
+        self.cancel_button = ctk.CTkButton(button_frame, text="Cancel", command=self.app.cancel_calculation, fg_color="#A4262C", state="disabled")
+        self.cancel_button.pack(side=ctk.LEFT, padx=10)
 
-        self.ax1.plot(cycle_counts, crack_lengths_A, label='Crack Length A')
-        self.ax1.plot(cycle_counts, crack_lengths_C, label='Crack Length C')
-        self.ax1.set_xlabel('Cycles')
-        self.ax1.set_ylabel('Crack Length (inches)')
-        self.ax1.set_title('Crack Length vs. Cycles')
-        self.ax1.legend()
-        self.ax1.grid(True)
+    # Called by the app when a calculation starts and ends; Cancel is only active in between
+    def start_run(self):
+        self.clear()
+        self.result_label.configure(text="Calculating...")
+        self.cancel_button.configure(state="normal")
 
-        self.ax2.plot(cycle_counts, crack_areas, label='Crack Area')
-        self.ax2.set_xlabel('Cycles')
-        self.ax2.set_ylabel('Crack Area (square inches)')
-        self.ax2.set_title('Crack Area vs. Cycles')
-        self.ax2.legend()
-        self.ax2.grid(True)
+    def finish_run(self, message=None):
+        self.cancel_button.configure(state="disabled")
+        if message:
+            self.result_label.configure(text=message)
 
-        self.canvas1.draw()
-        self.canvas2.draw()
+    def display_results(self, cycle_counts, crack_lengths_A, crack_lengths_C, crack_areas, running=False, curve=None):
+        # With running=True the histories are the partial curves of a calculation still in progress.
+        # curve(cycle_counts) -> (A, C, area) is the analytic solution of a closed-form run, drawn instead of the points
+        cycle_counts = np.asarray(cycle_counts, dtype=float)
+        self.length_plot.set_data(cycle_counts, [crack_lengths_A, crack_lengths_C], running,
+                                  curve and (lambda x: curve(x)[:2]))
+        self.area_plot.set_data(cycle_counts, [crack_areas], running, curve and (lambda x: curve(x)[2:]))
 
+        if running:
+            self.result_label.configure(text=f"Calculating... {cycle_counts[-1]:.0f} cycles, "
+                                             f"crack area {crack_areas[-1]:.6f} square inches")
+            return
         self.result_label.configure(text=f"Final crack length A: {crack_lengths_A[-1]:.6f} inches\n"
                                          f"Final crack length C: {crack_lengths_C[-1]:.6f} inches\n"
                                          f"Final crack area: {crack_areas[-1]:.6f} square inches\n"
-                                         f"Total cycles: {cycle_counts[-1]}")
+                                         f"Total cycles: {cycle_counts[-1]:g}")
 
     def clear(self):
         self.result_label.configure(text="Results will be displayed here.")
-        self.ax1.clear()
-        self.ax2.clear()
-        self.canvas1.draw()
-        self.canvas2.draw()
+        self.length_plot.clear()
+        self.area_plot.clear()
+
+
+class HistoryPlot:
+    """Lines of one axes showing histories of any length at screen resolution.
+
+    The lines only hold the min/max decimation of the visible cycle range, which is
+    redone when the view is zoomed or panned. A history with an analytic curve is
+    instead evaluated at one point per pixel of the visible range. The lines are animated artists: a full
+    draw renders the axes without them and saves the background, and updates that fit
+    in the current limits restore that background and blit the lines on top.
+    """
+
+    def __init__(self, ax, canvas, labels, xlabel, ylabel, title):
+        self.ax = ax
+        self.canvas = canvas
+        self.x = np.empty(0)
+        self.ys = []
+        self.curve = None
+        self.background = None
+        self.bins = 0
+        self.setting_limits = False
+
+        self.lines = [ax.plot([], [], label=label, animated=True)[0] for label in labels]
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.set_title(title)
+        ax.legend(loc="upper left")
+        ax.grid(True)
+
+        canvas.mpl_connect("draw_event", self.on_draw)
+        ax.callbacks.connect("xlim_changed", self.on_xlim_changed)
+
+    def set_data(self, x, ys, running=False, curve=None):
+        self.x = x
+        self.ys = [np.asarray(y, dtype=float) for y in ys]
+        self.curve = curve
+        if not self.x.size:
+            self.clear()
+            return
+
+        y_min = min(float(np.nanmin(y)) for y in self.ys)
+        y_max = max(float(np.nanmax(y)) for y in self.ys)
+        (x_low, x_high), (y_low, y_high) = self.ax.get_xlim(), self.ax.get_ylim()
+        if running and self.background is not None and x_low <= self.x[0] and self.x[-1] <= x_high \
+                and y_low <= y_min and y_max <= y_high:
+            self.update_lines()
+            self.blit()
+            return
+
+        # New limits; while running the growing curves get headroom so the axes are only redrawn now and then
+        headroom = 1.5 if running else 1.0
+        self.setting_limits = True
+        self.ax.set_xlim(*_padded(self.x[0], self.x[0] + (self.x[-1] - self.x[0]) * headroom))
+        self.ax.set_ylim(*_padded(y_min, y_min + (y_max - y_min) * headroom))
+        self.setting_limits = False
+        self.update_lines()
+        self.background = None  # Stale until the full draw has run
+        self.canvas.draw_idle()
+
+    def update_lines(self):
+        self.bins = max(int(self.ax.bbox.width), 1)
+        x_min, x_max = self.ax.get_xlim()
+        if self.curve is not None:
+            x = np.linspace(max(x_min, self.x[0]), min(x_max, self.x[-1]), self.bins + 1)
+            for line, y in zip(self.lines, self.curve(x)):
+                line.set_data(x, y)
+            return
+        for line, (x, y) in zip(self.lines, decimate(self.x, self.ys, x_min, x_max, self.bins)):
+            line.set_data(x, y)
+
+    def blit(self):
+        self.canvas.restore_region(self.background)
+        for line in self.lines:
+            self.ax.draw_artist(line)
+        self.canvas.blit(self.ax.figure.bbox)
+
+    def on_draw(self, event):
+        # A full draw leaves out the animated lines; keep it as the background and add the lines
+        if self.x.size and int(self.ax.bbox.width) != self.bins:
+            self.update_lines()  # The canvas was resized
+        self.background = self.canvas.copy_from_bbox(self.ax.figure.bbox)
+        for line in self.lines:
+            self.ax.draw_artist(line)
+
+    def on_xlim_changed(self, ax):
+        # Zoom and pan re-decimate the newly visible range before the toolbar redraws the canvas
+        if not self.setting_limits and self.x.size:
+            self.update_lines()
+
+    def clear(self):
+        self.x = np.empty(0)
+        self.ys = []
+        self.curve = None
+        for line in self.lines:
+            line.set_data([], [])
+        self.setting_limits = True
+        self.ax.set_xlim(0, 1)
+        self.ax.set_ylim(0, 1)
+        self.setting_limits = False
+        self.canvas.draw_idle()
+
+
+# Axis limits around [low, high] with a 5% margin
+def _padded(low, high):
+    margin = 0.05 * (high - low) or 0.05 * abs(low) or 0.05
+    return low - margin, high + margin
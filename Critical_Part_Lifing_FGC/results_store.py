@@ -0,0 +1,192 @@
+"""Persistent store of crack growth runs, indexed by a hash of their inputs.
+
+Each run is one row of an SQLite database (standard library, no server): the parameter
+hash, the study it belongs to, the inputs as JSON with the main numeric inputs also in
+columns of their own, the final state and stop reason, and optionally the crack history
+thinned to STORED_HISTORY_POINTS points. A repeated run is served from the store
+instead of being recomputed (``ResultsStore.run``), and runs can be filtered on inputs
+and results with indexed range queries::
+
+    store = ResultsStore()
+    store.query(SMF=(20, 30), cycles=(None, 1e5))          # SMF in [20, 30], life < 1e5
+
+The database lives in ``~/.cache/fgc_results.sqlite`` unless the ``FGC_RESULTS_STORE``
+environment variable names another file.
+"""
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from calculations import calculate_crack_growth, convert_params
+from history import CrackHistory
+from spectrum_cache import file_hash
+
+STORE_PATH = os.environ.get("FGC_RESULTS_STORE", os.path.join(os.path.expanduser("~"), ".cache", "fgc_results.sqlite"))
+STORE_VERSION = 2  # Part of every parameter hash; raise it when a change to the engines alters results
+STORED_HISTORY_POINTS = 2000  # Most history points kept per run
+
+# Inputs copied into columns of their own so they can be filtered on
+QUERY_PARAMS = ("C", "n", "m", "SMF", "SPL", "Pxx", "width", "thickness", "hole_diameter",
+                "initial_crack_length_A", "initial_crack_length_C", "delta_K_threshold_value")
+RESULT_FIELDS = ("cycles", "crack_length_A", "crack_length_C", "crack_area", "stop_reason")
+INDEXED_COLUMNS = ("study", "SMF", "cycles")
+
+
+# Function to reduce a history output policy to its canonical (every, growth, endpoints) form
+def _output_policy(output):
+    history = CrackHistory(capacity=2, **(output or {}))
+    return [history.every, history.growth, history.endpoints]
+
+
+def parameter_hash(params, method="auto", max_cycles=None, output=None):
+    """Return the hash of the inputs that determine a run's results.
+
+    These are the parameters, the integration method, the cycle limit and the history
+    output policy. The material name is left out and a spectrum file is replaced by the
+    hash of its content, so renamed or moved spectra still match.
+    """
+    canonical = {key: value for key, value in convert_params(params).items() if key != "material_name"}
+    if canonical.get("spectrum_file"):
+        canonical["spectrum_file"] = file_hash(canonical["spectrum_file"])
+    max_cycles = None if max_cycles is None else float(max_cycles)
+    text = json.dumps([STORE_VERSION, method, max_cycles, _output_policy(output), canonical], sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+# Function to thin a history to at most STORED_HISTORY_POINTS points (first and last always kept) and serialize it
+def _pack_history(history):
+    records = history.records
+    if records.size > STORED_HISTORY_POINTS:
+        records = records[np.unique(np.linspace(0, records.size - 1, STORED_HISTORY_POINTS).astype(np.intp))]
+    buffer = io.BytesIO()
+    np.save(buffer, records)
+    return buffer.getvalue()
+
+
+def _unpack_history(blob, stop_reason):
+    records = np.load(io.BytesIO(blob))
+    history = CrackHistory(capacity=max(records.size, 2))
+    history.extend(*(records[name] for name in records.dtype.names))
+    history.stop_reason = stop_reason
+    return history.finish()
+
+
+class ResultsStore:
+    def __init__(self, path=STORE_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")  # Readers are not blocked by a writing process
+        columns = ", ".join(f'"{name}" REAL' for name in QUERY_PARAMS + RESULT_FIELDS[:-1])
+        with self.connection:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS runs (param_hash TEXT PRIMARY KEY, study TEXT, method TEXT, created REAL, "
+                f"params TEXT, {columns}, stop_reason INTEGER, history BLOB)")
+            for name in INDEXED_COLUMNS:
+                self.connection.execute(f'CREATE INDEX IF NOT EXISTS "runs_{name}" ON runs ("{name}")')
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def get(self, params, method="auto", max_cycles=None, output=None, require_history=True):
+        """Return the stored history of a run, or None if it is not in the store.
+
+        A run stored without history is returned as its first and final points, like an
+        ``endpoints`` history, unless ``require_history`` is set; then it counts as missing.
+        """
+        row = self.connection.execute(
+            "SELECT stop_reason, history, cycles, crack_length_A, crack_length_C, crack_area FROM runs "
+            "WHERE param_hash = ?", (parameter_hash(params, method, max_cycles, output),)).fetchone()
+        if row is None:
+            return None
+        if row[1] is not None:
+            return _unpack_history(row[1], row[0])
+        if require_history:
+            return None
+        params = convert_params(params)
+        initial_A, initial_C = float(params["initial_crack_length_A"]), float(params["initial_crack_length_C"])
+        history = CrackHistory(endpoints=True)
+        history.append(0.0, initial_A, initial_C, initial_A * initial_C)
+        history.append(*row[2:])
+        history.stop_reason = row[0]
+        return history.finish()
+
+    def put(self, params, history, method="auto", max_cycles=None, output=None, study=None, keep_history=True):
+        # Stores (or replaces) a run; returns its parameter hash
+        params = convert_params(params)
+        final = history.records[-1]
+        key = parameter_hash(params, method, max_cycles, output)
+        values = [key, study, method, time.time(), json.dumps(params, default=str)]
+        values += [float(params[name]) if isinstance(params.get(name), float) else None for name in QUERY_PARAMS]
+        values += [float(final[name]) for name in RESULT_FIELDS[:-1]]
+        values += [int(history.stop_reason), _pack_history(history) if keep_history else None]
+        with self.connection:
+            self.connection.execute(f"INSERT OR REPLACE INTO runs VALUES ({', '.join('?' * len(values))})", values)
+        return key
+
+    def run(self, params, method="auto", max_cycles=None, output=None, study=None, keep_history=True, progress=None):
+        """Return (history, True) from the store, or run, store and return (history, False).
+
+        Without ``keep_history`` the run is stored as a summary, and a stored summary is enough.
+        """
+        history = self.get(params, method, max_cycles, output, require_history=keep_history)
+        if history is not None:
+            return history, True
+        history = calculate_crack_growth(convert_params(params), method=method, max_cycles=max_cycles,
+                                         progress=progress, output=output)
+        self.put(params, history, method, max_cycles, output, study=study, keep_history=keep_history)
+        return history, False
+
+    def query(self, study=None, with_history=False, **conditions):
+        """Return the stored runs matching all conditions, as dicts.
+
+        Each condition names an input of QUERY_PARAMS or a result of RESULT_FIELDS and is
+        either a value or a (low, high) range; None leaves that side open, and the upper
+        bound is exclusive. ``study`` selects one study.
+        """
+        clauses, values = [], []
+        for name, condition in conditions.items():
+            if name not in QUERY_PARAMS + RESULT_FIELDS:
+                raise ValueError(f"Cannot filter on {name}")
+            if isinstance(condition, (tuple, list)):
+                low, high = condition
+                if low is not None:
+                    clauses.append(f'"{name}" >= ?')
+                    values.append(low)
+                if high is not None:
+                    clauses.append(f'"{name}" < ?')
+                    values.append(high)
+            else:
+                clauses.append(f'"{name}" = ?')
+                values.append(condition)
+        if study is not None:
+            clauses.append("study = ?")
+            values.append(study)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = self.connection.execute(
+            f"SELECT param_hash, study, method, created, params, {', '.join(RESULT_FIELDS)}"
+            f"{', history' if with_history else ''} FROM runs{where} ORDER BY created", values)
+        runs = []
+        for row in cursor:
+            run = dict(zip(("param_hash", "study", "method", "created", "params") + RESULT_FIELDS, row))
+            run["params"] = json.loads(run["params"])
+            if with_history:
+                run["history"] = None if row[-1] is None else _unpack_history(row[-1], run["stop_reason"])
+            runs.append(run)
+        return runs
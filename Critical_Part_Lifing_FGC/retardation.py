@@ -0,0 +1,94 @@
+"""Load interaction (retardation) models for spectrum runs.
+
+An overload leaves a plastic zone of size r_p = (K_max / yield strength)^2 / (2 pi) ahead
+of the crack tip. Until the crack has grown through it, later cycles whose own plastic zone
+does not reach the boundary a_OL + r_OL of the overload zone are retarded:
+
+* ``Willenborg``: the stress intensity is reduced by
+  K_red = yield strength * sqrt(2 pi (a_OL + r_OL - a)) - K_max, which is the K_max
+  needed to reach the boundary minus the applied K_max.
+* ``GeneralizedWillenborg`` (Gallagher): the reduction is scaled by
+  phi = (1 - delta_K_th / delta_K) / (SOLR - 1), so overloads below the shut-off overload
+  ratio SOLR retard less and growth stops altogether at SOLR.
+
+K_max and K_min both drop by K_red (K_min not below zero), which gives the effective
+delta_K and R of the cycle. A cycle whose plastic zone reaches past the boundary becomes
+the new overload. The whole state of a crack tip is the boundary, so a cycle costs O(1).
+
+The models are state machines holding the boundary of the crack tip. ``window`` evaluates
+many cycles as arrays without changing the state, and ``advance`` then commits the first
+cycles of the last window, so a spectrum run can take as many of them as it accepts.
+Constant amplitude loading is never retarded, so only spectrum runs use the models.
+"""
+import numpy as np
+
+RETARDATION_MODELS = ("none", "willenborg", "generalized_willenborg")
+DEFAULT_SHUTOFF_OVERLOAD_RATIO = 3.0  # SOLR of the generalized model when none is given
+
+
+class Willenborg:
+    def __init__(self, yield_strength):
+        if not yield_strength > 0:
+            raise ValueError("Willenborg retardation needs a positive yield strength")
+        self.yield_strength = float(yield_strength)
+        self.boundary = 0.0  # a_OL + r_OL
+        self._zones = None  # Plastic zone fronts a + r_p of the last window
+
+    def plastic_zone(self, K_max):
+        return (np.maximum(K_max, 0) / self.yield_strength) ** 2 / (2 * np.pi)
+
+    def reduction_factor(self, delta_K):
+        # Share of the full Willenborg reduction applied; the generalized model scales it
+        return 1.0
+
+    def effective(self, K_max, K_min, crack_length, boundary):
+        """Return the effective delta_K and R of cycles inside an overload zone ending at ``boundary``."""
+        K_max = np.asarray(K_max, dtype=float)
+        K_min = np.asarray(K_min, dtype=float)
+        required = self.yield_strength * np.sqrt(2 * np.pi * np.maximum(boundary - crack_length, 0))
+        K_red = np.maximum(required - K_max, 0) * self.reduction_factor(K_max - K_min)
+        K_max_eff = K_max - K_red
+        K_min_eff = np.where(K_min > 0, np.maximum(K_min - K_red, 0), K_min)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            R_eff = np.where(K_max_eff > 0, K_min_eff / K_max_eff, 0.0)
+        return np.maximum(K_max_eff - K_min_eff, 0) * (K_max_eff > 0), R_eff
+
+    def window(self, K_max, K_min, crack_length):
+        """Return the effective delta_K and R of consecutive cycles at a crack length held fixed."""
+        self._zones = crack_length + self.plastic_zone(np.asarray(K_max, dtype=float))
+        # Boundary in force at each cycle: the larger of the current one and every earlier cycle's zone
+        boundary = np.maximum.accumulate(np.concatenate(([self.boundary], self._zones[:-1])))
+        return self.effective(K_max, K_min, crack_length, boundary)
+
+    def advance(self, count):
+        """Commit the first ``count`` cycles of the last window to the state."""
+        if count:
+            self.boundary = max(self.boundary, float(self._zones[:count].max()))
+
+
+class GeneralizedWillenborg(Willenborg):
+    def __init__(self, yield_strength, delta_K_threshold=0.0, shutoff_overload_ratio=DEFAULT_SHUTOFF_OVERLOAD_RATIO):
+        if not shutoff_overload_ratio > 1:
+            raise ValueError("The shut-off overload ratio must be greater than 1")
+        super().__init__(yield_strength)
+        self.delta_K_threshold = float(delta_K_threshold)
+        self.shutoff_overload_ratio = float(shutoff_overload_ratio)
+
+    def reduction_factor(self, delta_K):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            phi = (1 - self.delta_K_threshold / delta_K) / (self.shutoff_overload_ratio - 1)
+        return np.clip(np.nan_to_num(phi, nan=0.0), 0, 1)
+
+
+# Function to build the retardation model selected in the input parameters; None without retardation
+def retardation_from_params(params):
+    model = params.get("retardation") or "none"
+    if model not in RETARDATION_MODELS:
+        raise ValueError(f"Unknown retardation model: {model}")
+    if model == "none":
+        return None
+    yield_strength = float(params.get("yield_strength") or 0)
+    if model == "willenborg":
+        return Willenborg(yield_strength)
+    return GeneralizedWillenborg(yield_strength, float(params.get("delta_K_threshold_value") or 0),
+                                 float(params.get("shutoff_overload_ratio") or DEFAULT_SHUTOFF_OVERLOAD_RATIO))
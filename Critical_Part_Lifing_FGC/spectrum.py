@@ -0,0 +1,198 @@
+import os
+
+import numpy as np
+
+CHUNK_SIZE = 1 << 20  # Spectrum values processed per chunk
+BINARY_DTYPE = "<f4"  # Layout of raw binary (.bin) spectrum files
+
+# Counted cycles: the higher and lower turning point of each cycle and whether it is full (1) or half (0.5)
+CYCLE_DTYPE = np.dtype([("peak", "f8"), ("valley", "f8"), ("count", "f8")])
+
+
+# Function to stream the peaks and valleys of a spectrum file as float arrays
+def read_spectrum(path, chunk_size=CHUNK_SIZE, binary_dtype=BINARY_DTYPE):
+    """Yield the load values of a spectrum file in chunks of at most ``chunk_size``.
+
+    ``.npy`` files and raw ``.bin`` files (``binary_dtype`` values) are memory-mapped;
+    anything else is read as text, whitespace-separated values in file order (one
+    peak/valley per line or max/min pairs), with ``#`` comment lines.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        values = np.load(path, mmap_mode="r").reshape(-1)
+    elif extension == ".bin":
+        values = np.memmap(path, dtype=binary_dtype, mode="r")
+    else:
+        yield from _read_text_spectrum(path, chunk_size)
+        return
+
+    for start in range(0, values.size, chunk_size):
+        yield np.asarray(values[start:start + chunk_size], dtype=float)
+
+
+def _read_text_spectrum(path, chunk_size):
+    remainder = ""
+    with open(path, "r") as file:
+        while True:
+            block = file.read(chunk_size * 8)
+            if not block:
+                break
+            # Only parse whole lines; the partial last line is carried into the next block
+            text = remainder + block
+            cut = text.rfind("\n") + 1
+            text, remainder = text[:cut], text[cut:]
+            values = _parse_text(text)
+            if values.size:
+                yield values
+    values = _parse_text(remainder)
+    if values.size:
+        yield values
+
+
+def _parse_text(text):
+    if "#" in text:
+        text = "\n".join(line for line in text.splitlines() if not line.lstrip().startswith("#"))
+    return np.fromstring(text, sep=" ") if text.strip() else np.empty(0)
+
+
+# Function to reduce streamed load values to their turning points (peaks and valleys)
+def iter_turning_points(chunks):
+    # The last two turning points of a chunk are carried over, as the next chunk may
+    # continue in the same direction and make the last one an intermediate value
+    carried = np.empty(0)
+    for chunk in chunks:
+        values = np.concatenate((carried, chunk))
+        values = values[np.r_[True, values[1:] != values[:-1]]]  # Remove plateaus
+        if values.size < 3:
+            carried = values
+            continue
+        slopes = np.diff(values)
+        values = values[np.r_[True, slopes[:-1] * slopes[1:] < 0, True]]
+        if values.size > 2:
+            yield values[:-2]
+        carried = values[-2:]
+    if carried.size:
+        yield carried
+
+
+# Function to pair consecutive turning points into cycles in load order, without counting
+def iter_sequential_cycles(turning_chunks):
+    carried = np.empty(0)
+    for chunk in turning_chunks:
+        points = np.concatenate((carried, chunk))
+        pairs = points[:points.size - points.size % 2].reshape(-1, 2)
+        carried = points[pairs.size:]
+        if pairs.size:
+            yield _make_cycles(pairs[:, 0], pairs[:, 1], 1.0)
+
+
+# Function to rainflow count streamed turning points
+def iter_rainflow(turning_chunks):
+    """Yield rainflow-counted cycles (CYCLE_DTYPE) chunk by chunk, roughly in load order.
+
+    Full cycles are closed with the four-point method: the inner range of four
+    consecutive turning points is a cycle when it is no larger than either neighbour.
+    All closable pairs of a chunk are removed in a vectorized pass, repeating until
+    none are left; the residue is carried into the next chunk and is counted as half
+    cycles at the end of the spectrum.
+    """
+    residue = np.empty(0)
+    residue_positions = np.empty(0, dtype=np.int64)
+    offset = 0
+    for chunk in turning_chunks:
+        points = np.concatenate((residue, chunk))
+        positions = np.concatenate((residue_positions, np.arange(offset, offset + chunk.size)))
+        offset += chunk.size
+        cycles, residue, residue_positions = count_full_cycles(points, positions)
+        if cycles.size:
+            yield cycles
+    if residue.size > 1:
+        yield _make_cycles(residue[:-1], residue[1:], 0.5)
+
+
+def count_full_cycles(points, positions):
+    """Extract the full cycles of a turning-point sequence with the four-point method.
+
+    Returns the cycles sorted by the position at which they close, and the residue
+    points with their positions.
+    """
+    peaks, valleys, closed_at = [], [], []
+    while points.size >= 4:
+        outer_before = np.abs(points[1:-2] - points[:-3])
+        inner = np.abs(points[2:-1] - points[1:-2])
+        outer_after = np.abs(points[3:] - points[2:-1])
+        closable = (inner <= outer_before) & (inner <= outer_after)
+        # Candidates sharing a point conflict, so only the first of each run is removed in this
+        # pass. Removing an enclosed pair never shrinks its neighbours' ranges, so the other
+        # candidates stay closable and are picked up by the next pass.
+        first = closable & ~np.r_[False, closable[:-1]]
+        if not first.any():
+            break
+        if first.sum() < 0.01 * points.size and points.size > 1000:
+            # Nested (converging) sequences only close one pair per pass; finish with a stack
+            stack_cycles, points, positions = _stack_full_cycles(points, positions)
+            peaks.append(stack_cycles[0])
+            valleys.append(stack_cycles[1])
+            closed_at.append(stack_cycles[2])
+            break
+        index = np.flatnonzero(first) + 1
+        pair = np.stack((points[index], points[index + 1]))
+        peaks.append(pair.max(axis=0))
+        valleys.append(pair.min(axis=0))
+        closed_at.append(positions[index + 1])
+        keep = np.ones(points.size, dtype=bool)
+        keep[index] = False
+        keep[index + 1] = False
+        points, positions = points[keep], positions[keep]
+
+    if not peaks:
+        return np.empty(0, dtype=CYCLE_DTYPE), points, positions
+    order = np.argsort(np.concatenate(closed_at), kind="stable")
+    cycles = _make_cycles(np.concatenate(peaks)[order], np.concatenate(valleys)[order], 1.0)
+    return cycles, points, positions
+
+
+def _stack_full_cycles(points, positions):
+    peaks, valleys, closed_at = [], [], []
+    stack_points, stack_positions = [], []
+    for point, position in zip(points.tolist(), positions.tolist()):
+        stack_points.append(point)
+        stack_positions.append(position)
+        while len(stack_points) >= 4:
+            inner = abs(stack_points[-2] - stack_points[-3])
+            if inner > abs(stack_points[-3] - stack_points[-4]) or inner > abs(stack_points[-1] - stack_points[-2]):
+                break
+            peaks.append(max(stack_points[-2], stack_points[-3]))
+            valleys.append(min(stack_points[-2], stack_points[-3]))
+            closed_at.append(stack_positions[-2])
+            del stack_points[-3:-1]
+            del stack_positions[-3:-1]
+    cycles = (np.array(peaks), np.array(valleys), np.array(closed_at, dtype=np.int64))
+    return cycles, np.array(stack_points), np.array(stack_positions, dtype=np.int64)
+
+
+def _make_cycles(first, second, count):
+    cycles = np.empty(np.size(first), dtype=CYCLE_DTYPE)
+    cycles["peak"] = np.maximum(first, second)
+    cycles["valley"] = np.minimum(first, second)
+    cycles["count"] = count
+    return cycles
+
+
+# Function to stream the counted cycles of a spectrum file
+def iter_spectrum_cycles(path, counting="rainflow", chunk_size=CHUNK_SIZE):
+    turning_points = iter_turning_points(read_spectrum(path, chunk_size=chunk_size))
+    if counting == "rainflow":
+        return iter_rainflow(turning_points)
+    if counting == "sequential":
+        return iter_sequential_cycles(turning_points)
+    raise ValueError(f"Unknown cycle counting method: {counting}")
+
+
+# Function to scale counted cycles to applied stresses and stress ratios
+def cycle_stresses(cycles, SMF, SPL):
+    # SPL is added to the max and min spectrum stresses after they have been multiplied by SMF
+    max_stress = SMF * cycles["peak"] + SPL
+    min_stress = SMF * cycles["valley"] + SPL
+    stress_ratio = np.divide(min_stress, max_stress, out=np.zeros_like(max_stress), where=max_stress > 0)
+    return max_stress, min_stress, stress_ratio
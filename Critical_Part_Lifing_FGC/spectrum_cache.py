@@ -0,0 +1,114 @@
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+from spectrum import CHUNK_SIZE, cycle_stresses, iter_spectrum_cycles
+
+CACHE_DIR = os.environ.get("FGC_SPECTRUM_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "fgc_spectra"))
+MAX_CACHE_BYTES = 2 * 1024 ** 3  # Total size of cached spectra before the least recently used are evicted
+
+# Pre-processed spectrum: the counted cycles scaled with SMF and SPL
+STRESS_DTYPE = np.dtype([("max_stress", "f8"), ("min_stress", "f8"), ("stress_ratio", "f8"), ("count", "f4")])
+
+# Content hashes by (path, size, modification time), so unchanged files are only hashed once per process
+_file_hashes = {}
+
+
+# Function to hash the content of a spectrum file without reading it into memory at once
+def file_hash(path):
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _file_hashes:
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+        _file_hashes[memo_key] = digest.hexdigest()
+    return _file_hashes[memo_key]
+
+
+# Cache entry name for a spectrum file processed with the given SMF, SPL and counting method
+def cache_key(path, SMF, SPL, counting="rainflow"):
+    settings = f"{file_hash(path)}|{counting}|{float(SMF)!r}|{float(SPL)!r}"
+    return hashlib.sha256(settings.encode()).hexdigest()
+
+
+def load_cycle_stresses(path, SMF, SPL, counting="rainflow", cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, check=None):
+    """Return the scaled, counted cycles of a spectrum file as a read-only memory map.
+
+    The first request for a (file content, SMF, SPL, counting) combination streams and
+    counts the spectrum into ``cache_dir``; later requests are a zero-copy
+    ``np.load(mmap_mode="r")``. Entries are evicted least recently used first once
+    the cache holds more than ``max_bytes``. While an entry is written ``check()`` is called
+    after every chunk; an exception raised by it stops the write and leaves no entry behind.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    target = os.path.join(cache_dir, cache_key(path, SMF, SPL, counting) + ".npy")
+    if os.path.exists(target):
+        os.utime(target)  # Mark the entry as recently used
+    else:
+        _write_cache_entry(path, SMF, SPL, counting, target, check)
+        evict(cache_dir, max_bytes, keep=target)
+    return np.load(target, mmap_mode="r")
+
+
+def _write_cache_entry(path, SMF, SPL, counting, target, check=None):
+    # The number of cycles is only known after counting, so they are streamed to a raw file
+    # first and then copied into a .npy file of the right shape
+    cache_dir = os.path.dirname(target)
+    raw_fd, raw_path = tempfile.mkstemp(dir=cache_dir, suffix=".raw")
+    npy_fd, npy_path = tempfile.mkstemp(dir=cache_dir, suffix=".partial")
+    os.close(npy_fd)
+    try:
+        total = 0
+        with os.fdopen(raw_fd, "wb") as raw:
+            for chunk in iter_spectrum_cycles(path, counting=counting):
+                if check:
+                    check()
+                block = np.empty(chunk.size, dtype=STRESS_DTYPE)
+                block["max_stress"], block["min_stress"], block["stress_ratio"] = cycle_stresses(chunk, SMF, SPL)
+                block["count"] = chunk["count"]
+                block.tofile(raw)
+                total += chunk.size
+
+        if total:
+            source = np.memmap(raw_path, dtype=STRESS_DTYPE, mode="r", shape=(total,))
+            output = np.lib.format.open_memmap(npy_path, mode="w+", dtype=STRESS_DTYPE, shape=(total,))
+            for start in range(0, total, CHUNK_SIZE):
+                if check:
+                    check()
+                output[start:start + CHUNK_SIZE] = source[start:start + CHUNK_SIZE]
+            output.flush()
+            del source, output
+        else:
+            with open(npy_path, "wb") as file:
+                np.save(file, np.empty(0, dtype=STRESS_DTYPE))
+        os.replace(npy_path, target)
+    finally:
+        for leftover in (raw_path, npy_path):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+
+# Function to remove the least recently used cache entries until the cache fits in max_bytes
+def evict(cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, keep=None):
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".npy"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if keep is not None and os.path.samefile(path, keep):
+            continue
+        try:
+            os.remove(path)
+        except OSError:  # Still mapped by another process on some platforms
+            continue
+        total -= size
+    return total
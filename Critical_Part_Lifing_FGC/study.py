@@ -0,0 +1,212 @@
+"""Parameter studies: crack growth over a cartesian grid or Monte Carlo sample of inputs.
+
+A study is described by a JSON-compatible spec::
+
+    {
+        "base": {...},                   # parameters shared by all scenarios (export_data format)
+        "grid": {"SMF": [20, 30, 40]},   # cartesian product of values, and/or
+        "monte_carlo": {"samples": 100000, "seed": 0,
+                        "params": {"C": ["lognormal", -23.7, 0.2], "SMF": ["uniform", 40, 60]}},
+        "chunk_size": 1000,
+        "max_cycles": 1e8                # cycle limit of every scenario (default ADAPTIVE_MAX_CYCLES)
+    }
+
+Monte Carlo entries name a ``numpy.random.Generator`` method and its arguments; with both
+grid and Monte Carlo entries every grid point gets its own sample. Scenarios are split into
+chunks which a ``ProcessPoolExecutor`` runs through the vectorized batch engine. Each
+finished chunk is written to the output directory as it completes, and a rerun skips
+the chunks already on disk, so an interrupted study resumes where it stopped.
+
+    python study.py spec.json results/ --workers 8
+    python study.py spec.json results/ --scaling
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from calculations import (ADAPTIVE_MAX_CYCLES, BATCH_PARAMS, calculate_crack_growth, calculate_crack_growth_batch,
+                          convert_params)
+from geometry import geometry_from_params
+from rate_laws import single_walker
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+# Function to count the scenarios of a study
+def study_size(spec):
+    size = 1
+    for values in spec.get("grid", {}).values():
+        size *= len(values)
+    if "monte_carlo" in spec:
+        size *= int(spec["monte_carlo"]["samples"])
+    return size
+
+
+def chunk_count(spec):
+    chunk_size = int(spec.get("chunk_size", DEFAULT_CHUNK_SIZE))
+    return -(-study_size(spec) // chunk_size)
+
+
+# Function to build the parameter arrays of one chunk of scenarios
+def chunk_params(spec, chunk_index):
+    chunk_size = int(spec.get("chunk_size", DEFAULT_CHUNK_SIZE))
+    start = chunk_index * chunk_size
+    scenario = np.arange(start, min(start + chunk_size, study_size(spec)))
+    params = {"scenario": scenario}
+
+    grid = spec.get("grid", {})
+    samples = int(spec["monte_carlo"]["samples"]) if "monte_carlo" in spec else 1
+    if grid:
+        # Scenario index -> (grid point, sample); the grid point is unravelled into one value per parameter
+        grid_index = np.unravel_index(scenario // samples, [len(values) for values in grid.values()])
+        for (key, values), index in zip(grid.items(), grid_index):
+            params[key] = np.asarray(values, dtype=float)[index]
+
+    if "monte_carlo" in spec:
+        # Every chunk has its own seed so chunks can be computed in any order and on resume
+        rng = np.random.default_rng([int(spec["monte_carlo"].get("seed", 0)), chunk_index])
+        for key, (distribution, *arguments) in spec["monte_carlo"]["params"].items():
+            params[key] = getattr(rng, distribution)(*arguments, size=scenario.size)
+    return params
+
+
+# Function to run one chunk of a study; executed in the worker processes
+def run_chunk(spec, chunk_index):
+    base = convert_params(spec.get("base", {}))
+    varying = chunk_params(spec, chunk_index)
+    params = {**base, **{key: value for key, value in varying.items() if key != "scenario"}}
+    # Far beyond practical lives by default, so scenarios run to failure rather than to the GUI's cycle limit
+    max_cycles = float(spec.get("max_cycles", ADAPTIVE_MAX_CYCLES))
+
+    batchable = (not base.get("spectrum_file") and single_walker(base) and geometry_from_params(base) == "legacy"
+                 and all(key in BATCH_PARAMS for key in varying if key != "scenario"))
+    if batchable:
+        results = calculate_crack_growth_batch(params, max_cycles=max_cycles)
+    else:
+        # Scenarios the batch engine cannot represent (spectrum loading, other rate laws or
+        # geometries, other varying inputs) run one by one
+        finals, stop_reasons = [], []
+        for i in range(varying["scenario"].size):
+            scenario = {key: (value[i] if np.ndim(value) else value) for key, value in params.items()}
+            history = calculate_crack_growth(scenario, max_cycles=max_cycles, output={"endpoints": True})
+            finals.append(history.records[-1].tolist())
+            stop_reasons.append(history.stop_reason)
+        finals = np.array(finals, dtype=float).reshape(-1, 4)
+        results = {"cycles": finals[:, 0], "crack_length_A": finals[:, 1], "crack_length_C": finals[:, 2],
+                   "crack_area": finals[:, 3], "stop_reason": np.array(stop_reasons, dtype=np.int8)}
+    return chunk_index, {**varying, **results}
+
+
+def _chunk_path(out_dir, chunk_index):
+    return os.path.join(out_dir, f"chunk_{chunk_index:06d}.npz")
+
+
+def _write_chunk(out_dir, chunk_index, arrays):
+    # Written under a temporary name and renamed, so a chunk file on disk is always complete
+    path = _chunk_path(out_dir, chunk_index)
+    with open(path + ".tmp", "wb") as file:
+        np.savez(file, **arrays)
+    os.replace(path + ".tmp", path)
+
+
+def run_study(spec, out_dir, workers=None, progress=None):
+    """Run all chunks of a study that are not yet in ``out_dir`` on a process pool.
+
+    At most two chunks per worker are in flight, so the scenario definitions are never
+    all in memory. ``progress(done, total)`` is called as chunks complete. Returns the
+    number of chunks computed by this call.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = os.path.join(out_dir, "study.json")
+    if os.path.exists(manifest):
+        with open(manifest, 'r') as file:
+            if json.load(file) != spec:
+                raise ValueError(f"{out_dir} holds results of a different study")
+    else:
+        with open(manifest, 'w') as file:
+            json.dump(spec, file, indent=2)
+
+    total = chunk_count(spec)
+    remaining = [index for index in range(total) if not os.path.exists(_chunk_path(out_dir, index))]
+    pending = iter(remaining)
+    done = total - len(remaining)
+    workers = workers or os.cpu_count()
+    computed = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = {executor.submit(run_chunk, spec, index) for index in itertools.islice(pending, 2 * workers)}
+        while in_flight:
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                chunk_index, arrays = future.result()
+                _write_chunk(out_dir, chunk_index, arrays)
+                computed += 1
+                if progress:
+                    progress(done + computed, total)
+            in_flight |= {executor.submit(run_chunk, spec, index) for index in itertools.islice(pending, len(finished))}
+    return computed
+
+
+# Function to concatenate the chunk files of a study into one dict of arrays
+def load_study_results(out_dir):
+    paths = sorted(name for name in os.listdir(out_dir) if name.startswith("chunk_") and name.endswith(".npz"))
+    chunks = []
+    for name in paths:
+        with np.load(os.path.join(out_dir, name)) as data:
+            chunks.append({key: data[key] for key in data.files})
+    if not chunks:
+        return {}
+    return {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
+
+
+# Powers of two up to, and including, the given number of workers
+def default_worker_counts(max_workers):
+    return sorted({1, *[2 ** k for k in range(1, max_workers.bit_length()) if 2 ** k < max_workers], max_workers})
+
+
+def measure_scaling(spec, worker_counts=None, chunks=None):
+    """Time the first ``chunks`` chunks of a study with each worker count.
+
+    Returns (workers, seconds, scenarios per second, parallel efficiency) tuples, where
+    efficiency is the speedup over one worker divided by the number of workers.
+    """
+    worker_counts = worker_counts or default_worker_counts(os.cpu_count())
+    chunks = min(chunks or 4 * max(worker_counts), chunk_count(spec))
+    scenarios = sum(chunk_params(spec, index)["scenario"].size for index in range(chunks))
+
+    rows = []
+    for workers in worker_counts:
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(run_chunk, itertools.repeat(spec, chunks), range(chunks)))
+        seconds = time.perf_counter() - start
+        single = rows[0][1] if rows else seconds
+        rows.append((workers, seconds, scenarios / seconds, single / (seconds * workers)))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a crack growth parameter study on a process pool")
+    parser.add_argument("spec", help="Study spec (JSON)")
+    parser.add_argument("out_dir", help="Directory for the chunk results and checkpoint")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--scaling", action="store_true", help="Report scaling efficiency from 1 to --workers workers instead")
+    args = parser.parse_args()
+
+    with open(args.spec, 'r') as file:
+        study_spec = json.load(file)
+
+    if args.scaling:
+        print(f"{'workers':>8} {'seconds':>10} {'scenarios/s':>14} {'efficiency':>11}")
+        for workers, seconds, rate, efficiency in measure_scaling(study_spec, default_worker_counts(args.workers or os.cpu_count())):
+            print(f"{workers:>8} {seconds:>10.3f} {rate:>14.1f} {efficiency:>11.2f}")
+    else:
+        started = time.perf_counter()
+        count = run_study(study_spec, args.out_dir, workers=args.workers,
+                          progress=lambda done, total: print(f"\r{done}/{total} chunks", end="", flush=True))
+        print(f"\n{count} chunks computed in {time.perf_counter() - started:.1f} s")
@@ -0,0 +1,38 @@
+"""Critical crack size from fracture toughness and the residual strength requirement.
+
+The part fails once the stress intensity at the highest applied stress reaches the
+fracture toughness. Where a residual strength requirement (Pxx) is given the crack must
+also carry that stress, so the critical size is set by the larger of the two stresses.
+The plane strain toughness KIC governs once the part is thick enough for plane strain
+(ASTM E399: thickness >= 2.5 (KIC / yield strength)^2); thinner parts use the plane
+stress toughness KC.
+"""
+import numpy as np
+
+PLANE_STRAIN_FACTOR = 2.5  # Thickness for plane strain, in units of (KIC / yield strength)^2
+
+
+# Function to choose the fracture toughness for the part thickness; 0 if no toughness is given
+def fracture_toughness(thickness, yield_strength, plane_stress_fracture_toughness, plane_strain_fracture_toughness):
+    thickness, yield_strength, KC, KIC = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (thickness, yield_strength, plane_stress_fracture_toughness,
+                                                       plane_strain_fracture_toughness)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plane_strain_thickness = np.where(yield_strength > 0, PLANE_STRAIN_FACTOR * (KIC / yield_strength) ** 2, 0.0)
+    plane_strain = (KIC > 0) & ((thickness >= plane_strain_thickness) | ~(KC > 0))
+    return np.where(plane_strain, KIC, np.where(KC > 0, KC, 0.0))
+
+
+def critical_crack_length(toughness, stress, beta, upper):
+    """Return the crack length a at which stress * beta * sqrt(pi * a) reaches the toughness.
+
+    All arguments may be scalars or scenario arrays. Scenarios that are still below the
+    toughness at ``upper`` (e.g. the remaining ligament) get ``upper``, and scenarios
+    without stress or toughness as well.
+    """
+    toughness, stress, beta, upper = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (toughness, stress, beta, upper)))
+    solvable = (toughness > 0) & (stress > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        length = (toughness / (stress * beta)) ** 2 / np.pi
+    return np.where(solvable, np.minimum(length, upper), upper)
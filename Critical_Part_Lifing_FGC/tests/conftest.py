@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+# The modules of the project import each other by their plain names
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import batch
+import kernels
+import results_store
+import spectrum_cache
+
+
+# Function to point a module constant, and the default arguments taken from it, at a new value
+def _patch_default(monkeypatch, module, name, value, functions):
+    old = getattr(module, name)
+    monkeypatch.setattr(module, name, value)
+    for function in functions:
+        monkeypatch.setattr(function, "__defaults__", tuple(value if default == old else default for default in function.__defaults__))
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Keep the spectrum cache, kernel cache and results store of every test in its tmp_path.
+
+    The paths are read from the environment at import and bound as default arguments, so the
+    module constants and those defaults are patched as well as the variables. The kernels
+    loaded when kernels.py is imported still come from the user's kernel cache.
+    """
+    paths = {"FGC_SPECTRUM_CACHE": str(tmp_path / "fgc_spectra"), "FGC_KERNEL_CACHE": str(tmp_path / "fgc_kernels"),
+             "FGC_RESULTS_STORE": str(tmp_path / "fgc_results.sqlite")}
+    for variable, path in paths.items():
+        monkeypatch.setenv(variable, path)
+    _patch_default(monkeypatch, spectrum_cache, "CACHE_DIR", paths["FGC_SPECTRUM_CACHE"],
+                   (spectrum_cache.load_cycle_stresses, spectrum_cache.evict))
+    _patch_default(monkeypatch, kernels, "KERNEL_CACHE", paths["FGC_KERNEL_CACHE"], (kernels.load_kernel,))
+    _patch_default(monkeypatch, results_store, "STORE_PATH", paths["FGC_RESULTS_STORE"], (results_store.ResultsStore.__init__,))
+    monkeypatch.setattr(batch, "STORE_PATH", paths["FGC_RESULTS_STORE"])  # Default of --store
+    return paths
@@ -0,0 +1,22 @@
+import csv
+import json
+import os
+
+import batch
+
+TEST_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test_data.json")
+
+
+def test_bad_inputs_fail_their_own_rows(tmp_path):
+    with open(TEST_DATA, 'r') as file:
+        params = json.load(file)
+    runs = tmp_path / "runs.jsonl"
+    runs.write_text("\n".join([json.dumps(params), "{not json", json.dumps({**params, "width": 0.0}), "[1, 2]"]) + "\n")
+    output = tmp_path / "results.csv"
+    assert batch.main([str(runs), "-o", str(output), "--method", "closed_form"]) == 1
+    with open(output, 'r', newline='') as file:
+        rows = list(csv.DictReader(file))
+    assert [row["source"] for row in rows] == [f"{runs}:{line}" for line in range(1, 5)]
+    assert rows[0]["error"] == "" and float(rows[0]["cycles"]) > 0
+    assert rows[1]["error"].startswith("JSONDecodeError")
+    assert all(row["error"] for row in rows[2:])
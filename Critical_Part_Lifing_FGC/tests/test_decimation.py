@@ -0,0 +1,26 @@
+import numpy as np
+
+from decimation import decimate, min_max_indices
+
+
+def test_bins_follow_x_not_point_counts():
+    # Most points crowd the first cycles, as in a history kept at every cycle and then per growth step
+    x = np.concatenate((np.arange(9000.0), np.linspace(9000.0, 1e6, 1000)))
+    y = np.sin(x / 50.0) + x / 1e6
+    bins = 100
+    index = min_max_indices(x, y, bins)
+    assert np.all(np.diff(index) > 0) and index[0] == 0 and index[-1] == x.size - 1
+    # Every pixel column keeps its own lowest and highest point
+    column = np.minimum((x / 1e6 * bins).astype(int), bins - 1)
+    for pixel in np.unique(column):
+        inside = column == pixel
+        assert y[index][column[index] == pixel].min() == y[inside].min()
+        assert y[index][column[index] == pixel].max() == y[inside].max()
+    # The dense start no longer takes most of the kept points
+    assert np.count_nonzero(x[index] < 9000.0) <= 4
+
+
+def test_decimate_keeps_short_series():
+    x = np.arange(10.0)
+    ((visible_x, visible_y),) = decimate(x, [x ** 2], 2.0, 5.0, 100)
+    assert np.array_equal(visible_x, x[1:7]) and np.array_equal(visible_y, x[1:7] ** 2)
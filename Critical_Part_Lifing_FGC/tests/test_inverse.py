@@ -0,0 +1,28 @@
+import json
+import os
+
+import pytest
+
+from calculations import convert_params
+from inverse import CrackCurve, ForwardCache, life
+
+TEST_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test_data.json")
+
+
+@pytest.fixture
+def params():
+    with open(TEST_DATA, 'r') as file:
+        return convert_params({key: value for key, value in json.load(file).items() if key != "material_name"})
+
+
+def test_default_cycle_limit_reaches_failure(params):
+    # The reference inputs fail after about 470000 cycles, far beyond the engines' 50000 cycle default
+    cache = ForwardCache()
+    assert 4e5 < life(params, cache=cache) < 6e5
+    curve = CrackCurve.from_params(params, cache=cache)
+    assert curve.failed and curve.inspection_interval(0.05) > 0
+
+
+def test_run_out_counts_at_the_cycle_limit(params):
+    assert life(params, max_cycles=50000, cache=ForwardCache()) == 50000
+    assert not CrackCurve.from_params(params, max_cycles=50000, cache=ForwardCache()).failed
@@ -0,0 +1,22 @@
+import os
+
+import numpy as np
+import pytest
+
+import kernels
+
+
+def test_mismatched_cache_file_is_generated_again(tmp_path):
+    pytest.importorskip("sympy")
+    kernel = kernels.load_kernel("crack_length", cache_dir=str(tmp_path))
+    (path,) = tmp_path.iterdir()
+    text = path.read_text()
+    assert text.startswith("# sha256: ")
+
+    # A changed body no longer matches the digest, so it is replaced instead of executed
+    path.write_text(text.replace("def crack_length", "raise RuntimeError\ndef crack_length"))
+    reloaded = kernels.load_kernel("crack_length", cache_dir=str(tmp_path))
+    assert path.read_text() == text
+    N = np.array([0.0, 1e4, 1e5])
+    assert np.array_equal(reloaded(N, 1e-6, 0.001, 3.87), kernel(N, 1e-6, 0.001, 3.87))
+    assert os.listdir(tmp_path) == [path.name]
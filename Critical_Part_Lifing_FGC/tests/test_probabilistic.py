@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from scipy.special import ndtri
+
+from calculations import calculate_crack_growth_batch
+from probabilistic import B_LIVES, run_probabilistic
+
+# Without toughness and threshold the life is proportional to 1 / (C SMF^n), so lognormal C and SMF
+# give a lognormal life whose B-lives are known exactly
+BASE = {"C": 5.28e-11, "n": 3.87, "m": 0.5, "SMF": 50.0, "width": 4.0, "hole_diameter": 0.5,
+        "initial_crack_length_A": 0.001, "initial_crack_length_C": 0.001, "delta_K_threshold_value": 0.0}
+SIGMA_C, SIGMA_SMF = 0.3, 0.05
+DISTRIBUTIONS = {"C": ["lognormal", np.log(BASE["C"]), SIGMA_C], "SMF": ["lognormal", np.log(BASE["SMF"]), SIGMA_SMF]}
+
+
+def exact_b_lives():
+    median = float(calculate_crack_growth_batch(BASE, max_cycles=1e8)["cycles"])
+    sigma = np.hypot(SIGMA_C, BASE["n"] * SIGMA_SMF)
+    return {name: median * np.exp(sigma * ndtri(probability)) for name, probability in B_LIVES.items()}
+
+
+# Function to count, per B-life, the runs whose confidence interval holds the exact value
+def coverage(runs, **kwargs):
+    exact = exact_b_lives()
+    covered = {name: 0 for name in exact}
+    for seed in range(runs):
+        result = run_probabilistic(BASE, DISTRIBUTIONS, seed=seed, **kwargs)
+        for name, percentile in result["percentiles"].items():
+            covered[name] += percentile["lower"] <= exact[name] <= percentile["upper"]
+    return covered
+
+
+# 95% intervals; the limits are about two binomial standard deviations below nominal
+@pytest.mark.parametrize("sampling", ["sobol", "random"])
+def test_importance_sampling_coverage(sampling):
+    covered = coverage(200, sampling=sampling, importance=True)
+    assert min(covered.values()) >= 180, covered
+
+
+def test_random_sampling_coverage():
+    covered = coverage(20, sampling="random", importance=False)
+    assert min(covered.values()) >= 17, covered
@@ -0,0 +1,42 @@
+import json
+
+import numpy as np
+import pytest
+
+from benchmark import GOLDEN_CASES, GOLDEN_DEFINITIONS, load_test_params, run_golden_case
+from calculations import calculate_crack_growth
+from closed_form import C2
+from geometry import legacy_beta
+from kernels import crack_length
+
+GOLDEN_RTOL = 1e-6  # Relative tolerance on the cycles and crack lengths of the golden cases
+
+with open(GOLDEN_CASES, 'r') as file:
+    GOLDEN = json.load(file)
+
+
+def test_every_golden_case_is_stored():
+    # A new definition needs its result stored with benchmark.py --update-golden
+    assert sorted(GOLDEN) == sorted(name for name, *_ in GOLDEN_DEFINITIONS)
+
+
+@pytest.mark.parametrize("name", sorted(GOLDEN))
+def test_golden_case(name):
+    result, reference = run_golden_case(name), GOLDEN[name]
+    assert result["stop_reason"] == reference["stop_reason"]
+    for key in ("cycles", "crack_length_A", "crack_length_C"):
+        assert result[key] == pytest.approx(reference[key], rel=GOLDEN_RTOL), key
+
+
+# a(N) of the integrators against the analytic crack_length(N, C2, a_i, n) at every stored point
+@pytest.mark.parametrize("method, tolerance", [("closed_form", 1e-12), ("fixed", 3e-2), ("adaptive", 1e-3)])
+@pytest.mark.parametrize("SMF", [30.0, 50.0, 70.0])
+def test_analytic_crack_length(method, tolerance, SMF):
+    params = dict(load_test_params(), delta_K_threshold_value=0.0, SMF=SMF)
+    a_i = float(params["initial_crack_length_A"])
+    C2_value = C2(float(params["C"]) / 2, legacy_beta(float(params["width"]), float(params["hole_diameter"])), SMF,
+                  float(params["n"]))
+    history = calculate_crack_growth(params, method=method, max_cycles=1e7)
+    mean_length = (history.crack_lengths_A + history.crack_lengths_C) / 2
+    error = np.max(np.abs(mean_length / crack_length(history.cycle_counts, C2_value, a_i, float(params["n"])) - 1))
+    assert error <= tolerance
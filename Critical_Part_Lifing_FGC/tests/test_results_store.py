@@ -0,0 +1,53 @@
+import json
+import os
+
+import numpy as np
+
+import batch
+from results_store import ResultsStore, parameter_hash
+
+TEST_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test_data.json")
+
+
+def load_params():
+    with open(TEST_DATA, 'r') as file:
+        return json.load(file)
+
+
+def test_hash_covers_cycle_limit_and_output_policy():
+    params = load_params()
+    assert parameter_hash(params) == parameter_hash(params, max_cycles=None, output={})
+    assert parameter_hash(params, max_cycles=1e5) == parameter_hash(params, max_cycles=100000)
+    assert parameter_hash(params, max_cycles=1e5) != parameter_hash(params)
+    assert parameter_hash(params, output={"every": 10}) != parameter_hash(params)
+    assert parameter_hash(params, output={"endpoints": False}) == parameter_hash(params)
+
+
+def test_summary_serves_runs_without_history(tmp_path):
+    params = load_params()
+    with ResultsStore(str(tmp_path / "runs.sqlite")) as store:
+        history, cached = store.run(params, method="fixed", max_cycles=1e4, keep_history=False)
+        assert not cached
+        summary, cached = store.run(params, method="fixed", max_cycles=1e4, keep_history=False)
+        assert cached and summary.stop_reason == history.stop_reason
+        assert np.array_equal(summary.records[[0, -1]], history.records[[0, -1]])
+        # A caller that needs the history recomputes it and replaces the summary
+        assert store.get(params, method="fixed", max_cycles=1e4) is None
+        full, cached = store.run(params, method="fixed", max_cycles=1e4)
+        assert not cached and full.size == history.size
+
+
+def test_batch_store_honours_output_policy(tmp_path):
+    params = load_params()
+    with ResultsStore(str(tmp_path / "runs.sqlite")) as store:
+        for _ in range(2):
+            _, _, history = batch.run_one("test", params, method="fixed", output={"every": 100}, store=store)
+            assert history.size == len(store.get(params, method="fixed", output={"every": 100}).records)
+        plain = batch.run_one("test", params, method="fixed", output={"every": 100})[2]
+        assert np.array_equal(history.records, plain.records)
+
+
+def test_default_store_is_kept_in_tmp_path(tmp_path):
+    with ResultsStore() as store:
+        store.run(load_params(), method="closed_form", keep_history=False)
+    assert os.path.exists(tmp_path / "fgc_results.sqlite")
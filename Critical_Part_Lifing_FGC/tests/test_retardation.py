@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from retardation import GeneralizedWillenborg, Willenborg
+
+
+# Cycle-by-cycle model: each cycle sees the boundary left by all earlier cycles, then may move it
+def reference(model, K_max, K_min, crack_length):
+    boundary = 0.0
+    delta_K, R = np.empty(K_max.size), np.empty(K_max.size)
+    for i in range(K_max.size):
+        delta_K[i], R[i] = model.effective(K_max[i], K_min[i], crack_length, boundary)
+        boundary = max(boundary, crack_length + float(model.plastic_zone(K_max[i])))
+    return delta_K, R, boundary
+
+
+@pytest.mark.parametrize("model", [Willenborg(60.0), GeneralizedWillenborg(60.0, 2.0, 2.5)])
+def test_windows_match_cycle_by_cycle(model):
+    rng = np.random.default_rng(0)
+    K_max = rng.uniform(5, 20, 500)
+    K_max[::50] *= 2.5  # Overloads
+    K_min = K_max * rng.uniform(-0.2, 0.5, K_max.size)
+    crack_length = 0.05
+    expected_delta_K, expected_R, expected_boundary = reference(model, K_max, K_min, crack_length)
+
+    # Windows of varying size, of which only the first cycles are committed, as the spectrum engine does
+    model.boundary = 0.0
+    delta_K, R = np.empty(K_max.size), np.empty(K_max.size)
+    start = 0
+    while start < K_max.size:
+        end = min(start + int(rng.integers(1, 80)), K_max.size)
+        window_delta_K, window_R = model.window(K_max[start:end], K_min[start:end], crack_length)
+        taken = int(rng.integers(1, end - start + 1))
+        model.advance(taken)
+        delta_K[start:start + taken], R[start:start + taken] = window_delta_K[:taken], window_R[:taken]
+        start += taken
+
+    assert np.allclose(delta_K, expected_delta_K) and np.allclose(R, expected_R)
+    assert model.boundary == pytest.approx(expected_boundary)
+    assert np.any(delta_K < K_max - K_min - 1e-9)  # Some cycles were retarded
@@ -0,0 +1,52 @@
+import functools
+import json
+import os
+
+import numpy as np
+import pytest
+
+import calculations
+from calculations import (STOP_MAX_CYCLES, CalculationCancelled, calculate_crack_growth, convert_params,
+                          iter_spectrum_stresses)
+from spectrum_cache import load_cycle_stresses
+
+TEST_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test_data.json")
+
+
+@pytest.fixture
+def params(tmp_path):
+    with open(TEST_DATA, 'r') as file:
+        params = convert_params({key: value for key, value in json.load(file).items() if key != "material_name"})
+    levels = np.abs(np.random.default_rng(0).normal(0.6, 0.25, 2000))
+    levels[::2] = 0.0  # Valleys at zero load
+    path = tmp_path / "spectrum.txt"
+    np.savetxt(path, levels)
+    return dict(params, SMF=40.0, spectrum_file=str(path))
+
+
+def pass_cycles(params):
+    return sum(float(count.sum()) for _, _, count in iter_spectrum_stresses(params["spectrum_file"], params["SMF"], 0.0))
+
+
+@pytest.mark.parametrize("passes", [1, 2])
+def test_cycle_limit_stops_on_max_cycles(params, passes):
+    # A limit just after the end of a pass cuts the next pass in its first cycle
+    max_cycles = passes * pass_cycles(params) + 0.25
+    history = calculate_crack_growth(params, max_cycles=max_cycles)
+    assert history.stop_reason == STOP_MAX_CYCLES
+    assert history.cycle_counts[-1] <= max_cycles
+
+
+def test_cancel_while_building_spectrum_cache(params, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(calculations, "load_cycle_stresses", functools.partial(load_cycle_stresses, cache_dir=str(cache_dir)))
+    calls = []
+
+    def cancel(cycle_counts, *histories):
+        calls.append(len(cycle_counts))
+        raise CalculationCancelled()
+
+    with pytest.raises(CalculationCancelled):
+        calculate_crack_growth(params, progress=cancel)
+    assert calls == [1]  # Called with the initial point, before any growth
+    assert not os.listdir(cache_dir)  # No partial cache entry is left behind
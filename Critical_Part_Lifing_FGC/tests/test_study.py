@@ -0,0 +1,31 @@
+import json
+import os
+
+import pytest
+
+from calculations import STOP_FRACTURE, STOP_MAX_CYCLES
+from study import run_chunk
+
+TEST_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test_data.json")
+
+
+@pytest.fixture
+def base():
+    with open(TEST_DATA, 'r') as file:
+        return {key: value for key, value in json.load(file).items() if key != "material_name"}
+
+
+def test_scenarios_run_to_failure(base):
+    # Lives of about 470000 and 130000 cycles, beyond the engines' 50000 cycle default
+    _, results = run_chunk({"base": base, "grid": {"SMF": [50, 70]}}, 0)
+    assert results["stop_reason"].tolist() == [STOP_FRACTURE, STOP_FRACTURE]
+    assert results["cycles"].min() > 50000
+
+
+# The batch engine runs the legacy geometry; the corner crack runs scenario by scenario
+@pytest.mark.parametrize("geometry", ["legacy", "corner_crack_at_hole"])
+def test_spec_cycle_limit(base, geometry):
+    spec = {"base": dict(base, geometry=geometry), "grid": {"SMF": [50, 70]}, "max_cycles": 2000}
+    _, results = run_chunk(spec, 0)
+    assert results["stop_reason"].tolist() == [STOP_MAX_CYCLES, STOP_MAX_CYCLES]
+    assert results["cycles"].tolist() == [2000, 2000]
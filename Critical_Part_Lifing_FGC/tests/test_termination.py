@@ -0,0 +1,26 @@
+import numpy as np
+
+from calculations import STOP_CRACK_AREA, STOP_FRACTURE, calculate_crack_growth_batch, failure_crack_length
+
+
+def test_ligament_caps_crack_without_toughness():
+    # Ligament (2 - 0.5) / 2 = 0.75 in, shorter than the mean length of 1 in at a crack area of 1 in^2
+    a_final, reason = failure_crack_length(50.0, 2.0, 0.5, 0.001, 0.001)
+    assert (float(a_final), int(reason)) == (0.75, STOP_FRACTURE)
+    # A wide plate reaches the crack area limit first
+    a_final, reason = failure_crack_length(50.0, 4.0, 0.5, 0.001, 0.001)
+    assert (float(a_final), int(reason)) == (1.0, STOP_CRACK_AREA)
+
+
+def test_ligament_is_reached_by_the_c_tip():
+    a_final, reason = failure_crack_length(50.0, 2.0, 0.5, 0.003, 0.001)
+    assert np.isclose(float(a_final) - 0.001, 0.75) and int(reason) == STOP_FRACTURE
+
+
+def test_batch_stops_at_ligament():
+    params = {"C": 5.28e-11, "n": 3.87, "m": 0.5, "SMF": 50.0, "width": np.array([2.0, 4.0]), "hole_diameter": 0.5,
+              "initial_crack_length_A": 0.001, "initial_crack_length_C": 0.001, "delta_K_threshold_value": 2.0}
+    for method in ("auto", "fixed"):
+        result = calculate_crack_growth_batch(params, method=method, max_cycles=1e7)
+        assert result["stop_reason"].tolist() == [STOP_FRACTURE, STOP_CRACK_AREA]
+        assert np.allclose(result["crack_length_C"], [0.75, 1.0])
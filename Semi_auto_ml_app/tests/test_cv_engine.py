@@ -0,0 +1,56 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import BaseEstimator, RegressorMixin
+from sklearn.linear_model import LinearRegression
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import cv_engine
+from utils.cv_engine import MAX_FAILED_FOLDS, cross_validate_models
+
+
+class FirstFoldFails(BaseEstimator, RegressorMixin):
+    # Fails to fit when the first rows are held out, i.e. on fold 0 only
+    def fit(self, X, Y):
+        if X.index[0] != 0:
+            raise RuntimeError("first fold")
+        self.mean_ = Y.mean()
+        return self
+
+    def predict(self, X):
+        return np.full(len(X), self.mean_)
+
+
+class AlwaysFails(BaseEstimator, RegressorMixin):
+    def fit(self, X, Y):
+        raise np.linalg.LinAlgError("singular matrix")
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(100, 3)), columns=['a', 'b', 'c'])
+    return X, pd.Series(X @ [1.0, 2.0, 3.0] + rng.normal(size=100), name='y')
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_failed_fold_scores_nan(data, n_jobs):
+    X, Y = data
+    models = [('flaky', FirstFoldFails()), ('broken', AlwaysFails()), ('linear', LinearRegression())]
+    cv = cross_validate_models(models, X, Y, 'r2', n_jobs=n_jobs)
+    assert np.isnan(cv['scores']['flaky'][0]) and np.isfinite(cv['scores']['flaky'][1:]).all()
+    assert cv['fold_errors'] == {'flaky': "RuntimeError: first fold"}
+    assert cv['errors'] == {'broken': "LinAlgError: singular matrix"}
+    assert 'broken' not in cv['scores'] and np.isfinite(cv['scores']['linear']).all()
+
+
+def test_failed_model_stops_after_max_failed_folds(data, monkeypatch):
+    X, Y = data
+    calls = []
+    fit_and_score = cv_engine._fit_and_score
+    monkeypatch.setattr(cv_engine, '_fit_and_score', lambda model, *args: calls.append(model) or fit_and_score(model, *args))
+    cv = cross_validate_models([('broken', AlwaysFails())], X, Y, 'r2', n_jobs=1)
+    assert len(calls) == MAX_FAILED_FOLDS and 'broken' in cv['errors']
@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Script rendering the EDA page for a small mixed dataset
+def eda_script(app_dir):
+    import sys
+    import pandas as pd
+    import streamlit as st
+    sys.path.insert(0, app_dir)
+    from utils.data_utils import categorize_columns
+    from utils.eda import run_eda
+
+    if 'df' not in st.session_state:
+        df = pd.DataFrame({'material': ['steel', 'alu', 'ti', 'steel'] * 5, 'grade': [1, 2, 1, 2] * 5,
+                           'strength': [float(i) for i in range(20)]})
+        st.session_state['df'] = df
+        (st.session_state['numerical_discrete_cols'], st.session_state['numerical_continuous_cols'],
+         st.session_state['categorical_cols']) = categorize_columns(df)
+    run_eda()
+
+
+def test_show_feature_types():
+    app = AppTest.from_function(eda_script, args=(APP_DIR,))
+    app.run()
+    app.checkbox[0].check().run()
+    assert not app.exception
+    table = app.table[0].value
+    assert dict(zip(table["Feature Name"], table["Type"])) == {
+        'material': 'Categorical', 'grade': 'Numerical Discrete Binary', 'strength': 'Numerical Continuous'}
@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+from utils.file_utils import read_server_dataset
+
+
+# Script rendering the main page from the datasets folder of the working directory
+def main_page_script(app_dir):
+    import sys
+    sys.path.insert(0, app_dir)
+    from utils.main_page import main_page
+
+    main_page()
+
+
+def test_server_dataset_reports_memory_after_rerun(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('datasets')
+    (tmp_path / 'datasets' / 'foo.csv').write_text("grade,strength\n" + "".join(f"{i % 3},{i}.5\n" for i in range(50)))
+    (tmp_path / 'datasets' / 'foo.txt').write_text("label\n" + "a\nb\n" * 10)
+
+    app = AppTest.from_function(main_page_script, args=(APP_DIR,), default_timeout=30)
+    app.run()
+    app.sidebar.radio[0].set_value("Select from Server").run()
+    app.sidebar.selectbox[0].set_value("foo.csv").run()
+    app.sidebar.button[1].click().run()  # Confirm Selection
+    assert not app.exception
+    assert any(caption.value.startswith("Loaded 50 rows") for caption in app.sidebar.caption)
+
+    # Datasets differing only in their suffix keep separate Parquet copies
+    df, _ = read_server_dataset('foo.txt')
+    assert df.columns.to_list() == ['label']
+    assert sorted(name for name in os.listdir('datasets') if name.endswith('.parquet')) == ['foo.csv.parquet', 'foo.txt.parquet']
@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.job_queue import QUEUED, RUNNING, JobQueue
+
+
+def test_jobs_of_dead_workers_are_claimed_again(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    X, Y = pd.DataFrame({'x': [1.0, 2.0]}), pd.Series([0, 1], name='y')
+    first = queue.submit('alice', 'a', [('LR', None)], X, Y, 'accuracy')
+    second = queue.submit('alice', 'b', [('LR', None)], X, Y, 'accuracy')
+
+    dead = subprocess.Popen([sys.executable, '-c', 'pass'])
+    dead.wait()
+    assert queue.claim(dead.pid)[0] == first
+    assert queue.job(first)['status'] == RUNNING
+
+    # The next claim requeues the job of the dead worker and hands it out again, as the only running job
+    job_id, _, running = queue.claim(os.getpid())
+    assert (job_id, running) == (first, 1)
+    assert queue.job(second)['status'] == QUEUED
+    assert queue.claim(os.getpid())[::2] == (second, 2)
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import profiler
+from utils.data_utils import sample_dataframe
+
+
+# Function to count the columns actually profiled while calling fn
+def profiled_columns(monkeypatch, fn):
+    calls = []
+    profile_column = profiler.profile_column
+    monkeypatch.setattr(profiler, 'profile_column', lambda series: calls.append(series.name) or profile_column(series))
+    fn()
+    return calls
+
+
+def test_resampled_dataframe_reuses_profile(monkeypatch):
+    df = pd.DataFrame({'x': np.arange(300000) % 97, 'label': np.where(np.arange(300000) % 3, 'a', 'b')})
+    assert sorted(profiled_columns(monkeypatch, lambda: profiler.profile_dataframe(sample_dataframe(df)))) == ['label', 'x']
+    # Every rerun of a page samples the dataframe again
+    assert sample_dataframe(df) is sample_dataframe(df)
+    assert profiled_columns(monkeypatch, lambda: profiler.profile_dataframe(sample_dataframe(df))) == []
+
+
+def test_edits_change_profile():
+    df = pd.DataFrame({'x': [1.0, np.nan, 3.0, np.nan], 'y': [1, 2, 3, 4]})
+    assert profiler.column_profile(df, 'x').nulls == 2
+    df.loc[df['x'].isna(), 'x'] = 2.0
+    profiler.mark_edited(df)
+    profile = profiler.column_profile(df, 'x')
+    assert (profile.nulls, profile.unique, profile.min, profile.max) == (0, 3, 1.0, 3.0)
+    # Structural changes need no marking
+    df.drop(columns=['y'], inplace=True)
+    assert list(profiler.profile_dataframe(df)) == ['x']
+    df['x'] = df['x'].astype('int64')
+    assert profiler.column_profile(df, 'x').dtype == np.dtype('int64')
@@ -0,0 +1,161 @@
+import os
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, as_completed
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import KFold
+from utils.results_cache import cv_key, dataset_hash
+
+# Rough relative fit cost of each estimator, used to start the slowest (model, fold) tasks first
+# so that no long fit is left running alone at the end of the run
+EXPECTED_COST = {
+    'SVC': 50,
+    'SVR': 50,
+    'GradientBoostingRegressor': 40,
+    'RandomForestClassifier': 30,
+    'RandomForestRegressor': 30,
+    'LogisticRegression': 5,
+    'KNeighborsClassifier': 4,
+    'KNeighborsRegressor': 4,
+    'DecisionTreeClassifier': 3,
+    'DecisionTreeRegressor': 3,
+    'LinearDiscriminantAnalysis': 2,
+    'LinearRegression': 1,
+    'GaussianNB': 1,
+}
+DEFAULT_COST = 10  # Expected cost of estimators not in the table
+MAX_FAILED_FOLDS = 3  # Failed folds without a successful one after which a model's remaining folds are cancelled
+
+# Dataset of the worker process, sent once per worker instead of once per task
+_X = None
+_Y = None
+
+
+def _init_worker(X, Y):
+    global _X, _Y
+    _X, _Y = X, Y
+    # One BLAS/OpenMP thread per worker, so the processes do not oversubscribe the cores
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(1)
+
+
+# Function to fit one model on one fold and score it on the held-out part, like cross_val_score does
+def _fit_and_score(model, train_index, test_index, scoring, X=None, Y=None):
+    X = _X if X is None else X
+    Y = _Y if Y is None else Y
+    start = time.perf_counter()
+    estimator = clone(model)
+    estimator.fit(X.iloc[train_index], Y.iloc[train_index])
+    score = check_scoring(estimator, scoring=scoring)(estimator, X.iloc[test_index], Y.iloc[test_index])
+    return float(score), time.perf_counter() - start
+
+
+# Function to estimate the relative fit cost of a model
+def expected_cost(model):
+    return EXPECTED_COST.get(type(model).__name__, DEFAULT_COST)
+
+
+def cross_validate_models(models, X, Y, scoring, n_splits=10, n_jobs=None, progress=None, cache=None):
+    """Cross validate every (name, model) pair with KFold(n_splits), one process pool task per model and fold.
+
+    The tasks are submitted in order of decreasing expected cost. progress(fraction) is called
+    after every finished task. Returns a dict with the fold scores of each model (in fold order),
+    the error message of each model that failed, the wall-clock time, the summed task time
+    (the time the serial path would take) and the number of worker processes.
+
+    As with cross_val_score's error_score=nan, a fold that raises scores nan and the model
+    keeps its other folds; the first error of each such model is listed under 'fold_errors'.
+    A model whose first MAX_FAILED_FOLDS folds all fail has its remaining folds cancelled
+    and is listed under 'errors' instead, like cross_val_score raising when every fit fails.
+
+    With a ResultsCache, models already cross validated on the same data, target, scoring and
+    folds with the same parameters are taken from the cache (listed under 'cached') and the
+    new scores are stored in it.
+    """
+    keys = {}
+    scores = {}
+    if cache is not None:
+        data_hash = dataset_hash(X, Y)
+        keys = {name: cv_key(data_hash, Y.name, scoring, f"KFold(n_splits={n_splits})", model) for name, model in models}
+        for name, _ in models:
+            cached = cache.get(keys[name])
+            if cached is not None:
+                scores[name] = cached
+    cached_names = list(scores)
+
+    folds = list(KFold(n_splits=n_splits).split(X))
+    tasks = [(name, model, fold) for name, model in models if name not in scores for fold in range(len(folds))]
+    tasks.sort(key=lambda task: expected_cost(task[1]), reverse=True)
+    n_jobs = min(n_jobs or os.cpu_count() or 1, max(len(tasks), 1))
+
+    scores.update((name, np.full(len(folds), np.nan)) for name, _ in models if name not in scores)
+    errors = {}
+    fold_errors = {}
+    failed_folds = {}
+    succeeded = set()
+    serial_seconds = 0.0
+    start = time.perf_counter()
+
+    # Function to record a finished task; returns True if its model has now failed
+    def finish(task, result, error, done):
+        nonlocal serial_seconds
+        name, _, fold = task
+        if progress:
+            progress(done / len(tasks))
+        if error is None:
+            scores[name][fold], seconds = result
+            serial_seconds += seconds
+            succeeded.add(name)
+            return False
+        fold_errors.setdefault(name, f"{type(error).__name__}: {error}")
+        failed_folds[name] = failed_folds.get(name, 0) + 1
+        if name not in succeeded and failed_folds[name] >= min(MAX_FAILED_FOLDS, len(folds)):
+            errors[name] = fold_errors.pop(name)
+            return True
+        return False
+
+    if n_jobs == 1:
+        for done, (name, model, fold) in enumerate(tasks, start=1):
+            if name in errors:
+                continue
+            try:
+                finish((name, model, fold), _fit_and_score(model, *folds[fold], scoring, X, Y), None, done)
+            except Exception as e:  # Any error of the estimator fails the fold only, as in cross_val_score
+                finish((name, model, fold), None, e, done)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(X, Y)) as executor:
+            futures = {executor.submit(_fit_and_score, model, *folds[fold], scoring): (name, model, fold)
+                       for name, model, fold in tasks}
+            for done, future in enumerate(as_completed(futures), start=1):
+                task = futures[future]
+                try:
+                    result, error = future.result(), None
+                except CancelledError:
+                    if progress:
+                        progress(done / len(tasks))
+                    continue
+                except Exception as e:  # Raised in the worker, or the worker died
+                    result, error = None, e
+                if finish(task, result, error, done):
+                    for other, (name, _, _) in futures.items():
+                        if name == task[0]:
+                            other.cancel()  # Only tasks not yet started are cancelled
+
+    for name in errors:
+        del scores[name]
+    if cache is not None:
+        for name in scores:
+            # Failed folds may be passing trouble (e.g. memory), so their models are trained again next time
+            if name not in cached_names and name not in fold_errors:
+                cache.put(keys[name], scores[name])
+    return {
+        'scores': scores,
+        'errors': errors,
+        'fold_errors': fold_errors,
+        'cached': cached_names,
+        'wall_seconds': time.perf_counter() - start,
+        'serial_seconds': serial_seconds,
+        'workers': n_jobs,
+    }
@@ -2,7 +2,8 @@ import streamlit as st
 import pandas as pd
 from sklearn.preprocessing import LabelEncoder
 from sklearn.impute import SimpleImputer
-from utils.data_utils import sample_dataframe, determine_feature_type
+from utils.data_utils import sample_dataframe, feature_types
+from utils.profiler import mark_edited, profile_dataframe
 
 
 def run_preprocess():
@@ -95,7 +96,7 @@ def run_preprocess():
 
     if st.button("Handle Missing Values"):
         # Handle missing values
-        missing_info = df.isnull().sum()
+        missing_info = pd.Series({col: profile.nulls for col, profile in profile_dataframe(df).items()})
         columns_with_missing = missing_info[missing_info > 0].index.tolist()
         if columns_with_missing:
             st.write("Columns with missing values and the count of missing values:")
@@ -113,12 +114,14 @@ def run_preprocess():
             # Apply imputers to df
             df[numeric_cols] = num_imputer.fit_transform(df[numeric_cols])
             df[categorical_cols] = cat_imputer.fit_transform(df[categorical_cols])
+            mark_edited(df)  # The values changed in place
 
             # Check if label encoding is complete and df_encoded is not None
             if  label_enc_complete and df_encoded is not None:
                 # Apply imputers to df_encoded
                 df_encoded[numeric_cols] = num_imputer.transform(df_encoded[numeric_cols])
                 df_encoded[categorical_cols] = cat_imputer.transform(df_encoded[categorical_cols])
+                mark_edited(df_encoded)
 
             st.write(f"Missing values were handled: Numeric columns were filled with mean values, and categorical columns were filled with the most frequent values.")
         else:
@@ -128,9 +131,10 @@ def run_preprocess():
     st.session_state['df'] = df
 
     # Update numerical and categorical columns lists
-    st.session_state['numerical_discrete_cols'] = [col for col in df.columns if determine_feature_type(df, col) == 'Numerical Discrete']
-    st.session_state['numerical_continuous_cols'] = [col for col in df.columns if determine_feature_type(df, col) == 'Numerical Continuous']
-    st.session_state['categorical_cols'] = [col for col in df.columns if determine_feature_type(df, col) == 'Categorical']
+    types = feature_types(df)
+    st.session_state['numerical_discrete_cols'] = [col for col, feature_type in types.items() if feature_type == 'Numerical Discrete']
+    st.session_state['numerical_continuous_cols'] = [col for col, feature_type in types.items() if feature_type == 'Numerical Continuous']
+    st.session_state['categorical_cols'] = [col for col, feature_type in types.items() if feature_type == 'Categorical']
 
 
 def label_encode_categorical_features(df, categorical_cols):
@@ -1,18 +1,32 @@
+import weakref
+
 import pandas as pd 
+from utils.profiler import column_profile, content_key, profile_dataframe
+
+# Samples of the dataframes in use, by id(df): (weak reference to df, content key of df, sample). Every rerun of a
+# page gets the same sample object back, so its cached profile is found again
+_samples = {}
 
 # Sampling the dataset if it's too large
 def sample_dataframe(df, max_samples=100000):
 	if len(df) > max_samples:
-		return df.sample(n=max_samples, random_state=42)
+		key = (content_key(df), max_samples)
+		entry = _samples.get(id(df))
+		if entry is None or entry[0]() is not df or entry[1] != key:
+			df_id = id(df)
+			entry = (weakref.ref(df, lambda _: _samples.pop(df_id, None)), key, df.sample(n=max_samples, random_state=42))
+			_samples[df_id] = entry
+		return entry[2]
 	else:
 		return df
 
 def check_variable_type(df, col):
+    profile = column_profile(df, col)
 
-    if df[col].dtype == 'object':
+    if profile.is_object:
         return 'Categorical'
 
-    unique_values = df[col].nunique()
+    unique_values = profile.unique
 
     if unique_values < 5:
         return 'Numerical Binary' if unique_values == 2 else 'Numerical Multiclass'
@@ -21,34 +35,40 @@ def check_variable_type(df, col):
     else:
         return 'Numerical Continuous'
 
-# Function to determine feature types
+# Function to determine feature types from the column profile (dtype and distinct values from one cached pass)
 def determine_feature_type(df, col):
+    return feature_type_of(column_profile(df, col))
+
+def feature_type_of(profile):
     # Determine data type
-    if df[col].dtype == 'object':
+    if profile.is_object:
         return "Categorical"
-    elif pd.api.types.is_numeric_dtype(df[col]):
-        if df[col].nunique() > 10:
+    elif profile.is_numeric:
+        if profile.unique > 10:
             return "Numerical Continuous"
         else:
-            if df[col].nunique() == 1:
+            if profile.unique == 1:
                 return "Numerical Discrete Single Variate"
-            elif df[col].nunique() == 2:
+            elif profile.unique == 2:
                 return "Numerical Discrete Binary"
             else:
                 return "Numerical Discrete"
-    elif pd.api.types.is_datetime64_any_dtype(df[col]):
+    elif profile.is_datetime:
         return "Date"
     else:
         return "Other"
 
+# Function to determine the feature type of every column, profiling the dataframe once
+def feature_types(df):
+    return {col: feature_type_of(profile) for col, profile in profile_dataframe(df).items()}
+
 # Function to categorize columns into different lists based on feature types
 def categorize_columns(df):
     numerical_discrete_cols = []
     numerical_continuous_cols = []
     categorical_cols = []
 
-    for col in df.columns:
-        feature_type = determine_feature_type(df, col)
+    for col, feature_type in feature_types(df).items():
         if feature_type == "Numerical Discrete" or feature_type == "Numerical Discrete Single Variate" or feature_type == "Numerical Discrete Binary":
             numerical_discrete_cols.append(col)
         elif feature_type == "Numerical Continuous":
@@ -2,7 +2,8 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from utils.data_utils import determine_feature_type
+from utils.data_utils import feature_types
+from utils.profiler import column_profile
 
 def styled_message(message):
     """Function to return a styled message"""
@@ -30,17 +31,16 @@ def run_eda():
         st.markdown(styled_message("Numerical Discrete Single Variate: 1 Unique Value \n Numerical Discrete Binary: 2 Unique Values \
             Numerical Discrete: <=10 Unique Values\n Numerical Continuous: >10 Unique Values"), unsafe_allow_html=True)
 
-        feature_types = {
+        type_table = {
             "Feature Name": [],
             "Type": []
         }
-        for col in df.columns:
-            feature_type = determine_feature_type(df, col)
+        for col, feature_type in feature_types(df).items():
             if feature_type:
-                feature_types["Feature Name"].append(col)
-                feature_types["Type"].append(feature_type)
+                type_table["Feature Name"].append(col)
+                type_table["Type"].append(feature_type)
 
-        st.table(pd.DataFrame(feature_types))
+        st.table(pd.DataFrame(type_table))
 
     # Moved parts are now in main_page.py
     if st.checkbox("Correlation Plot(Matplotlib)"):
@@ -62,8 +62,9 @@ def run_eda():
         all_columns = df.columns.to_list()
         column_to_plot = st.selectbox("Select 1 Column", all_columns)
 
-        if df[column_to_plot].dtype == 'object':
-            if df[column_to_plot].nunique() <= 30:
+        profile = column_profile(df, column_to_plot)
+        if profile.is_object:
+            if profile.unique <= 30:
                 fig, ax = plt.subplots()
                 pie_data = df[column_to_plot].value_counts()
                 ax.pie(pie_data, labels=pie_data.index, autopct="%1.1f%%", startangle=140)
@@ -1,9 +1,15 @@
 import os
 import json
 import base64
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+CHUNK_ROWS = 200000  # Rows parsed and downcast at a time
+CATEGORY_MAX_UNIQUE = 1000  # String columns with at most this many distinct values become category
+CATEGORY_MAX_UNIQUE_RATIO = 0.5  # ... provided they repeat, i.e. distinct values are at most this share of the rows
+DATASET_EXTENSIONS = ('.csv', '.txt')
+
 def writetofile(text,file_name):
 	with open(os.path.join('downloads',file_name),'w') as f:
 		f.write(text)
@@ -19,6 +25,96 @@ def download_file(data, file_name):
     href = f'<a href="data:file/json;base64,{b64}" download="{file_name}">Download {file_name}</a>'
     return href
 
+# Function to downcast the numeric columns of a chunk to the smallest dtype that holds their values exactly
+def downcast_numeric(df):
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_integer_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            df[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series.dtype):
+            # Floats only go to float32 when no value changes, so statistics and models see the same data
+            as_float32 = series.astype(np.float32)
+            if np.array_equal(as_float32.to_numpy(dtype=np.float64), series.to_numpy(dtype=np.float64), equal_nan=True):
+                df[col] = as_float32
+    return df
+
+
+def ingest_csv(source, chunksize=CHUNK_ROWS):
+    """Read a CSV in chunks with downcast numeric dtypes and low-cardinality strings as category.
+
+    Returns the dataframe and a report with the rows and the memory of the plain
+    read_csv result and of the typed dataframe, in bytes.
+    """
+    chunks = []
+    memory_before = 0
+    for chunk in pd.read_csv(source, chunksize=chunksize):
+        memory_before += int(chunk.memory_usage(deep=True).sum())
+        chunks.append(downcast_numeric(chunk))
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    # Chunks disagreeing on a small dtype are combined into a wider one; downcast the combined column again
+    df = downcast_numeric(df)
+
+    for col in df.columns:
+        if df[col].dtype == 'object' or isinstance(df[col].dtype, pd.StringDtype):
+            unique = df[col].nunique()
+            if unique <= CATEGORY_MAX_UNIQUE and unique <= CATEGORY_MAX_UNIQUE_RATIO * len(df):
+                df[col] = df[col].astype('category')
+
+    report = {'rows': len(df), 'memory_before': memory_before, 'memory_after': int(df.memory_usage(deep=True).sum())}
+    return df, report
+
+
+# Function to describe the memory saved by the typed ingestion
+def memory_report(report):
+    before, after = report['memory_before'], report['memory_after']
+    saved = 1 - after / before if before else 0
+    return (f"Loaded {report['rows']} rows in {after / 2**20:.1f} MB instead of {before / 2**20:.1f} MB "
+            f"({saved:.0%} less memory).")
+
+
+# Function to get the Parquet copy of a dataset in the datasets folder; the name keeps the source suffix so
+# foo.csv and foo.txt get separate copies
+def parquet_path(dataset):
+    return os.path.join('datasets', dataset + '.parquet')
+
+
+def read_server_dataset(dataset, columns=None):
+    """Return (dataframe, report) of a dataset in the datasets folder.
+
+    The first load ingests the CSV and saves a Parquet copy next to it; later loads read
+    only the requested columns from the Parquet copy while it is newer than the CSV. The
+    report is None for Parquet reads.
+    """
+    csv_path = os.path.join('datasets', dataset)
+    parquet = parquet_path(dataset)
+    if os.path.exists(parquet) and os.path.getmtime(parquet) >= os.path.getmtime(csv_path):
+        try:
+            return pd.read_parquet(parquet, columns=columns), None
+        except ImportError:  # pyarrow is not installed
+            pass
+
+    df, report = ingest_csv(csv_path)
+    try:
+        df.to_parquet(parquet, index=False)
+    except (ImportError, OSError, ValueError):  # No pyarrow, read-only folder or a column Parquet cannot hold
+        pass
+    if columns:
+        df = df[columns]
+    return df, report
+
+
+# Function to list the columns of a dataset without loading it, from its Parquet copy when there is one
+def dataset_columns(dataset):
+    parquet = parquet_path(dataset)
+    csv_path = os.path.join('datasets', dataset)
+    try:
+        if os.path.exists(parquet) and os.path.getmtime(parquet) >= os.path.getmtime(csv_path):
+            import pyarrow.parquet as pq
+            return pq.read_schema(parquet).names
+    except ImportError:
+        pass
+    return pd.read_csv(csv_path, nrows=0).columns.to_list()
+
 # Function to load dataset from file uploader or predefined folder
 def load_dataset():
     # Check if datasets folder exists
@@ -31,16 +127,18 @@ def load_dataset():
     if choice == "Upload a Dataset":
         uploaded_data = st.sidebar.file_uploader("Upload a Dataset", type=["csv", "txt"])
         if uploaded_data is not None:
-            df = pd.read_csv(uploaded_data)
+            df, report = ingest_csv(uploaded_data)
             st.sidebar.success("Dataset uploaded successfully.")
+            st.session_state['ingest_report'] = report  # Shown by the main page after its rerun
             return df
         else:
             st.info("Please upload a dataset to proceed.")
             return None
 
     elif choice == "Select from Server":
-        # List datasets in the folder
-        datasets_list = os.listdir('datasets')
+        # List datasets in the folder; their Parquet copies are used behind the scenes
+        datasets_list = sorted(name for name in os.listdir('datasets')
+                               if name.lower().endswith(DATASET_EXTENSIONS) and os.path.isfile(os.path.join('datasets', name)))
 
         if not datasets_list:
             st.sidebar.info("No datasets found on the server.")
@@ -48,6 +146,9 @@ def load_dataset():
 
         selected_dataset = st.sidebar.selectbox("Select a Dataset", datasets_list)
         if selected_dataset:
+            # Only the chosen columns are read (from the Parquet copy once the dataset has been loaded before)
+            all_columns = dataset_columns(selected_dataset)
+            st.session_state['dataset_columns'] = st.sidebar.multiselect("Columns to load", all_columns, default=all_columns)
             st.info(f"Dataset '{selected_dataset}' selected. Confirm selection in the sidebar to proceed.")
             return selected_dataset  # Return the dataset name for confirmation
 
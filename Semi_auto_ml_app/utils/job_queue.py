@@ -0,0 +1,207 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import pickle
+import sqlite3
+import time
+import uuid
+
+import joblib
+
+from utils.cv_engine import cross_validate_models
+from utils.results_cache import ResultsCache, cv_key, dataset_hash
+
+JOBS_DB = os.environ.get('AUTOML_JOBS_DB', os.path.join('cache', 'jobs.sqlite'))
+JOB_WORKERS = int(os.environ.get('AUTOML_JOB_WORKERS', 2))  # Training jobs run at the same time
+POLL_SECONDS = 1.0  # How often an idle worker looks for a new job
+PROGRESS_INTERVAL = 0.5  # Least time between two progress updates of a job, in seconds
+KEEP_SECONDS = 7 * 24 * 3600  # Finished jobs older than this are deleted
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+
+# Function to build the key of a training request: the same models, data, target, scoring and folds give the same key
+def training_key(models, X, Y, scoring, n_splits=10):
+    data_hash = dataset_hash(X, Y)
+    keys = [[name, cv_key(data_hash, Y.name, scoring, f"KFold(n_splits={n_splits})", model)] for name, model in models]
+    return hashlib.sha256(json.dumps(keys).encode()).hexdigest()
+
+
+class JobQueue:
+    """Training jobs in an SQLite database, run by worker processes outside the Streamlit script.
+
+    A job holds the selected models, the data and the scoring of one "Train Selected Models"
+    request; the data itself is kept in a joblib file next to the database until the job ends.
+    Jobs, their progress and their results live in the database, so they survive page switches,
+    browser reloads and restarts of the app. Each job belongs to an owner (one browser user);
+    a free worker takes the oldest queued job of the owner with the fewest running jobs, so one
+    user's long queue does not hold back everybody else.
+    """
+
+    def __init__(self, path=JOBS_DB):
+        self.path = path
+        self.payload_dir = os.path.join(os.path.dirname(path) or '.', 'job_payloads')
+        os.makedirs(self.payload_dir, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")  # Pages polling status do not block the workers
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, owner TEXT, job_key TEXT, "
+                "status TEXT, created REAL, started REAL, finished REAL, progress REAL, worker INTEGER, "
+                "models TEXT, payload TEXT, result BLOB, error TEXT)")
+            connection.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created)")
+            connection.execute("CREATE INDEX IF NOT EXISTS jobs_owner ON jobs (owner, job_key)")
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def submit(self, owner, job_key, models, X, Y, scoring, n_splits=10):
+        payload = os.path.join(self.payload_dir, f"{uuid.uuid4().hex}.joblib")
+        joblib.dump({'models': models, 'X': X, 'Y': Y, 'scoring': scoring, 'n_splits': n_splits}, payload)
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO jobs (owner, job_key, status, created, progress, models, payload) VALUES (?, ?, ?, ?, 0, ?, ?)",
+                (owner, job_key, QUEUED, time.time(), json.dumps([name for name, _ in models]), payload))
+            return cursor.lastrowid
+
+    # Function to turn a database row into a job dict, with the result unpickled
+    @staticmethod
+    def _job(row):
+        if row is None:
+            return None
+        job = dict(row)
+        job['models'] = json.loads(job['models'])
+        job['result'] = pickle.loads(job['result']) if job['result'] is not None else None
+        del job['payload']
+        return job
+
+    def job(self, job_id):
+        with self._connect() as connection:
+            return self._job(connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def find(self, owner, job_key):
+        """Return the latest job of the owner for this request, or None."""
+        with self._connect() as connection:
+            return self._job(connection.execute(
+                "SELECT * FROM jobs WHERE owner = ? AND job_key = ? ORDER BY id DESC LIMIT 1", (owner, job_key)).fetchone())
+
+    def jobs(self, owner):
+        with self._connect() as connection:
+            rows = connection.execute("SELECT * FROM jobs WHERE owner = ? ORDER BY id DESC", (owner,)).fetchall()
+        return [self._job(row) for row in rows]
+
+    def position(self, job_id):
+        # Number of queued jobs created before this one
+        with self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM jobs WHERE status = ? AND id < ?", (QUEUED, job_id)).fetchone()[0]
+
+    def claim(self, worker):
+        """Mark the next job as running on the worker and return (job id, payload path, running jobs), or None.
+
+        Jobs left running by a worker that died are requeued first, so the other workers pick them up.
+        """
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")  # Only one worker picks at a time
+            _requeue_orphans(connection)
+            row = connection.execute(
+                "SELECT id, payload FROM jobs AS queued WHERE status = ? ORDER BY "
+                "(SELECT COUNT(*) FROM jobs WHERE owner = queued.owner AND status = ?), created LIMIT 1",
+                (QUEUED, RUNNING)).fetchone()
+            if row is not None:
+                connection.execute("UPDATE jobs SET status = ?, started = ?, worker = ? WHERE id = ?",
+                                   (RUNNING, time.time(), worker, row['id']))
+                running = connection.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (RUNNING,)).fetchone()[0]
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+        return None if row is None else (row['id'], row['payload'], running)
+
+    def set_progress(self, job_id, fraction):
+        with self._connect() as connection:
+            connection.execute("UPDATE jobs SET progress = ? WHERE id = ?", (fraction, job_id))
+
+    def finish(self, job_id, result=None, error=None):
+        with self._connect() as connection:
+            row = connection.execute("SELECT payload FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            connection.execute(
+                "UPDATE jobs SET status = ?, finished = ?, progress = 1, result = ?, error = ?, payload = NULL WHERE id = ?",
+                (FAILED if error else DONE, time.time(), None if error else pickle.dumps(result), error, job_id))
+        if row is not None and row['payload']:
+            try:
+                os.remove(row['payload'])
+            except OSError:
+                pass
+
+    def recover(self):
+        """Requeue jobs whose worker process is gone and delete finished jobs older than KEEP_SECONDS."""
+        with self._connect() as connection:
+            _requeue_orphans(connection)
+            connection.execute("DELETE FROM jobs WHERE status IN (?, ?) AND finished < ?",
+                               (DONE, FAILED, time.time() - KEEP_SECONDS))
+
+    def start_workers(self, n_workers=JOB_WORKERS):
+        """Start the worker processes; they stop by themselves when this process exits."""
+        self.recover()
+        # Spawned, not forked: the Streamlit server has threads, which a fork would copy in an arbitrary state
+        context = multiprocessing.get_context('spawn')
+        workers = [context.Process(target=_worker_main, args=(self.path, os.getpid()), daemon=False)
+                   for _ in range(n_workers)]
+        for worker in workers:
+            worker.start()
+        return workers
+
+
+# Function to requeue the running jobs whose worker process is gone
+def _requeue_orphans(connection):
+    for row in connection.execute("SELECT id, worker FROM jobs WHERE status = ?", (RUNNING,)).fetchall():
+        if not _alive(row['worker']):
+            connection.execute("UPDATE jobs SET status = ?, progress = 0, worker = NULL WHERE id = ?", (QUEUED, row['id']))
+
+
+# Function to check whether a process is still running
+def _alive(pid):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# Main loop of a worker process: run queued jobs until the app that started it exits
+def _worker_main(path, parent):
+    queue = JobQueue(path)
+    try:
+        cache = ResultsCache()
+    except OSError:
+        cache = None
+    while _alive(parent):
+        claimed = queue.claim(os.getpid())
+        if claimed is None:
+            time.sleep(POLL_SECONDS)
+            continue
+        job_id, payload, running = claimed
+        # The cores are shared among the jobs running when this one starts, so a lone job uses all of them
+        n_jobs = max((os.cpu_count() or 1) // running, 1)
+        last_update = 0.0
+
+        # Function to store the job's progress, at most every PROGRESS_INTERVAL seconds
+        def progress(fraction):
+            nonlocal last_update
+            if time.time() - last_update >= PROGRESS_INTERVAL:
+                queue.set_progress(job_id, fraction)
+                last_update = time.time()
+
+        try:
+            job = joblib.load(payload)
+            result = cross_validate_models(job['models'], job['X'], job['Y'], job['scoring'], n_splits=job['n_splits'],
+                                           n_jobs=n_jobs, progress=progress, cache=cache)
+            queue.finish(job_id, result=result)
+        except Exception as e:  # Stored with the job and shown on the page instead of killing the worker
+            queue.finish(job_id, error=f"{type(e).__name__}: {e}")
@@ -1,11 +1,11 @@
 import streamlit as st
 import pandas as pd
 import io
-import os
 import matplotlib.pyplot as plt
 import seaborn as sns
 from utils.data_utils import categorize_columns
-from utils.file_utils import load_dataset
+from utils.profiler import profile_dataframe
+from utils.file_utils import load_dataset, memory_report, read_server_dataset
 
 
 def styled_message(message):
@@ -88,7 +88,8 @@ def main_page():
                 'label_mappings', 
                 'numerical_discrete_cols', 
                 'numerical_continuous_cols', 
-                'categorical_cols'
+                'categorical_cols',
+                'ingest_report'
             ]
 
             # Delete each key if it exists in session state
@@ -115,14 +116,17 @@ def main_page():
                 st.rerun() 
             elif isinstance(df, str):
                 if st.sidebar.button("Confirm Selection"):
-                    df_path = os.path.join('datasets', df)
-                    df = pd.read_csv(df_path)
+                    df, report = read_server_dataset(df, st.session_state.get('dataset_columns') or None)
+                    # The report is drawn on the next run, st.rerun() discards this one
+                    st.session_state['ingest_report'] = report
                     st.session_state['df'] = df
                     st.dataframe(df.head())
                     st.rerun() 
 
     if 'df' in st.session_state:
         df = st.session_state['df']
+        if st.session_state.get('ingest_report'):
+            st.sidebar.caption(memory_report(st.session_state['ingest_report']))
         st.dataframe(df.head())
         main_page_options(df)
 
@@ -180,14 +184,14 @@ def main_page_options(df):
 
     if st.checkbox("Show Null Counts in a Plot"):
         st.markdown(styled_message("Seaborn null values heatmap"), unsafe_allow_html=True)
-        if df.isnull().any().any():
+        if any(profile.nulls for profile in profile_dataframe(df).values()):
             st.markdown(styled_message("Dataframe has null values"), unsafe_allow_html=True)
         else:
             st.markdown(styled_message("Dataframe has no null values"), unsafe_allow_html=True)
         plot_null_heatmap(df)
 
     if st.checkbox("Show Mean Values"):
-        columns_with_few_unique_values = [col for col in df.columns if df[col].nunique() <= 10]
+        columns_with_few_unique_values = [col for col, profile in profile_dataframe(df).items() if profile.unique <= 10]
         if columns_with_few_unique_values:
             column_to_display = st.selectbox("Select Column", columns_with_few_unique_values)
             plot_mean_values(df, column_to_display)
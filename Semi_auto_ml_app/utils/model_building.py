@@ -1,12 +1,28 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import json
-from sklearn.model_selection import KFold, cross_val_score
+import time
+import uuid
 from utils.data_utils import sample_dataframe, check_variable_type
 from utils.file_utils import writetofile, download_file
 from utils.model_utils import get_models 
+from utils.job_queue import DONE, FAILED, QUEUED, POLL_SECONDS, JobQueue, training_key
 from utils.data_utils import sample_dataframe, determine_feature_type
 
+# Function to start the training workers once per server; the queue is shared by all sessions
+@st.cache_resource
+def get_job_queue():
+    job_queue = JobQueue()
+    job_queue.start_workers()
+    return job_queue
+
+# Function to identify the browser user; kept in the URL so the user's jobs are found again after a reload
+def session_owner():
+    if 'user' not in st.query_params:
+        st.query_params['user'] = uuid.uuid4().hex
+    return st.query_params['user']
+
 def run_model_building():
     st.subheader("Building ML Models")
     
@@ -83,15 +99,35 @@ def run_model_building():
 
         scoring = 'accuracy' if output_type != 'Numerical Continuous' else 'r2'
 
-        # Initialize progress bar
-        progress_bar = st.progress(0)
-
-        total_models = len(selected_models)
-
-        for i, (name, model) in enumerate(selected_models):
-            try:
-                kfold = KFold(n_splits=10)
-                cv_results = cross_val_score(model, X, Y, cv=kfold, scoring=scoring)
+        # Training runs as a job on the background workers (every (model, fold) pair a task on a process pool,
+        # unchanged models from the results cache). The job is found again on every rerun, page switch or reload
+        job_queue = get_job_queue()
+        owner = session_owner()
+        job_key = training_key(selected_models, X, Y, scoring)
+        job = job_queue.find(owner, job_key)
+        if job is None or (job['status'] == FAILED and st.button("Retry Training")):
+            job = job_queue.job(job_queue.submit(owner, job_key, selected_models, X, Y, scoring, n_splits=10))
+
+        if job['status'] == FAILED:
+            st.error(f"Training failed: {job['error']}")
+        elif job['status'] != DONE:
+            if job['status'] == QUEUED:
+                st.info(f"Training job queued behind {job_queue.position(job['id'])} other jobs.")
+            st.progress(job['progress'], text="Training selected models...")
+            time.sleep(POLL_SECONDS)
+            st.rerun()  # Poll the job status again
+        else:
+            cv = job['result']
+
+            for name, model in selected_models:
+                if name in cv['errors']:
+                    st.error(f"Error occurred for model {name}: {cv['errors'][name]}")
+                    st.warning(f"Skipping model {name} due to the error.")
+                    continue
+                cv_results = cv['scores'][name]
+                if name in cv.get('fold_errors', {}):
+                    st.warning(f"{int(np.isnan(cv_results).sum())} folds failed for model {name}, so its mean score "
+                               f"is nan: {cv['fold_errors'][name]}")
                 model_names.append(name)
                 model_mean.append(cv_results.mean())
                 model_std.append(cv_results.std())
@@ -99,15 +135,24 @@ def run_model_building():
                 accuracy_results = {"model name": name, "model_accuracy": cv_results.mean(), "standard deviation": cv_results.std()}
                 all_models.append(accuracy_results)
 
-                # Update the progress bar
-                progress_bar.progress((i + 1) / total_models)
-
-            except ValueError as e:
-                st.error(f"Error occurred for model {name}: {str(e)}")
-                st.warning(f"Skipping model {name} due to the error.")
-
-        # After loop completes, clear the progress bar
-        progress_bar.empty()
+            trained = len(selected_models) - len(cv['cached'])
+            if cv['cached']:
+                st.caption(f"Scores of {len(cv['cached'])} models loaded from the results cache.")
+            if trained:
+                st.caption(f"Trained {trained} models x 10 folds on {cv['workers']} processes in "
+                           f"{cv['wall_seconds']:.1f} s; one after the other they take {cv['serial_seconds']:.1f} s "
+                           f"({cv['serial_seconds'] / max(cv['wall_seconds'], 1e-9):.1f}x speedup).")
+
+    # Jobs of this user, including those started before a page switch or reload
+    with st.expander("Training Jobs"):
+        jobs = get_job_queue().jobs(session_owner())
+        if jobs:
+            st.dataframe(pd.DataFrame([{"Job": job['id'], "Models": len(job['models']), "Status": job['status'],
+                                        "Progress": f"{job['progress']:.0%}",
+                                        "Submitted": time.strftime('%Y-%m-%d %H:%M', time.localtime(job['created']))}
+                                       for job in jobs]))
+        else:
+            st.write("No training jobs yet.")
 
     # Display metrics as table
     if st.checkbox("Metrics As Table"):
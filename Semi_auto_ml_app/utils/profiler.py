@@ -0,0 +1,100 @@
+import threading
+import weakref
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+EXACT_CARDINALITY_ROWS = 1000000  # Columns longer than this get a HyperLogLog estimate of their distinct values
+HLL_PRECISION = 14  # 2**14 HyperLogLog registers, a standard error of about 0.8%
+VERSION_ATTR = 'dataset_version'  # Key in df.attrs of the edit version, bumped by mark_edited
+
+# Summary of one column, computed in one pass over it
+ColumnProfile = namedtuple('ColumnProfile', [
+    'dtype',          # The pandas dtype
+    'is_object',      # Object, pandas string or category dtype
+    'is_numeric',
+    'is_datetime',
+    'unique',         # Distinct non-null values
+    'approximate',    # True if unique is a HyperLogLog estimate
+    'nulls',
+    'min',            # Smallest and largest value of numeric and datetime columns, else None
+    'max',
+])
+
+# Profiles of the dataframes in use, by id(df): (weak reference to df, content key of df, {column: ColumnProfile})
+_profiles = {}
+_profiles_lock = threading.Lock()  # Streamlit runs each session's script in a thread of its own
+
+
+# Function to estimate the number of distinct values of a column with HyperLogLog on 64-bit hashes
+def approximate_unique(series, precision=HLL_PRECISION):
+    hashes = pd.util.hash_pandas_object(series.dropna(), index=False).to_numpy(dtype=np.uint64)
+    if not hashes.size:
+        return 0
+    m = 1 << precision
+    registers = np.zeros(m, dtype=np.uint8)
+    index = (hashes >> np.uint64(64 - precision)).astype(np.intp)
+    rest = hashes & np.uint64((1 << (64 - precision)) - 1)
+    # Position of the leftmost 1 bit in the remaining 64 - precision bits (frexp's exponent is the bit length)
+    rank = (64 - precision) - np.frexp(rest.astype(np.float64))[1] + 1
+    np.maximum.at(registers, index, rank.astype(np.uint8))
+
+    estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)))
+    zeros = np.count_nonzero(registers == 0)
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * np.log(m / zeros)  # Linear counting is more accurate for small cardinalities
+    return int(round(estimate))
+
+
+# Function to profile one column
+def profile_column(series):
+    dtype = series.dtype
+    is_numeric = pd.api.types.is_numeric_dtype(dtype)
+    is_datetime = pd.api.types.is_datetime64_any_dtype(dtype)
+    approximate = len(series) > EXACT_CARDINALITY_ROWS
+    unique = approximate_unique(series) if approximate else int(series.nunique())
+    low = high = None
+    if (is_numeric or is_datetime) and not pd.api.types.is_bool_dtype(dtype) and series.notna().any():
+        low, high = series.min(), series.max()
+    is_object = dtype == 'object' or isinstance(dtype, (pd.StringDtype, pd.CategoricalDtype))
+    return ColumnProfile(dtype, is_object, is_numeric, is_datetime, unique, approximate,
+                         int(series.isna().sum()), low, high)
+
+
+def content_key(df):
+    """Return a cheap key of a dataframe's content: its structure and edit version, without reading the values."""
+    return df.shape, tuple(map(str, df.columns)), tuple(map(str, df.dtypes)), df.attrs.get(VERSION_ATTR, 0)
+
+
+# Function to record that the values of a dataframe were changed in place, so its profile is rebuilt
+def mark_edited(df):
+    df.attrs[VERSION_ATTR] = df.attrs.get(VERSION_ATTR, 0) + 1
+
+
+def _column_profiles(df):
+    key = content_key(df)
+    with _profiles_lock:
+        entry = _profiles.get(id(df))
+        if entry is None or entry[0]() is not df or entry[1] != key:
+            df_id = id(df)
+            entry = (weakref.ref(df, lambda _: _profiles.pop(df_id, None)), key, {})
+            _profiles[df_id] = entry
+        return entry[2]
+
+
+def column_profile(df, col):
+    """Return the ColumnProfile of one column, profiled on first use and cached while the dataset is unchanged."""
+    profiles = _column_profiles(df)
+    if col not in profiles:
+        profiles[col] = profile_column(df[col])
+    return profiles[col]
+
+
+def profile_dataframe(df):
+    """Return the ColumnProfile of every column as a dict."""
+    profiles = _column_profiles(df)
+    for col in df.columns:
+        if col not in profiles:
+            profiles[col] = profile_column(df[col])
+    return {col: profiles[col] for col in df.columns}
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+import time
+
+import joblib
+import pandas as pd
+
+CACHE_DIR = os.environ.get('AUTOML_CACHE_DIR', os.path.join('cache', 'cv_results'))
+CACHE_VERSION = 1  # Part of every key; raise it when a change to the training alters the scores
+MAX_CACHE_BYTES = 100 * 1024 * 1024  # Size above which the least recently used results are evicted
+MAX_AGE_SECONDS = 30 * 24 * 3600  # Results not used for this long are evicted
+
+
+# Function to hash the content of the features and target, independent of where they are in memory
+def dataset_hash(X, Y):
+    digest = hashlib.sha256()
+    for frame in (X, Y.to_frame()):
+        digest.update(pd.util.hash_pandas_object(frame, index=True).values.tobytes())
+        digest.update(json.dumps([[str(col), str(dtype)] for col, dtype in frame.dtypes.items()]).encode())
+    return digest.hexdigest()
+
+
+# Function to build the cache key of one model's cross validation scores
+def cv_key(data_hash, output_col, scoring, fold_spec, model):
+    text = json.dumps([CACHE_VERSION, data_hash, str(output_col), scoring, fold_spec, type(model).__name__,
+                       model.get_params()], sort_keys=True, default=repr)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ResultsCache:
+    """Training results stored on disk with joblib, one file per key.
+
+    A hit touches the file, so eviction (by age, then by total size) removes the least
+    recently used results first.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, max_age=MAX_AGE_SECONDS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.joblib")
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            value = joblib.load(path)
+        except (OSError, EOFError, ValueError):  # Missing, or cut short by a crash while writing
+            return None
+        os.utime(path)
+        return value
+
+    def put(self, key, value):
+        path = self.path(key)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        joblib.dump(value, temporary)
+        os.replace(temporary, path)  # Atomic, so a concurrent session never loads half a file
+        self.evict()
+
+    def evict(self):
+        now = time.time()
+        entries = []
+        for file_name in os.listdir(self.directory):
+            if not file_name.endswith('.joblib'):
+                continue
+            path = os.path.join(self.directory, file_name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()  # Least recently used first
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            if now - mtime <= self.max_age and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith('.joblib'):
+                os.remove(os.path.join(self.directory, file_name))